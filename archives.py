@@ -0,0 +1,236 @@
+"""
+ZIP and TAR archive sources for Quick Image Presenter.
+
+A deck can be a .zip/.cbz or .tar(.gz/.bz2/.xz) file instead of a folder.
+Its member list is read once (from the ZIP central directory, or one pass
+over a TAR's headers) and the slides refer to members with paths of the
+form "deck.zip::slides/01.jpg". Members are never extracted to disk:
+open_file() returns the member's bytes in memory, and every read also
+queues the next READ_AHEAD members on a background thread. Recently read
+members are kept in a byte-limited LRU buffer, so stepping back and forth
+does not touch the archive again.
+
+ZIP members can be read in any order. Compressed TAR files have no index,
+so a read may have to decompress from the start; the read-ahead and the
+buffer hide most of that for decks played in order.
+"""
+
+import io
+import os
+import tarfile
+import threading
+import zipfile
+from collections import OrderedDict
+
+from filename_rules import natural_sort_key
+from playlist import PlaylistEntry
+
+MEMBER_SEPARATOR = '::'
+ZIP_EXTENSIONS = ('.zip', '.cbz')
+TAR_EXTENSIONS = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz', '.cbt')
+
+# Members read ahead of the one just opened, and bytes of member data kept in memory
+READ_AHEAD = 3
+BUFFER_BYTES = 64 * 1024 * 1024
+
+_archives_lock = threading.Lock()
+_archives = {}
+
+
+class ArchiveError(OSError):
+    """Raised when an archive cannot be opened or listed"""
+
+
+def is_archive(path):
+    """Return True if path is a ZIP or TAR file we can present from"""
+    name = path.lower()
+    return os.path.isfile(path) and name.endswith(ZIP_EXTENSIONS + TAR_EXTENSIONS)
+
+
+def split_member_path(path):
+    """(archive path, member name) for an archive member path, else None"""
+    cut = path.find(MEMBER_SEPARATOR)
+    while cut >= 0:
+        archive = path[:cut]
+        if archive.lower().endswith(ZIP_EXTENSIONS + TAR_EXTENSIONS):
+            return archive, path[cut + len(MEMBER_SEPARATOR):]
+        cut = path.find(MEMBER_SEPARATOR, cut + 1)
+    return None
+
+
+class Archive:
+    """An open archive: member index, thread-safe reads and a read-ahead buffer"""
+
+    def __init__(self, path, buffer_bytes=BUFFER_BYTES):
+        self.path = path
+        self.buffer_bytes = buffer_bytes
+        self.buffered = 0
+        self._buffer = OrderedDict()
+        self._lock = threading.Lock()  # One reader at a time on the underlying file
+        self._buffer_lock = threading.Lock()
+        self._pending = set()
+        self._executor = None
+        if path.lower().endswith(ZIP_EXTENSIONS):
+            self._zip = zipfile.ZipFile(path)
+            self._tar = None
+            self._sizes = {info.filename: info.file_size for info in self._zip.infolist() if not info.is_dir()}
+        else:
+            self._zip = None
+            self._tar = tarfile.open(path)
+            self._tar_members = {member.name: member for member in self._tar.getmembers() if member.isfile()}
+            self._sizes = {name: member.size for name, member in self._tar_members.items()}
+        # Read-ahead follows the natural order of the member names
+        self.names = sorted(self._sizes, key=natural_sort_key)
+        self._positions = {name: position for position, name in enumerate(self.names)}
+
+    def size(self, name):
+        return self._sizes.get(name)
+
+    def _read_member(self, name):
+        with self._lock:
+            if self._zip is not None:
+                return self._zip.read(name)
+            return self._tar.extractfile(self._tar_members[name]).read()
+
+    def read(self, name):
+        """Bytes of member name, from the buffer when possible; queues read-ahead"""
+        with self._buffer_lock:
+            data = self._buffer.get(name)
+            if data is not None:
+                self._buffer.move_to_end(name)
+        if data is None:
+            if name not in self._sizes:
+                raise FileNotFoundError(f"{name} not found in {self.path}")
+            data = self._read_member(name)
+            self._store(name, data)
+        self._read_ahead(name)
+        return data
+
+    def _store(self, name, data):
+        with self._buffer_lock:
+            if name in self._buffer:
+                return
+            self._buffer[name] = data
+            self.buffered += len(data)
+            self._trim()
+
+    def _trim(self):
+        """Drop least recently used members beyond buffer_bytes; bytes freed (buffer lock held)"""
+        freed = 0
+        while self.buffered > self.buffer_bytes and len(self._buffer) > 1:
+            _, data = self._buffer.popitem(last=False)
+            self.buffered -= len(data)
+            freed += len(data)
+        return freed
+
+    def limit(self, buffer_bytes):
+        """Cap the buffer (None restores BUFFER_BYTES); returns bytes freed"""
+        with self._buffer_lock:
+            self.buffer_bytes = BUFFER_BYTES if buffer_bytes is None else buffer_bytes
+            return self._trim()
+
+    def _read_ahead(self, name):
+        position = self._positions.get(name)
+        if position is None or not READ_AHEAD:
+            return
+        following = self.names[position + 1:position + 1 + READ_AHEAD]
+        with self._buffer_lock:
+            wanted = [n for n in following if n not in self._buffer and n not in self._pending]
+            self._pending.update(wanted)
+        if not wanted:
+            return
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='read-ahead')
+        for ahead in wanted:
+            self._executor.submit(self._fetch, ahead)
+
+    def _fetch(self, name):
+        try:
+            self._store(name, self._read_member(name))
+        except Exception as e:
+            print(f"Read-ahead of {name} in {self.path} failed: {e}")
+        finally:
+            with self._buffer_lock:
+                self._pending.discard(name)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            if self._zip is not None:
+                self._zip.close()
+            else:
+                self._tar.close()
+        self._buffer.clear()
+        self.buffered = 0
+
+
+def get_archive(path):
+    """The shared Archive for path, opened on first use"""
+    key = os.path.abspath(path)
+    with _archives_lock:
+        archive = _archives.get(key)
+        if archive is None:
+            try:
+                archive = _archives[key] = Archive(key)
+            except (zipfile.BadZipFile, tarfile.TarError) as e:
+                raise ArchiveError(f"{path} is not a readable ZIP or TAR archive: {e}") from e
+        return archive
+
+
+def close_archives():
+    with _archives_lock:
+        archives = list(_archives.values())
+        _archives.clear()
+    for archive in archives:
+        archive.close()
+
+
+def buffered_bytes():
+    """Member bytes held in memory across all open archives"""
+    with _archives_lock:
+        return sum(archive.buffered for archive in _archives.values())
+
+
+def limit_buffers(max_bytes):
+    """Share max_bytes between the open archives' buffers (None lifts the cap); bytes freed"""
+    with _archives_lock:
+        archives = list(_archives.values())
+    if not archives:
+        return 0
+    share = None if max_bytes is None else max_bytes // len(archives)
+    return sum(archive.limit(share) for archive in archives)
+
+
+def archive_entries(path, extensions):
+    """PlaylistEntry per image member (by extension), in the archive's own order"""
+    archive = get_archive(path)
+    entries = []
+    for name in archive.names:
+        if os.path.splitext(name)[1].lower() in extensions:
+            entries.append(PlaylistEntry(name.rsplit('/', 1)[-1], f"{archive.path}{MEMBER_SEPARATOR}{name}"))
+    return entries
+
+
+def open_file(path):
+    """path itself for ordinary files, an in-memory file object for archive members"""
+    member = split_member_path(path)
+    if member is None:
+        return path
+    archive, name = member
+    return io.BytesIO(get_archive(archive).read(name))
+
+
+def member_signature(path):
+    """(archive mtime_ns, member size) for an archive member path, or None"""
+    member = split_member_path(path)
+    if member is None:
+        return None
+    archive, name = member
+    try:
+        mtime = os.stat(archive).st_mtime_ns
+    except OSError:
+        return None
+    size = get_archive(archive).size(name)
+    return None if size is None else (mtime, size)
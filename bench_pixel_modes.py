@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Per-mode decode benchmark for Quick Image Presenter.
+
+Writes one synthetic test image per pixel mode (CMYK JPEG, 16-bit PNG and
+TIFF, palette PNG with transparency, LA and RGBA PNG, plain RGB JPEG) and
+compares three ways of turning it into a display frame:
+
+    naive      resize in the decoded mode, then convert('RGB')
+    generic    convert('RGB') at full size, then resize
+    pipeline   image_pipeline.load_fitted_image (normalize after downscale)
+
+The "mean" column shows the average output brightness, which exposes the
+clipping of 16-bit images and ignored transparency on the other paths.
+
+Usage:
+    python bench_pixel_modes.py [--size 4000x3000] [--target 1920x1000] [--runs 3]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from PIL import Image, ImageStat
+
+from image_pipeline import fit_size, load_fitted_image
+
+
+def gradient(size, maximum=255):
+    """Horizontal gradient from 0 to maximum as a 32-bit integer image"""
+    ramp = Image.linear_gradient('L').transpose(Image.Transpose.ROTATE_90).resize(size).convert('I')
+    return ramp.point(lambda v: v * (maximum / 255))
+
+
+def make_samples(folder, size):
+    """Create the test images and return [(label, path)]"""
+    ramp = gradient(size).convert('L')
+    rgb = Image.merge('RGB', [ramp, Image.new('L', size, 128), ramp.transpose(Image.Transpose.FLIP_LEFT_RIGHT)])
+    alpha = ramp.transpose(Image.Transpose.ROTATE_180)
+    samples = []
+
+    def save(label, image, name, **params):
+        path = os.path.join(folder, name)
+        image.save(path, **params)
+        samples.append((label, path))
+
+    save('RGB (JPEG)', rgb, 'rgb.jpg', quality=90)
+    save('CMYK (JPEG)', rgb.convert('CMYK'), 'cmyk.jpg', quality=90)
+    rgba = rgb.copy()
+    rgba.putalpha(alpha)
+    save('RGBA (PNG)', rgba, 'rgba.png', compress_level=1)
+    save('LA (PNG)', Image.merge('LA', [rgb.convert('L'), alpha]), 'la.png', compress_level=1)
+    palette = rgb.quantize(64)
+    save('P + transparency (PNG)', palette, 'palette.png', transparency=0, compress_level=1)
+    wide = gradient(size, 65535).convert('I;16')
+    save('I;16 (PNG)', wide, 'gray16.png', compress_level=1)
+    save('I;16 (TIFF)', wide, 'gray16.tif')
+    return samples
+
+
+def naive(path, target):
+    image = Image.open(path)
+    image = image.resize(fit_size(image.size, target), Image.Resampling.LANCZOS)
+    return image.convert('RGB')
+
+
+def generic(path, target):
+    image = Image.open(path).convert('RGB')
+    return image.resize(fit_size(image.size, target), Image.Resampling.LANCZOS)
+
+
+def pipeline(path, target):
+    return load_fitted_image(path, target)
+
+
+def time_method(method, path, target, runs):
+    times = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = method(path, target)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), ImageStat.Stat(result.convert('L')).mean[0]
+
+
+def parse_size(text):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pixel-mode normalization")
+    parser.add_argument('--size', type=parse_size, default=(4000, 3000), help="source size (default 4000x3000)")
+    parser.add_argument('--target', type=parse_size, default=(1920, 1000), help="display size (default 1920x1000)")
+    parser.add_argument('--runs', type=int, default=3, help="runs per measurement (default 3)")
+    args = parser.parse_args()
+
+    print("Quick Image Presenter - Pixel Mode Benchmark")
+    print(f"Source {args.size[0]}x{args.size[1]} -> display {args.target[0]}x{args.target[1]}, "
+          f"median of {args.runs} runs")
+    print("=" * 78)
+    print(f"{'mode':<24}{'naive ms':>10}{'mean':>6}{'generic ms':>12}{'mean':>6}{'pipeline ms':>13}{'mean':>6}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        for label, path in make_samples(folder, args.size):
+            row = f"{label:<24}"
+            for method, width in ((naive, 10), (generic, 12), (pipeline, 13)):
+                try:
+                    ms, mean = time_method(method, path, args.target, args.runs)
+                    row += f"{ms:>{width}.1f}{mean:>6.0f}"
+                except Exception as e:
+                    row += f"{'error':>{width}}{'':>6}"
+                    print(f"  {method.__name__} failed on {label}: {e}")
+            print(row)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
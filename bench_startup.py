@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for Quick Image Presenter.
+
+Measures the module import cost with `python -X importtime` and, when a
+display is available, the time until the main window has been drawn.
+Also checks that heavy modules stay out of the startup path.
+
+Usage:
+    python bench_startup.py [--runs 5] [--max-import-ms 60]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Modules that must only be imported once the feature using them is needed
+DEFERRED_MODULES = [
+    'PIL.Image', 'PIL.ImageTk', 'subprocess', 'platform', 'threading',
+    'concurrent.futures', 'http.server', 'socket',
+    'image_pipeline', 'sync_playback', 'remote_control', 'ken_burns', 'transitions', 'contact_sheet', 'slide_index',
+    'duplicates', 'metadata_cache', 'memory_budget', 'displays', 'presenter_view', 'archives', 'pages', 'compiled_deck', 'captions', 'validation', 'sort_orders',
+]
+
+WINDOW_SCRIPT = """
+import time
+start = time.perf_counter()
+import tkinter as tk
+import quick_image_presenter
+root = tk.Tk()
+app = quick_image_presenter.QuickImagePresenter(root)
+root.update()
+print(f"{(time.perf_counter() - start) * 1000:.1f}")
+root.after(200, root.destroy)
+root.mainloop()
+"""
+
+
+def measure_imports():
+    """Return (total_ms, {module: cumulative_us}) for importing the app"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import quick_image_presenter'],
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # Format: "import time: <self us> | <cumulative us> | <indented module name>"
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative_us)
+    return modules.get('quick_image_presenter', 0) / 1000, modules
+
+
+def measure_first_window():
+    """Milliseconds until the main window is drawn, or None without a display"""
+    if sys.platform.startswith('linux') and not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY'):
+        return None
+    result = subprocess.run([sys.executable, '-c', WINDOW_SCRIPT], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Quick Image Presenter startup time")
+    parser.add_argument('--runs', type=int, default=5, help="number of measurements (default: 5)")
+    parser.add_argument('--max-import-ms', type=float, default=None,
+                        help="exit with an error if the median import time exceeds this")
+    args = parser.parse_args()
+
+    print("Quick Image Presenter - Startup Benchmark")
+    print("=" * 40)
+
+    import_times = []
+    modules = {}
+    for _ in range(args.runs):
+        total, modules = measure_imports()
+        import_times.append(total)
+    median_import = statistics.median(import_times)
+    print(f"Import time:  median {median_import:.1f} ms  (min {min(import_times):.1f}, max {max(import_times):.1f})")
+
+    slowest = sorted(((us, name) for name, us in modules.items() if name != 'quick_image_presenter'),
+                     reverse=True)[:8]
+    print("Slowest imports (cumulative):")
+    for us, name in slowest:
+        print(f"  {us / 1000:7.1f} ms  {name}")
+
+    window_times = [t for t in (measure_first_window() for _ in range(args.runs)) if t is not None]
+    if window_times:
+        print(f"First window: median {statistics.median(window_times):.1f} ms")
+    else:
+        print("First window: skipped (no display available)")
+
+    ok = True
+    eager = [name for name in DEFERRED_MODULES if name in modules]
+    if eager:
+        print(f"✗ Imported at startup but should be deferred: {', '.join(eager)}")
+        ok = False
+    else:
+        print("✓ Heavy modules are deferred")
+
+    if args.max_import_ms is not None and median_import > args.max_import_ms:
+        print(f"✗ Import time {median_import:.1f} ms exceeds {args.max_import_ms:.1f} ms")
+        ok = False
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -51,6 +51,7 @@ python -m PyInstaller \
     --icon=icon.png \
     --name="Quick Image Presenter" \
     --add-data="icon.png:." \
+    --add-data="icon_small.png:." \
     quick_image_presenter.py
 
 # Check if build was successful
@@ -67,8 +67,9 @@ RUN pip3 install --upgrade pip
 RUN pip3 install -r requirements.txt
 
 # Copy application files
-COPY quick_image_presenter.py .
+COPY *.py ./
 COPY icon.png .
+COPY icon_small.png .
 
 # Build the executable
 RUN python3 -m PyInstaller \\
@@ -77,6 +78,7 @@ RUN python3 -m PyInstaller \\
     --icon=icon.png \\
     --name="Quick Image Presenter" \\
     --add-data="icon.png:." \\
+    --add-data="icon_small.png:." \\
     quick_image_presenter.py
 
 # Create output directory
@@ -171,6 +173,7 @@ python -m PyInstaller \\
     --icon=icon.png \\
     --name="Quick Image Presenter" \\
     --add-data="icon.png:." \\
+    --add-data="icon_small.png:." \\
     quick_image_presenter.py
 
 # Make executable
@@ -256,6 +259,7 @@ python -m PyInstaller \\
     --icon=icon.png \\
     --name="Quick Image Presenter" \\
     --add-data="icon.png:." \\
+    --add-data="icon_small.png:." \\
     quick_image_presenter.py
 
 # Make executable
@@ -284,7 +288,7 @@ docker run --rm -v "$(pwd):/app" -w /app ubuntu:20.04 bash -c "
     python3 -m venv .venv
     source .venv/bin/activate
     pip install -r requirements.txt
-    python -m PyInstaller --onefile --windowed --icon=icon.png --name='Quick Image Presenter' --add-data='icon.png:.' quick_image_presenter.py
+    python -m PyInstaller --onefile --windowed --icon=icon.png --name='Quick Image Presenter' --add-data='icon.png:.' --add-data='icon_small.png:.' quick_image_presenter.py
     chmod +x 'dist/Quick Image Presenter'
 "
 ```
@@ -57,6 +57,7 @@ def build_executable():
         "--windowed",
         "--name=Quick Image Presenter",
         "--add-data=icon.png;." if os.path.exists("icon.png") else "",
+        "--add-data=icon_small.png;." if os.path.exists("icon_small.png") else "",
         icon_flag,
         "quick_image_presenter.py"
     ]
@@ -0,0 +1,283 @@
+"""
+Slide captions for Quick Image Presenter.
+
+A slide's caption comes from a sidecar text file next to the image
+("photo.txt" or "photo.jpg.txt", also inside archives), else from the
+XMP description (dc:description) or the EXIF ImageDescription / XPComment
+embedded in the file. Placeholder descriptions that cameras write by
+default ("OLYMPUS DIGITAL CAMERA", ...) are ignored.
+
+Captions are drawn into the fitted frame by the decode workers, on a
+rounded, semi-transparent plate, so the captioned frame is what the frame
+cache holds and Tk only ever shows a single image. Nothing extra is
+layered over the slide or redrawn per frame.
+
+The style can be changed with a "captions" object in the folder's
+`.presenter-rules.json`:
+
+    {
+        "captions": {
+            "font": "DejaVuSans.ttf",
+            "font_size": 0.035,
+            "color": "#ffffff",
+            "plate_color": "#000000",
+            "plate_opacity": 0.6,
+            "position": "bottom",
+            "max_lines": 3
+        }
+    }
+
+font_size is a fraction of the frame height; position is "bottom" or "top".
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+from filename_rules import RULES_FILENAME
+from image_pipeline import DEFAULT_BACKGROUND, load_fitted_image, open_image
+
+SIDECAR_EXTENSION = '.txt'
+
+# Longest caption kept from a sidecar or metadata (characters)
+MAX_CAPTION_LENGTH = 500
+
+MIN_FONT_SIZE = 12
+
+# Tried in order when the style names no font or the named font is missing
+FALLBACK_FONTS = ('DejaVuSans.ttf', 'segoeui.ttf', 'arial.ttf', 'Arial.ttf', 'Helvetica.ttc')
+
+# Descriptions cameras write into every photo
+CAMERA_DEFAULT_DESCRIPTIONS = {
+    'OLYMPUS DIGITAL CAMERA', 'SONY DSC', 'DIGITAL CAMERA', 'DEFAULT', 'SAMSUNG CAMERA PICTURES',
+    'KODAK DIGITAL STILL CAMERA', 'MINOLTA DIGITAL CAMERA', 'DCIM', 'EXIF_JPEG_PICTURE', 'IMAGE',
+}
+
+EXIF_IMAGE_DESCRIPTION = 0x010E
+EXIF_XP_COMMENT = 0x9C9C
+
+_XMP_DESCRIPTION = re.compile(
+    rb'<dc:description[^>]*>.*?<rdf:li[^>]*>(.*?)</rdf:li>.*?</dc:description>', re.DOTALL)
+_XMP_ENTITIES = {b'&lt;': b'<', b'&gt;': b'>', b'&quot;': b'"', b'&apos;': b"'", b'&#10;': b'\n', b'&amp;': b'&'}
+
+
+class CaptionStyle:
+    """How captions are drawn: font, size, colours and plate placement"""
+
+    def __init__(self, font=None, font_size=0.035, color='#ffffff', plate_color='#000000',
+                 plate_opacity=0.6, position='bottom', max_lines=3):
+        self.font = font
+        self.font_size = font_size
+        self.color = ImageColor.getrgb(color)[:3]
+        self.plate_color = ImageColor.getrgb(plate_color)[:3]
+        self.plate_opacity = min(1.0, max(0.0, float(plate_opacity)))
+        self.position = position if position in ('bottom', 'top') else 'bottom'
+        self.max_lines = max(1, int(max_lines))
+
+    def __eq__(self, other):
+        return isinstance(other, CaptionStyle) and vars(self) == vars(other)
+
+    def __hash__(self):
+        return hash(tuple(vars(self).values()))
+
+    @classmethod
+    def for_folder(cls, folder):
+        """Style from the "captions" object of the folder's rules file, else the defaults"""
+        rules_path = os.path.join(folder, RULES_FILENAME)
+        if not os.path.isfile(rules_path):
+            return cls()
+        try:
+            with open(rules_path, encoding='utf-8') as f:
+                config = json.load(f).get('captions') or {}
+            return cls(**config)
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            print(f"Ignoring invalid caption style in {rules_path}: {e}")
+            return cls()
+
+
+def clean_caption(text):
+    """Trimmed caption text, or None for empty and camera default descriptions"""
+    if not text:
+        return None
+    text = text.replace('\r\n', '\n').replace('\x00', '').strip()
+    if not text or text.upper() in CAMERA_DEFAULT_DESCRIPTIONS:
+        return None
+    return text[:MAX_CAPTION_LENGTH]
+
+
+def _decode(data):
+    return data.decode('utf-8-sig', errors='replace')
+
+
+def read_sidecar(path):
+    """Text of the caption file next to an image or archive member, or None"""
+    from archives import get_archive, split_member_path
+    from compiled_deck import split_slide_path
+    from pages import split_page_path
+
+    if split_slide_path(path) is not None:
+        return None  # Compiled decks carry their captions in the frames
+    path = split_page_path(path)[0]  # All pages share their file's caption
+    candidates = (os.path.splitext(path)[0] + SIDECAR_EXTENSION, path + SIDECAR_EXTENSION)
+    member = split_member_path(path)
+    if member is not None:
+        archive_path, name = member
+        archive = get_archive(archive_path)
+        for candidate in candidates:
+            name = split_member_path(candidate)[1]
+            if archive.size(name) is not None:
+                return _decode(archive.read(name))
+        return None
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            with open(candidate, 'rb') as f:
+                return _decode(f.read(MAX_CAPTION_LENGTH * 4))
+    return None
+
+
+def embedded_caption(image):
+    """Description from an opened image's XMP or EXIF data, or None (no pixels are decoded)"""
+    xmp = image.info.get('xmp') or image.info.get('XML:com.adobe.xmp')
+    if isinstance(xmp, str):
+        xmp = xmp.encode('utf-8')
+    if xmp:
+        match = _XMP_DESCRIPTION.search(xmp)
+        if match:
+            text = match.group(1)
+            for entity, char in _XMP_ENTITIES.items():
+                text = text.replace(entity, char)
+            text = clean_caption(_decode(text))
+            if text:
+                return text
+    try:
+        exif = image.getexif()
+    except Exception:
+        return None
+    description = exif.get(EXIF_IMAGE_DESCRIPTION)
+    if isinstance(description, bytes):
+        description = _decode(description)
+    text = clean_caption(description) if isinstance(description, str) else None
+    if text:
+        return text
+    comment = exif.get(EXIF_XP_COMMENT)
+    if isinstance(comment, tuple):
+        comment = bytes(comment)
+    if isinstance(comment, bytes):
+        return clean_caption(comment.decode('utf-16-le', errors='replace'))
+    return None
+
+
+def read_caption(path):
+    """Caption for a slide: sidecar file first, then XMP/EXIF description"""
+    text = clean_caption(read_sidecar(path))
+    if text:
+        return text
+    with open_image(path) as image:
+        return embedded_caption(image)
+
+
+def get_font(name, size):
+    """Font for name (or a fallback) at size; each decode thread gets its own FreeType face"""
+    import threading
+    return _load_font(name, size, threading.get_ident())
+
+
+@lru_cache(maxsize=16)
+def _load_font(name, size, thread):
+    for candidate in ((name,) if name else ()) + FALLBACK_FONTS:
+        try:
+            return ImageFont.truetype(candidate, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size)  # Pillow 10.1+
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def _split_word(word, font, max_width):
+    """Break a word that is wider than max_width into pieces that fit"""
+    pieces = []
+    piece = ''
+    for char in word:
+        if piece and font.getlength(piece + char) > max_width:
+            pieces.append(piece)
+            piece = char
+        else:
+            piece += char
+    return pieces + [piece]
+
+
+def wrap_text(text, font, max_width, max_lines):
+    """Greedy word wrap to max_width pixels; the last kept line ends in an ellipsis if cut"""
+    lines = []
+    for paragraph in text.split('\n'):
+        line = ''
+        for word in paragraph.split():
+            for piece in _split_word(word, font, max_width) if font.getlength(word) > max_width else (word,):
+                candidate = f"{line} {piece}" if line else piece
+                if line and font.getlength(candidate) > max_width:
+                    lines.append(line)
+                    line = piece
+                else:
+                    line = candidate
+        if line:
+            lines.append(line)
+    if len(lines) > max_lines:
+        lines = lines[:max_lines]
+        last = lines[-1]
+        while last and font.getlength(last + '…') > max_width:
+            last = last[:-1]
+        lines[-1] = last.rstrip() + '…'
+    return lines
+
+
+def render_caption(frame, text, style=None):
+    """Draw text on a plate into frame (in place) and return it"""
+    style = style or CaptionStyle()
+    width, height = frame.size
+    font_size = max(MIN_FONT_SIZE, round(height * style.font_size))
+    font = get_font(style.font, font_size)
+    padding = max(4, font_size // 2)
+    lines = wrap_text(text, font, width - 4 * padding, style.max_lines)
+    if not lines or width <= 4 * padding:
+        return frame
+
+    ascent, descent = font.getmetrics()
+    line_height = ascent + descent
+    spacing = font_size // 4
+    text_width = max(font.getlength(line) for line in lines)
+    plate_width = min(width, int(text_width) + 2 * padding)
+    plate_height = min(height, len(lines) * line_height + (len(lines) - 1) * spacing + 2 * padding)
+    left = (width - plate_width) // 2
+    top = padding if style.position == 'top' else max(0, height - plate_height - padding)
+    box = (left, top, left + plate_width, top + plate_height)
+
+    # Only the plate's region is composited; the rest of the frame is untouched
+    region = frame.crop(box)
+    mask = Image.new('L', region.size, 0)
+    ImageDraw.Draw(mask).rounded_rectangle((0, 0, plate_width - 1, plate_height - 1), radius=padding,
+                                           fill=round(style.plate_opacity * 255))
+    region.paste(Image.new(frame.mode, region.size, style.plate_color), mask=mask)
+    draw = ImageDraw.Draw(region)
+    y = padding
+    for line in lines:
+        draw.text(((plate_width - font.getlength(line)) / 2, y), line, font=font, fill=style.color)
+        y += line_height + spacing
+    frame.paste(region, box)
+    return frame
+
+
+def load_captioned_image(path, target_size, resample=Image.Resampling.LANCZOS, color_manager=None,
+                         background=DEFAULT_BACKGROUND, style=None):
+    """load_fitted_image with the slide's caption drawn in, for use as a Prefetcher loader"""
+    frame = load_fitted_image(path, target_size, resample, color_manager, background)
+    try:
+        text = read_caption(path)
+    except (OSError, ValueError) as e:
+        print(f"Could not read caption for {path}: {e}")
+        text = None
+    return render_caption(frame, text, style) if text else frame
@@ -0,0 +1,108 @@
+"""
+Colour management for Quick Image Presenter.
+
+Images with an embedded ICC profile (Adobe RGB, Display P3, CMYK press
+profiles, ...) are converted to the display profile before they are shown.
+Building a transform is the expensive part, so each one is built once per
+unique (source profile, image mode) pair and cached; applying it to the
+already-downscaled frame costs very little.
+
+The display profile is taken from the QIP_DISPLAY_PROFILE environment
+variable (path to an .icc/.icm file), then from the system where Pillow can
+query it (Windows), and defaults to sRGB.
+"""
+
+import io
+import os
+import threading
+
+try:
+    from PIL import ImageCms
+except ImportError:  # Pillow built without LittleCMS
+    ImageCms = None
+
+DISPLAY_PROFILE_ENV = 'QIP_DISPLAY_PROFILE'
+
+# LittleCMS rendering intents (ImageCms.Intent in newer Pillow releases)
+INTENT_PERCEPTUAL = 0
+INTENT_RELATIVE_COLORIMETRIC = 1
+
+# Modes the transforms accept, and the mode each one produces for display
+OUTPUT_MODES = {'RGB': 'RGB', 'RGBA': 'RGBA', 'CMYK': 'RGB', 'L': 'L'}
+
+
+def srgb_profile():
+    return ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB'))
+
+
+def load_display_profile():
+    """Return (profile, description) for the display, falling back to sRGB"""
+    path = os.environ.get(DISPLAY_PROFILE_ENV)
+    if path:
+        try:
+            return ImageCms.getOpenProfile(path), os.path.basename(path)
+        except (OSError, ImageCms.PyCMSError) as e:
+            print(f"Could not load display profile {path}: {e}")
+    try:
+        profile = ImageCms.get_display_profile()
+        if profile is not None:
+            return profile, 'system display profile'
+    except Exception:
+        pass  # Not supported on this platform
+    return srgb_profile(), 'sRGB'
+
+
+class ColorManager:
+    """Converts images with embedded profiles to the display profile"""
+
+    def __init__(self, display_profile=None, intent=None):
+        self.enabled = ImageCms is not None
+        self._transforms = {}
+        self._lock = threading.Lock()
+        if not self.enabled:
+            print("Colour management unavailable: Pillow was built without LittleCMS")
+            return
+        if display_profile is None:
+            display_profile, self.description = load_display_profile()
+        else:
+            self.description = 'custom'
+        self.display_profile = display_profile
+        self.intent = INTENT_PERCEPTUAL if intent is None else intent
+
+    @property
+    def transform_count(self):
+        with self._lock:
+            return len(self._transforms)
+
+    def _get_transform(self, icc_bytes, mode):
+        """Return the cached transform for this profile and mode (None if unusable)"""
+        key = (icc_bytes, mode)
+        with self._lock:
+            if key in self._transforms:
+                return self._transforms[key]
+
+        transform = None
+        try:
+            source = ImageCms.ImageCmsProfile(io.BytesIO(icc_bytes))
+            try:
+                transform = ImageCms.buildTransform(source, self.display_profile, mode, OUTPUT_MODES[mode],
+                                                    renderingIntent=self.intent)
+            except ImageCms.PyCMSError:
+                # Matrix/TRC profiles have no perceptual tables; fall back to colorimetric
+                transform = ImageCms.buildTransform(source, self.display_profile, mode, OUTPUT_MODES[mode],
+                                                    renderingIntent=INTENT_RELATIVE_COLORIMETRIC)
+        except (OSError, ImageCms.PyCMSError) as e:
+            print(f"Ignoring unusable ICC profile: {e}")
+
+        with self._lock:
+            # Failed profiles are cached too so they are not retried every slide
+            return self._transforms.setdefault(key, transform)
+
+    def convert(self, image, icc_bytes):
+        """Convert image (tagged with icc_bytes) to the display profile"""
+        if not self.enabled or not icc_bytes or image.mode not in OUTPUT_MODES:
+            return image
+        transform = self._get_transform(icc_bytes, image.mode)
+        if transform is None:
+            return image
+        return ImageCms.applyTransform(image, transform)
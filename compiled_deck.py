@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Compiled decks for Quick Image Presenter.
+
+Slow kiosk hardware spends most of a slide change decoding a full-size
+photo, turning it upright and downscaling it. Compiling moves that work to
+a faster machine: every slide of a folder is decoded, oriented, colour
+converted and fitted to the kiosk's display size once, and the frames are
+packed into a single .qdeck file together with the slide order, durations
+and transitions.
+
+Playing a deck only reads and decodes frames that already have the display
+size. Frames are stored as JPEG (a display-sized JPEG decodes faster than
+zlib-compressed raw pixels, and reads a fifth of the bytes from an SD card)
+or, for fast storage, as raw RGB that needs no decoding at all.
+
+File layout:
+    MAGIC, frame data..., JSON index, trailer (index offset, index length, MAGIC)
+
+Slides refer to frames as "show.qdeck::N" (N counted from 0).
+
+Usage:
+    python compiled_deck.py FOLDER OUTPUT.qdeck [--size 1920x1000] [--codec jpeg|raw] [--captions]
+                            [--profile KIOSK.icc]
+"""
+
+import argparse
+import io
+import json
+import os
+import struct
+import sys
+import threading
+
+from PIL import Image
+
+from image_pipeline import fit_size, request_draft
+from playlist import PlaylistEntry
+
+DECK_EXTENSION = '.qdeck'
+SLIDE_SEPARATOR = '::'
+MAGIC = b'QIPDECK1'
+TRAILER = struct.Struct('<QQ8s')
+VERSION = 1
+
+CODECS = ('jpeg', 'raw')
+DEFAULT_CODEC = 'jpeg'
+DEFAULT_QUALITY = 90
+
+# Image area of a 1920x1080 screen below the presentation control bar
+DEFAULT_SIZE = (1920, 1000)
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.webp'}
+
+_decks_lock = threading.Lock()
+_decks = {}
+
+
+class DeckError(OSError):
+    """Raised when a file is not a readable compiled deck"""
+
+
+def is_deck(path):
+    """Return True if path is a compiled deck file"""
+    return os.path.isfile(path) and path.lower().endswith(DECK_EXTENSION)
+
+
+def split_slide_path(path):
+    """(deck path, slide index) for a deck slide path, else None"""
+    deck, separator, slide = path.rpartition(SLIDE_SEPARATOR)
+    if separator and slide.isdigit() and deck.lower().endswith(DECK_EXTENSION):
+        return deck, int(slide)
+    return None
+
+
+def slide_path(deck, index):
+    return f"{deck}{SLIDE_SEPARATOR}{index}"
+
+
+def frame_fits(frame_size, target_size):
+    """True if a frame already is the fitted size for target_size (within rounding)"""
+    fitted = fit_size(frame_size, target_size)
+    return abs(fitted[0] - frame_size[0]) <= 1 and abs(fitted[1] - frame_size[1]) <= 1
+
+
+def encode_frame(frame, codec=DEFAULT_CODEC, quality=DEFAULT_QUALITY):
+    """Bytes stored for an RGB frame"""
+    if codec == 'raw':
+        return frame.tobytes()
+    buffer = io.BytesIO()
+    frame.save(buffer, 'JPEG', quality=quality)
+    return buffer.getvalue()
+
+
+def decode_frame(data, codec, size):
+    """PIL image for stored frame bytes (JPEGs are left undecoded until loaded)"""
+    if codec == 'raw':
+        return Image.frombuffer('RGB', size, data, 'raw', 'RGB', 0, 1)
+    return Image.open(io.BytesIO(data))
+
+
+class Deck:
+    """An open compiled deck: its index and thread-safe frame reads"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'rb')
+        self.size_warned = False
+        try:
+            self._read_index()
+        except Exception:
+            self._file.close()
+            raise
+
+    def _read_index(self):
+        f = self._file
+        if f.read(len(MAGIC)) != MAGIC:
+            raise DeckError(f"{self.path} is not a compiled deck")
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        if end < len(MAGIC) + TRAILER.size:
+            raise DeckError(f"{self.path} is truncated")
+        f.seek(end - TRAILER.size)
+        offset, length, magic = TRAILER.unpack(f.read(TRAILER.size))
+        if magic != MAGIC or offset + length > end - TRAILER.size:
+            raise DeckError(f"{self.path} is truncated or damaged")
+        f.seek(offset)
+        try:
+            index = json.loads(f.read(length).decode('utf-8'))
+        except ValueError as e:
+            raise DeckError(f"{self.path} has an unreadable index: {e}") from e
+        if index.get('version') != VERSION or index.get('codec') not in CODECS:
+            raise DeckError(f"{self.path} uses an unsupported deck version or codec")
+        self.codec = index['codec']
+        self.size = tuple(index['size'])
+        self.slides = index['slides']
+
+    def read(self, index):
+        """Stored bytes of slide index"""
+        slide = self.slides[index]
+        with self._lock:
+            self._file.seek(slide['offset'])
+            return self._file.read(slide['length'])
+
+    def frame(self, index):
+        """PIL image of slide index, as compiled"""
+        slide = self.slides[index]
+        return decode_frame(self.read(index), self.codec, (slide['width'], slide['height']))
+
+    def entries(self):
+        """PlaylistEntry per slide, with the durations and transitions compiled in"""
+        entries = []
+        for index, slide in enumerate(self.slides):
+            entry = PlaylistEntry(slide['name'], slide_path(self.path, index),
+                                  slide.get('duration'), slide.get('transition'))
+            entry.page = 0  # Multi-page files were split when compiling
+            entries.append(entry)
+        return entries
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def get_deck(path):
+    """The shared Deck for path, opened on first use"""
+    key = os.path.abspath(path)
+    with _decks_lock:
+        deck = _decks.get(key)
+        if deck is None:
+            try:
+                deck = _decks[key] = Deck(key)
+            except (KeyError, TypeError, struct.error) as e:
+                raise DeckError(f"{path} has a damaged index: {e}") from e
+        return deck
+
+
+def close_decks():
+    with _decks_lock:
+        decks = list(_decks.values())
+        _decks.clear()
+    for deck in decks:
+        deck.close()
+
+
+def deck_entries(path):
+    return get_deck(path).entries()
+
+
+def open_slide(path):
+    """PIL image for a deck slide path"""
+    deck, index = split_slide_path(path)
+    return get_deck(deck).frame(index)
+
+
+def load_slide(path, target_size, resample=Image.Resampling.LANCZOS):
+    """Display frame for a deck slide: no orientation or colour work, and no
+    resize when the deck was compiled for this display size"""
+    deck_path, index = split_slide_path(path)
+    deck = get_deck(deck_path)
+    frame = deck.frame(index)
+    if frame_fits(frame.size, target_size):
+        frame.load()
+        return frame if frame.mode == 'RGB' else frame.convert('RGB')
+    if not deck.size_warned and fit_size(frame.size, target_size)[0] > frame.width:
+        deck.size_warned = True
+        print(f"{os.path.basename(deck.path)} was compiled for {deck.size[0]}x{deck.size[1]}, "
+              f"smaller than the {target_size[0]}x{target_size[1]} display: slides are upscaled")
+    request_draft(frame, target_size)  # Placeholders and smaller displays: JPEG decodes at reduced scale
+    frame = frame.convert('RGB')
+    return frame.resize(fit_size(frame.size, target_size), resample)
+
+
+def folder_entries(folder):
+    """Slides of a folder in presentation order, as the presenter would show them"""
+    from filename_rules import FilenameRules
+    from pages import expand_entry, may_have_pages
+
+    entries = [PlaylistEntry(name, os.path.join(folder, name)) for name in os.listdir(folder)
+               if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS]
+    entries, skipped = FilenameRules.for_folder(folder).apply(entries)
+    slides = []
+    for entry in entries:
+        pages = expand_entry(entry) if may_have_pages(entry.path) else None
+        slides.extend(pages or [entry])
+    return slides, skipped
+
+
+def compile_deck(entries, output, size=DEFAULT_SIZE, codec=DEFAULT_CODEC, quality=DEFAULT_QUALITY,
+                 color_manager=None, workers=None, progress=None, caption_style=None):
+    """Write entries as a compiled deck to output; returns the number of slides written
+
+    Slides are decoded on worker threads and written in order. Slides that
+    cannot be decoded are left out. With a caption_style, captions are drawn
+    into the frames. progress(done, total) is called after each slide.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from functools import partial
+    from image_pipeline import load_fitted_image
+
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec {codec!r}, expected one of {', '.join(CODECS)}")
+
+    load = load_fitted_image
+    if caption_style is not None:
+        from captions import load_captioned_image
+        load = partial(load_captioned_image, style=caption_style)
+
+    def render(entry):
+        try:
+            frame = load(entry.path, size, color_manager=color_manager)
+            return frame, encode_frame(frame, codec, quality)
+        except Exception as e:
+            print(f"Skipping {entry.filename}: {e}")
+            return None, None
+
+    slides = []
+    temp_path = output + '.partial'
+    workers = workers or os.cpu_count() or 2
+    try:
+        with open(temp_path, 'wb') as f, ThreadPoolExecutor(max_workers=workers) as executor:
+            f.write(MAGIC)
+            for done, (entry, (frame, data)) in enumerate(zip(entries, executor.map(render, entries)), 1):
+                if data is not None:
+                    slides.append({'name': entry.filename, 'offset': f.tell(), 'length': len(data),
+                                   'width': frame.width, 'height': frame.height,
+                                   'duration': entry.duration, 'transition': entry.transition})
+                    f.write(data)
+                if progress:
+                    progress(done, len(entries))
+            index = json.dumps({'version': VERSION, 'codec': codec, 'size': list(size), 'slides': slides},
+                               separators=(',', ':')).encode('utf-8')
+            offset = f.tell()
+            f.write(index)
+            f.write(TRAILER.pack(offset, len(index), MAGIC))
+        os.replace(temp_path, output)
+    except BaseException:
+        # Interrupted or failed: leave no half-written deck behind
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return len(slides)
+
+
+def kiosk_color_manager(profile_path=None):
+    """ColorManager for the kiosk's display: the ICC profile at profile_path, else sRGB
+
+    Frames are shown on the kiosk without any colour work, so the compiling
+    machine's own display profile must not be baked into them.
+    """
+    from color_management import ColorManager, ImageCms, srgb_profile
+    if ImageCms is None:
+        return ColorManager()  # Reports that colour management is unavailable
+    profile = ImageCms.getOpenProfile(profile_path) if profile_path else srgb_profile()
+    manager = ColorManager(display_profile=profile)
+    manager.description = os.path.basename(profile_path) if profile_path else 'sRGB'
+    return manager
+
+
+def parse_size(text):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a folder of images into a deck for slow kiosks")
+    parser.add_argument('folder', help="folder of images (filename rules apply)")
+    parser.add_argument('output', help="deck file to write (.qdeck)")
+    parser.add_argument('--size', type=parse_size, default=DEFAULT_SIZE,
+                        help="image area of the kiosk display (default 1920x1000)")
+    parser.add_argument('--codec', choices=CODECS, default=DEFAULT_CODEC,
+                        help="jpeg (small, fast decode) or raw (no decode, 6 MB per 1080p slide)")
+    parser.add_argument('--quality', type=int, default=DEFAULT_QUALITY, help="JPEG quality (default 90)")
+    parser.add_argument('--captions', action='store_true',
+                        help="draw captions (sidecar .txt, XMP/EXIF description) into the frames")
+    parser.add_argument('--profile', help="ICC profile of the kiosk display (default: sRGB)")
+    args = parser.parse_args()
+
+    output = args.output if args.output.lower().endswith(DECK_EXTENSION) else args.output + DECK_EXTENSION
+    try:
+        color_manager = kiosk_color_manager(args.profile)
+    except Exception as e:  # OSError, or ImageCms.PyCMSError for a file that is not a profile
+        print(f"Could not load display profile {args.profile}: {e}")
+        return 1
+    entries, skipped = folder_entries(args.folder)
+    if not entries:
+        print(f"No images found in {args.folder}")
+        return 1
+    print(f"Compiling {len(entries)} slides for {args.size[0]}x{args.size[1]} ({args.codec}, "
+          f"{getattr(color_manager, 'description', 'no colour management')})"
+          + (f", {skipped} skipped by filename rules" if skipped else ""))
+    caption_style = None
+    if args.captions:
+        from captions import CaptionStyle
+        caption_style = CaptionStyle.for_folder(args.folder)
+    written = compile_deck(entries, output, args.size, args.codec, args.quality, color_manager,
+                           progress=lambda done, total: print(f"\r{done}/{total}", end='', flush=True),
+                           caption_style=caption_style)
+    print(f"\nWrote {written} slides to {output} ({os.path.getsize(output) / 1024 / 1024:.1f} MB)")
+    return 0 if written == len(entries) else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
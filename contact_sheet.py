@@ -0,0 +1,278 @@
+"""
+Contact-sheet overview for Quick Image Presenter.
+
+Shows the whole deck as a grid of numbered thumbnails. Instead of one widget
+per thumbnail, thumbnails are composited into a few large "sheet" images of
+ROWS_PER_SHEET rows each, and each sheet is a single canvas image item. Only
+the sheets in or near the visible part of the canvas are decoded (on worker
+threads) and kept, so the window stays responsive with thousands of entries.
+"""
+
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk
+
+from PIL import Image, ImageDraw, ImageTk
+
+from image_pipeline import load_fitted_image
+
+# Grid cell and the thumbnail area inside it (the rest holds the slide number)
+CELL_SIZE = (160, 128)
+THUMB_SIZE = (152, 104)
+ROWS_PER_SHEET = 6
+
+# Sheets decoded beyond the visible ones, and how far away they are kept
+PRELOAD_SHEETS = 1
+KEEP_SHEETS = 3
+
+THUMBNAIL_WORKERS = 2
+BACKGROUND = (34, 34, 34)
+PLACEHOLDER = '#2a2a2a'
+
+
+class SheetLayout:
+    """Maps slide indices to cells, cells to sheets and canvas positions back to slides"""
+
+    def __init__(self, count, columns, rows_per_sheet=ROWS_PER_SHEET, cell_size=CELL_SIZE):
+        self.count = count
+        self.columns = max(1, columns)
+        self.rows_per_sheet = rows_per_sheet
+        self.cell_width, self.cell_height = cell_size
+        self.rows = -(-count // self.columns)
+        self.per_sheet = self.columns * rows_per_sheet
+        self.sheet_count = -(-self.rows // rows_per_sheet)
+        self.sheet_height = rows_per_sheet * self.cell_height
+
+    @property
+    def total_size(self):
+        return self.columns * self.cell_width, self.rows * self.cell_height
+
+    def sheet_indices(self, sheet):
+        return range(sheet * self.per_sheet, min(self.count, (sheet + 1) * self.per_sheet))
+
+    def sheet_of(self, index):
+        return index // self.per_sheet
+
+    def sheet_top(self, sheet):
+        return sheet * self.sheet_height
+
+    def sheet_size(self, sheet):
+        rows = -(-len(self.sheet_indices(sheet)) // self.columns)
+        return self.columns * self.cell_width, rows * self.cell_height
+
+    def cell_origin(self, index):
+        """Top-left corner of a slide's cell within its sheet"""
+        local = index % self.per_sheet
+        return (local % self.columns) * self.cell_width, (local // self.columns) * self.cell_height
+
+    def sheets_between(self, top, bottom):
+        """Sheets overlapping the canvas rows top..bottom"""
+        first = max(0, int(top) // self.sheet_height)
+        last = min(self.sheet_count - 1, int(bottom) // self.sheet_height)
+        return range(first, last + 1)
+
+    def index_at(self, x, y):
+        """Slide index under a canvas position, or None"""
+        column, row = int(x) // self.cell_width, int(y) // self.cell_height
+        if x < 0 or y < 0 or column >= self.columns:
+            return None
+        index = row * self.columns + column
+        return index if index < self.count else None
+
+
+def load_thumbnail(path, color_manager=None):
+    return load_fitted_image(path, THUMB_SIZE, resample=Image.Resampling.BILINEAR,
+                             color_manager=color_manager, background=BACKGROUND)
+
+
+def render_sheet(layout, sheet, paths, load=load_thumbnail):
+    """Composite one sheet's thumbnails and slide numbers into a single image"""
+    image = Image.new('RGB', layout.sheet_size(sheet), BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    thumb_width, thumb_height = THUMB_SIZE
+    for index in layout.sheet_indices(sheet):
+        x, y = layout.cell_origin(index)
+        try:
+            thumb = load(paths[index])
+            image.paste(thumb, (x + (layout.cell_width - thumb.width) // 2,
+                                y + 4 + (thumb_height - thumb.height) // 2))
+        except Exception as e:
+            print(f"Error creating thumbnail for {paths[index]}: {e}")
+            left, top = x + (layout.cell_width - thumb_width) // 2, y + 4
+            draw.rectangle((left, top, left + thumb_width - 1, top + thumb_height - 1), outline=(120, 40, 40))
+        draw.text((x + 6, y + thumb_height + 8), str(index + 1), fill=(200, 200, 200))
+    return image
+
+
+class ContactSheetView:
+    """Overview window; on_select(index) is called when a tile is clicked"""
+
+    def __init__(self, parent, entries, on_select, color_manager=None, current_index=None):
+        self.paths = [entry.path for entry in entries]
+        self.on_select = on_select
+        self.color_manager = color_manager
+        self.executor = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS, thread_name_prefix='thumbnail')
+        self.sheets = {}
+        self.pending = {}
+        self.keep_sheets = KEEP_SHEETS
+        self.layout = None
+        self.generation = 0
+
+        self.window = tk.Toplevel(parent)
+        self.window.title(f"Overview - {len(self.paths)} images")
+        self.window.geometry("1100x750")
+        self.window.configure(bg='black')
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.window.bind('<Escape>', lambda e: self.close())
+
+        self.canvas = tk.Canvas(self.window, bg='#222222', highlightthickness=0)
+        scrollbar = ttk.Scrollbar(self.window, orient='vertical', command=self.scroll)
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+        self.canvas.pack(side='left', fill='both', expand=True)
+
+        self.canvas.bind('<Configure>', self.on_resize)
+        self.canvas.bind('<Button-1>', self.on_click)
+        self.canvas.bind('<MouseWheel>', lambda e: self.scroll('scroll', -1 if e.delta > 0 else 1, 'units'))
+        self.canvas.bind('<Button-4>', lambda e: self.scroll('scroll', -1, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self.scroll('scroll', 1, 'units'))
+
+        self.current_index = current_index
+        self.highlight = None
+
+    @property
+    def is_open(self):
+        return self.window is not None
+
+    def lift(self):
+        self.window.deiconify()
+        self.window.lift()
+
+    def scroll(self, *args):
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def on_resize(self, event):
+        columns = max(1, event.width // CELL_SIZE[0])
+        if self.layout is not None and self.layout.columns == columns:
+            self.refresh()
+            return
+        self._rebuild(columns)
+
+    def set_entries(self, entries):
+        """Show a changed slide list (e.g. multi-page files split into pages)"""
+        self.paths = [entry.path for entry in entries]
+        self.window.title(f"Overview - {len(self.paths)} images")
+        if self.layout is not None:
+            self._rebuild(self.layout.columns)
+
+    def _rebuild(self, columns):
+        # New column count or slide list: every sheet has to be composited again
+        self.generation += 1
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self.sheets.clear()
+        self.canvas.delete('all')
+        self.highlight = None
+        self.layout = SheetLayout(len(self.paths), columns)
+        width, height = self.layout.total_size
+        self.canvas.configure(scrollregion=(0, 0, width, height),
+                              yscrollincrement=self.layout.cell_height // 2)
+        for sheet in range(self.layout.sheet_count):
+            self._add_placeholder(sheet)
+        if self.current_index is not None:
+            self.show_current(self.current_index, scroll=True)
+        self.refresh()
+
+    def refresh(self):
+        """Decode sheets around the visible area and drop ones far away from it"""
+        if self.layout is None or not self.paths:
+            return
+        top, bottom = self.canvas.canvasy(0), self.canvas.canvasy(self.canvas.winfo_height())
+        visible = self.layout.sheets_between(top, bottom)
+        wanted = range(max(0, visible.start - PRELOAD_SHEETS),
+                       min(self.layout.sheet_count, visible.stop + PRELOAD_SHEETS))
+
+        for sheet in list(self.pending):
+            if sheet not in wanted and self.pending[sheet].cancel():
+                del self.pending[sheet]
+        for sheet in list(self.sheets):
+            if sheet < visible.start - self.keep_sheets or sheet >= visible.stop + self.keep_sheets:
+                self.canvas.delete(self.sheets.pop(sheet)[1])
+                self._add_placeholder(sheet)
+
+        for sheet in wanted:
+            if sheet not in self.sheets and sheet not in self.pending:
+                self.pending[sheet] = self.executor.submit(self._render, self.generation, self.layout, sheet)
+
+    def _add_placeholder(self, sheet):
+        """One flat rectangle stands in for a whole sheet until it is decoded"""
+        width, height = self.layout.sheet_size(sheet)
+        top = self.layout.sheet_top(sheet)
+        self.canvas.create_rectangle(0, top, width, top + height, fill=PLACEHOLDER, width=0,
+                                     tags=f'placeholder{sheet}')
+        if self.highlight is not None:
+            self.canvas.tag_raise(self.highlight)
+
+    def _render(self, generation, layout, sheet):
+        """Runs on a worker thread"""
+        image = render_sheet(layout, sheet, self.paths,
+                             lambda path: load_thumbnail(path, self.color_manager))
+        if self.window is not None:
+            self.window.after(0, self._sheet_ready, generation, sheet, image)
+
+    def _sheet_ready(self, generation, sheet, image):
+        if self.window is None or generation != self.generation:
+            return
+        self.pending.pop(sheet, None)
+        photo = ImageTk.PhotoImage(image)
+        item = self.canvas.create_image(0, self.layout.sheet_top(sheet), anchor='nw', image=photo)
+        self.canvas.delete(f'placeholder{sheet}')
+        if self.highlight is not None:
+            self.canvas.tag_raise(self.highlight)
+        self.sheets[sheet] = (photo, item)
+
+    def memory_bytes(self):
+        """Bytes held by the decoded sheets (Tk keeps 4 bytes per pixel)"""
+        return sum(photo.width() * photo.height() * 4 for photo, _ in self.sheets.values())
+
+    def limit(self, max_bytes):
+        """Under memory pressure keep only the visible sheets; None restores the margin"""
+        before = self.memory_bytes()
+        self.keep_sheets = KEEP_SHEETS if max_bytes is None else 0
+        if self.window is not None:
+            self.refresh()
+        return before - self.memory_bytes()
+
+    def show_current(self, index, scroll=False):
+        """Outline slide `index` and optionally scroll it into view"""
+        self.current_index = index
+        if self.layout is None or not 0 <= index < len(self.paths):
+            return
+        x, y = self.layout.cell_origin(index)
+        y += self.layout.sheet_top(self.layout.sheet_of(index))
+        box = (x + 1, y + 1, x + self.layout.cell_width - 2, y + self.layout.cell_height - 2)
+        if self.highlight is None:
+            self.highlight = self.canvas.create_rectangle(*box, outline='#4a90e2', width=3)
+        else:
+            self.canvas.coords(self.highlight, *box)
+            self.canvas.tag_raise(self.highlight)
+        if scroll:
+            height = self.layout.total_size[1]
+            self.canvas.yview_moveto(max(0.0, (y - self.layout.cell_height) / height) if height else 0.0)
+
+    def on_click(self, event):
+        if self.layout is None:
+            return
+        index = self.layout.index_at(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if index is not None:
+            self.show_current(index)
+            self.on_select(index)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.window is not None:
+            self.window.destroy()
+            self.window = None
+        self.sheets.clear()
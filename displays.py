@@ -0,0 +1,158 @@
+"""
+Extra presentation displays for Quick Image Presenter.
+
+An ExtraDisplay is a borderless fullscreen window on another monitor that
+follows the main presentation: for main slide i it shows slide i + offset
+of its own deck (the main deck unless another one is chosen). Each display
+can have its own offset and deck; decks are read in the background. Extra
+displays do not decode anything themselves. They queue their frames on the
+main Prefetcher, so all screens share one pool of decode workers and one
+frame cache keyed by (path, size). A monitor of the primary screen's size
+decodes at the main image area's size (the screen less the control bar),
+so a slide it shares with the main display is decoded only once.
+
+Monitor geometry comes from the optional screeninfo package. Without it,
+extra displays are assumed to sit to the right of the primary screen and
+to have the same size.
+"""
+
+import tkinter as tk
+
+from PIL import ImageTk
+
+from image_pipeline import PRIORITY_CURRENT, PRIORITY_NEXT
+
+MAX_EXTRA_DISPLAYS = 3
+
+
+def list_monitors(root):
+    """[(x, y, width, height)] of the connected monitors, primary first"""
+    try:
+        from screeninfo import get_monitors
+        monitors = sorted(get_monitors(), key=lambda m: not getattr(m, 'is_primary', False))
+        if monitors:
+            return [(m.x, m.y, m.width, m.height) for m in monitors]
+    except Exception:
+        pass  # screeninfo missing or no monitor information available
+    return [(0, 0, root.winfo_screenwidth(), root.winfo_screenheight())]
+
+
+def extra_geometries(monitors, count):
+    """Geometries for count extra displays: the non-primary monitors, then
+    screens of the primary's size assumed further to the right"""
+    geometries = list(monitors[1:count + 1])
+    x, y, width, height = monitors[0]
+    right = max(mx + mw for mx, _, mw, _ in monitors)
+    while len(geometries) < count:
+        geometries.append((right, y, width, height))
+        right += width
+    return geometries
+
+
+def display_offsets(text, count):
+    """Offset per extra display from the offset setting
+
+    A single number n puts display k (counted from 1) n * k slides ahead;
+    a comma-separated list gives each display its own offset, and displays
+    beyond the list mirror the main slide. Raises ValueError for non-numbers.
+    """
+    values = [int(value) for value in str(text).split(',') if value.strip()]
+    if len(values) <= 1:
+        step = values[0] if values else 0
+        return [step * number for number in range(1, count + 1)]
+    return (values + [0] * count)[:count]
+
+
+def display_decks(text, count):
+    """Deck per extra display: one deck for all, or ';'-separated decks in display order ('' = main deck)"""
+    decks = [deck.strip() for deck in (text or '').split(';')]
+    if len(decks) == 1:
+        return decks * count
+    return (decks + [''] * count)[:count]
+
+
+def frame_size(geometry, screen_size, image_size):
+    """Size an extra display decodes at: the main display's image_size on a
+    monitor of the primary's screen_size, so mirrored frames are shared;
+    otherwise the whole monitor"""
+    width, height = geometry[2:]
+    return image_size if (width, height) == tuple(screen_size) else (width, height)
+
+
+def slide_for(index, offset, count):
+    """Slide of a deck with count slides shown while the main display shows index"""
+    return (index + offset) % count if count else None
+
+
+def display_targets(entries, index, offset, size):
+    """{(path, size): priority} an extra display needs now and next"""
+    targets = {}
+    current = slide_for(index, offset, len(entries))
+    if current is not None:
+        targets[(entries[current].path, size)] = PRIORITY_CURRENT
+        following = slide_for(index + 1, offset, len(entries))
+        targets.setdefault((entries[following].path, size), PRIORITY_NEXT)
+    return targets
+
+
+class ExtraDisplay:
+    """Borderless window on one monitor showing slide index + offset of entries"""
+
+    def __init__(self, parent, geometry, entries, offset, prefetcher, size=None, on_close=None):
+        self.entries = entries
+        self.offset = offset
+        self.prefetcher = prefetcher
+        x, y, width, height = geometry
+        self.size = size or (width, height)  # Frame size; see frame_size()
+        self.photo = None
+        self.shown = None
+        self.wanted = None
+
+        self.window = tk.Toplevel(parent)
+        self.window.overrideredirect(True)
+        self.window.geometry(f"{width}x{height}+{x}+{y}")
+        self.window.configure(bg='black')
+        if on_close is not None:
+            self.window.bind('<Escape>', lambda e: on_close())
+        self.label = tk.Label(self.window, bg='black')
+        self.label.pack(expand=True, fill='both')
+
+    def decode_targets(self, index):
+        return display_targets(self.entries, index, self.offset, self.size)
+
+    def show(self, index):
+        """Show the slide matching main slide index; decodes on the shared pool if needed"""
+        slide = slide_for(index, self.offset, len(self.entries))
+        if slide is None or slide == self.shown:
+            return
+        key = (self.entries[slide].path, self.size)
+        self.wanted = key
+        frame = self.prefetcher.cache.get(key)
+        if frame is not None:
+            self._paint(slide, frame)
+            return
+        window = self.window
+        self.prefetcher.prefetch(*key, priority=PRIORITY_CURRENT,
+                                 on_ready=lambda: window.after(0, self._ready, slide, key))
+
+    def _ready(self, slide, key):
+        if self.window is None or key != self.wanted:
+            return  # Closed, or the main display has moved on
+        frame = self.prefetcher.cache.get(key)
+        if frame is not None:
+            self._paint(slide, frame)
+
+    def _paint(self, slide, frame):
+        self.photo = ImageTk.PhotoImage(frame)
+        self.label.configure(image=self.photo)
+        self.shown = slide
+
+    def memory_bytes(self):
+        """Bytes held by the PhotoImage on screen (Tk keeps 4 bytes per pixel)"""
+        return self.photo.width() * self.photo.height() * 4 if self.photo is not None else 0
+
+    def close(self):
+        if self.window is not None:
+            self.window.destroy()
+            self.window = None
+        self.photo = None
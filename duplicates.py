@@ -0,0 +1,181 @@
+"""
+Perceptual duplicate detection for Quick Image Presenter.
+
+Each image gets a 64-bit difference hash (dHash) computed from a heavily
+reduced decode (JPEGs are decoded at 1/8 scale), so re-exports at another
+size, quality or format hash to the same or a nearby value. Hashes are
+computed on a thread pool, cached in the MetadataCache so a rescan only
+hashes new or changed files, and indexed by hash bands so finding every
+near-duplicate takes a few bucket lookups instead of a comparison with
+every earlier image.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+
+from PIL import Image
+
+from image_pipeline import get_orientation, open_image, prepare_for_resize, to_display_rgb
+from metadata_cache import file_signature
+
+# Maximum number of differing hash bits for two images to count as duplicates
+DEFAULT_THRESHOLD = 6
+
+HASH_WORKERS = 4
+HASH_FIELD = 'dhash'
+
+try:
+    _popcount = int.bit_count  # Python 3.10+
+except AttributeError:
+    def _popcount(value):
+        return bin(value).count('1')
+
+# EXIF orientation -> transpose that makes the tiny hash image upright
+_ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+
+def dhash(image):
+    """64-bit difference hash: brightness gradients of a 9x8 greyscale thumbnail"""
+    small = image.convert('L').resize((9, 8), Image.Resampling.BOX)
+    pixels = small.tobytes()
+    value = 0
+    for row in range(8):
+        for column in range(8):
+            value = (value << 1) | (pixels[row * 9 + column] > pixels[row * 9 + column + 1])
+    return value
+
+
+def hash_file(path):
+    """dHash of an image file, decoded at reduced resolution and made upright"""
+    with open_image(path) as image:
+        orientation = get_orientation(image)
+        image.draft('L', (64, 64))
+        # Same mode handling as slides, so 16-bit and transparent images hash sensibly
+        small = to_display_rgb(prepare_for_resize(image).resize((32, 32), Image.Resampling.BOX))
+    transpose = _ORIENTATION_TRANSPOSE.get(orientation)
+    if transpose is not None:
+        small = small.transpose(transpose)
+    return dhash(small)
+
+
+def hamming(a, b):
+    return _popcount(a ^ b)
+
+
+class HashIndex:
+    """Near-neighbour index over 64-bit hashes (multi-index hashing)
+
+    The hash is split into BANDS 16-bit bands. If two hashes differ in at
+    most `radius` bits, at least one band differs in at most radius // BANDS
+    bits (pigeonhole), so a lookup probes each band's table with the band
+    value and its few close variants and compares only against what it finds
+    there. A BK-tree degrades to comparing against most stored hashes at the
+    radii used for photos.
+    """
+
+    BANDS = 4
+    BAND_BITS = 16
+
+    def __init__(self, radius=DEFAULT_THRESHOLD):
+        self.radius = radius
+        band_radius = radius // self.BANDS
+        # XOR masks turning a band value into every value within band_radius bits
+        self._flips = [sum(1 << bit for bit in bits)
+                       for count in range(band_radius + 1)
+                       for bits in combinations(range(self.BAND_BITS), count)]
+        self._tables = [{} for _ in range(self.BANDS)]
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def _keys(self, value):
+        mask = (1 << self.BAND_BITS) - 1
+        return [(value >> (band * self.BAND_BITS)) & mask for band in range(self.BANDS)]
+
+    def add(self, value, item):
+        for table, key in zip(self._tables, self._keys(value)):
+            table.setdefault(key, []).append((value, item))
+        self.size += 1
+
+    def search(self, value):
+        """[(distance, item)] for every stored hash within radius of value"""
+        results = {}
+        radius = self.radius
+        for table, key in zip(self._tables, self._keys(value)):
+            for flip in self._flips:
+                bucket = table.get(key ^ flip)
+                if bucket is None:
+                    continue
+                for stored, item in bucket:
+                    if _popcount(value ^ stored) <= radius:
+                        results[id(item)] = (hamming(value, stored), item)
+        return list(results.values())
+
+
+def compute_hashes(paths, cache=None, workers=HASH_WORKERS, progress=None, cancelled=None):
+    """{path: hash} for every readable image; only uncached files are decoded
+
+    progress(done, total) is called from the calling thread as hashes come in;
+    cancelled() is polled so a superseded scan can stop early.
+    """
+    hashes = {}
+    missing = []
+    for path in paths:
+        signature = file_signature(path)
+        cached = cache.get(path, signature, HASH_FIELD) if cache is not None else None
+        if cached is not None:
+            hashes[path] = int(cached, 16)
+        elif signature is not None:
+            missing.append((path, signature))
+
+    def work(item):
+        path, signature = item
+        try:
+            return path, signature, hash_file(path)
+        except Exception as e:
+            print(f"Could not hash {path}: {e}")
+            return path, signature, None
+
+    total = len(missing)
+    if progress:
+        progress(0, total)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dhash') as executor:
+        for done, (path, signature, value) in enumerate(executor.map(work, missing), 1):
+            if cancelled and cancelled():
+                executor.shutdown(wait=False, cancel_futures=True)
+                return hashes
+            if value is not None:
+                hashes[path] = value
+                if cache is not None:
+                    cache.put(path, signature, **{HASH_FIELD: f"{value:016x}"})
+            if progress and (done % 50 == 0 or done == total):
+                progress(done, total)
+    return hashes
+
+
+def find_duplicates(entries, hashes, threshold=DEFAULT_THRESHOLD):
+    """[(duplicate, original)] for entries that look like an earlier entry
+
+    Entries are taken in order, so the first copy of an image is the original.
+    """
+    index = HashIndex(threshold)
+    duplicates = []
+    for entry in entries:
+        value = hashes.get(entry.path)
+        if value is None:
+            continue
+        matches = index.search(value)
+        if matches:
+            duplicates.append((entry, min(matches, key=lambda match: match[0])[1]))
+        else:
+            index.add(value, entry)
+    return duplicates
@@ -0,0 +1,145 @@
+"""
+Filename rules for Quick Image Presenter.
+
+Slide order, display time and skipping are derived from filenames. All
+patterns are compiled once when the rules are created and applied in a
+single pass over the whole file list at load time; the results are stored
+on each PlaylistEntry.
+
+A folder may override the defaults with a `.presenter-rules.json` file:
+
+    {
+        "duration_patterns": ["-(\\d+(?:\\.\\d+)?)(ms|s|m|h)?$"],
+        "min_duration": 1,
+        "max_duration": 600,
+        "skip_patterns": ["^\\.", "[-_.]skip$"],
+        "sort_pattern": "^(\\d+)"
+    }
+
+Duration patterns are matched against the name without extension. Group 1
+is the number, the optional group 2 a unit (ms, s, sec, m, min, h). Values
+outside [min_duration, max_duration] are ignored, so `intro-2024.jpg` is not
+shown for 2024 seconds. Skip patterns are matched against the same name.
+An optional sort pattern picks the part of the name that orders slides
+(natural order of the captured group, then of the whole name).
+"""
+
+import json
+import os
+import re
+
+RULES_FILENAME = '.presenter-rules.json'
+
+DEFAULT_DURATION_PATTERNS = [r'-(\d+(?:\.\d+)?)(ms|s|sec|m|min|h)?$']
+DEFAULT_SKIP_PATTERNS = [
+    r'^\.',           # hidden files and macOS '._' resource forks
+    r'[-_.]skip$',    # explicit marker, e.g. 'draft-skip.jpg'
+]
+DEFAULT_MIN_DURATION = 1
+DEFAULT_MAX_DURATION = 600
+
+UNIT_SECONDS = {
+    None: 1, '': 1, 's': 1, 'sec': 1,
+    'ms': 0.001,
+    'm': 60, 'min': 60,
+    'h': 3600,
+}
+
+_NATURAL_SPLIT = re.compile(r'(\d+)')
+
+
+def natural_sort_key(name):
+    """Split a name into text and number parts so 'img2' sorts before 'img10'"""
+    return [int(part) if part.isdigit() else part for part in _NATURAL_SPLIT.split(name.lower())]
+
+
+class FilenameRules:
+    """Compiled filename rules for ordering, display time and skipping"""
+
+    def __init__(self, duration_patterns=None, min_duration=DEFAULT_MIN_DURATION,
+                 max_duration=DEFAULT_MAX_DURATION, skip_patterns=None, sort_pattern=None):
+        self.duration_patterns = [re.compile(p, re.IGNORECASE)
+                                  for p in (duration_patterns or DEFAULT_DURATION_PATTERNS)]
+        self.skip_patterns = [re.compile(p, re.IGNORECASE)
+                              for p in (DEFAULT_SKIP_PATTERNS if skip_patterns is None else skip_patterns)]
+        self.sort_pattern = re.compile(sort_pattern, re.IGNORECASE) if sort_pattern else None
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+
+    @classmethod
+    def for_folder(cls, folder):
+        """Load rules from the folder's rules file, falling back to the defaults"""
+        rules_path = os.path.join(folder, RULES_FILENAME)
+        if not os.path.isfile(rules_path):
+            return cls()
+        try:
+            with open(rules_path, encoding='utf-8') as f:
+                config = json.load(f)
+            return cls(duration_patterns=config.get('duration_patterns'),
+                       min_duration=config.get('min_duration', DEFAULT_MIN_DURATION),
+                       max_duration=config.get('max_duration', DEFAULT_MAX_DURATION),
+                       skip_patterns=config.get('skip_patterns'),
+                       sort_pattern=config.get('sort_pattern'))
+        except (OSError, ValueError, re.error) as e:
+            print(f"Ignoring invalid rules file {rules_path}: {e}")
+            return cls()
+
+    def duration_for(self, filename):
+        """Return the display time encoded in a filename, or None"""
+        stem = os.path.splitext(filename)[0]
+        for pattern in self.duration_patterns:
+            match = pattern.search(stem)
+            if not match:
+                continue
+            unit = match.group(2).lower() if pattern.groups >= 2 and match.group(2) else None
+            seconds = float(match.group(1)) * UNIT_SECONDS.get(unit, 1)
+            if not self.min_duration <= seconds <= self.max_duration:
+                return None
+            return int(seconds) if seconds.is_integer() else seconds
+        return None
+
+    def should_skip(self, filename):
+        """Return True if the filename carries a skip marker"""
+        stem = os.path.splitext(filename)[0]
+        return any(pattern.search(stem) for pattern in self.skip_patterns)
+
+    def sort_key_for(self, filename):
+        """Return the ordering key for a filename"""
+        key = natural_sort_key(filename)
+        if self.sort_pattern:
+            match = self.sort_pattern.search(filename)
+            if match:
+                # Names matching the sort pattern come first, ordered by the captured part
+                part = match.group(1) if self.sort_pattern.groups else match.group(0)
+                return (0, natural_sort_key(part or ''), key)
+            return (1, [], key)
+        return key
+
+    def apply(self, entries, sort=True, sort_name=None):
+        """Annotate entries in one pass, drop skipped ones and optionally sort
+
+        Durations already set (e.g. by a playlist manifest) are kept.
+        sort_name(entry) gives the name to sort by instead of the filename
+        (archive members sort by their path inside the archive).
+        Returns (kept_entries, skipped_count).
+        """
+        duration_for = self.duration_for
+        should_skip = self.should_skip
+        sort_key_for = self.sort_key_for
+
+        kept = []
+        skipped = 0
+        for entry in entries:
+            name = entry.filename
+            if should_skip(name):
+                skipped += 1
+                continue
+            if entry.duration is None:
+                entry.duration = duration_for(name)
+            if sort:
+                entry.sort_key = sort_key_for(sort_name(entry) if sort_name else name)
+            kept.append(entry)
+
+        if sort:
+            kept.sort(key=lambda e: e.sort_key)
+        return kept, skipped
@@ -0,0 +1,559 @@
+"""
+Image decode pipeline for Quick Image Presenter.
+
+Turns a playlist entry into a PIL image fitted to the presentation area.
+Decoding happens on worker threads so the next slides are ready before they
+are needed; only the cheap PhotoImage conversion is left for the Tk thread.
+Queued decodes are prioritized around the slide on screen and cancelled once
+navigation has moved on.
+"""
+
+import heapq
+import io
+import itertools
+import threading
+from collections import OrderedDict
+
+from PIL import ExifTags, Image
+
+# Number of fitted frames kept in memory
+DEFAULT_CACHE_SIZE = 6
+
+# Worker threads used for decoding ahead
+DEFAULT_DECODE_WORKERS = 2
+
+# Decode priorities: lower runs first
+PRIORITY_CURRENT = 0
+PRIORITY_NEXT = 1
+PRIORITY_PREVIOUS = 2
+PRIORITY_FURTHER = 3
+
+# Colour transparent areas are composited onto (the presentation background)
+DEFAULT_BACKGROUND = (0, 0, 0)
+
+# Embedded thumbnails whose aspect ratio is off by more than this are letterboxed
+THUMBNAIL_ASPECT_TOLERANCE = 0.03
+
+# EXIF orientation -> rotation, matching fix_image_orientation
+_ORIENTATION_ROTATION = {3: 180, 6: 270, 8: 90}
+
+
+def fix_image_orientation(image):
+    """Fix image orientation based on EXIF data"""
+    try:
+        # Check if image has EXIF data
+        if hasattr(image, '_getexif') and image._getexif() is not None:
+            exif = image._getexif()
+            if exif is not None:
+                # Get orientation tag
+                orientation = exif.get(274)  # 274 is the orientation tag
+                if orientation is not None:
+                    # Apply the correct rotation
+                    if orientation == 3:
+                        image = image.rotate(180, expand=True)
+                    elif orientation == 6:
+                        image = image.rotate(270, expand=True)
+                    elif orientation == 8:
+                        image = image.rotate(90, expand=True)
+    except Exception as e:
+        print(f"Error fixing image orientation: {e}")
+
+    return image
+
+
+def fit_size(image_size, target_size):
+    """Largest size with the image's aspect ratio that fits the target"""
+    img_width, img_height = image_size
+    screen_width, screen_height = target_size
+    aspect_ratio = img_width / img_height
+    screen_ratio = screen_width / screen_height
+
+    if aspect_ratio > screen_ratio:
+        # Image is wider than screen
+        return screen_width, max(1, int(screen_width / aspect_ratio))
+    # Image is taller than screen
+    return max(1, int(screen_height * aspect_ratio)), screen_height
+
+
+def prepare_for_resize(image, background=DEFAULT_BACKGROUND):
+    """Convert the few modes that cannot be resampled properly
+
+    Palette and bilevel images would only get nearest-neighbour scaling, and
+    older Pillow releases cannot resample 16-bit integer images. Everything
+    else is resized in its own mode and normalized afterwards, on far fewer
+    pixels.
+    """
+    mode = image.mode
+    if mode == 'P':
+        if 'transparency' in image.info:
+            return flatten_palette(image, background)
+        return image.convert('RGB')
+    if mode == 'PA':
+        return image.convert('RGBA')
+    if mode == '1':
+        return image.convert('L')
+    if mode.startswith('I;16'):
+        return image.convert('I')
+    return image
+
+
+def flatten_palette(image, background=DEFAULT_BACKGROUND):
+    """Composite a palette image's transparency onto background via its palette
+
+    Blending the (at most 256) palette entries is exact and avoids both an
+    RGBA conversion and a per-pixel composite.
+    """
+    transparency = image.info.get('transparency')
+    if image.palette is None or image.palette.mode != 'RGB':
+        return image.convert('RGBA')
+    if isinstance(transparency, int):
+        alphas = {transparency: 0}
+    elif isinstance(transparency, bytes):
+        alphas = dict(enumerate(transparency))
+    else:
+        return image.convert('RGBA')
+
+    palette = image.getpalette()
+    for index, alpha in alphas.items():
+        if alpha == 255 or index * 3 + 2 >= len(palette):
+            continue
+        for channel in range(3):
+            value = palette[index * 3 + channel]
+            palette[index * 3 + channel] = (value * alpha + background[channel] * (255 - alpha) + 127) // 255
+
+    flat = image.copy()
+    flat.info.pop('transparency', None)
+    flat.putpalette(palette)
+    return flat.convert('RGB')
+
+
+def get_orientation(image):
+    """EXIF orientation tag (1 when absent); read from the header only"""
+    try:
+        return image.getexif().get(274, 1)
+    except Exception:
+        return 1
+
+
+def request_draft(image, target_size):
+    """Let JPEG decode directly at 1/2, 1/4 or 1/8 scale when the frame will be
+    smaller than that anyway (the DCT does the first part of the downscale)"""
+    if image.format != 'JPEG':
+        return
+    width, height = image.size
+    rotated = get_orientation(image) in (5, 6, 7, 8)
+    fitted = fit_size((height, width) if rotated else (width, height), target_size)
+    if rotated:
+        fitted = (fitted[1], fitted[0])
+    image.draft(image.mode, fitted)
+
+
+def to_display_rgb(image, background=DEFAULT_BACKGROUND):
+    """Convert any decoded mode to 8-bit RGB, compositing alpha onto background"""
+    mode = image.mode
+    if mode == 'RGB':
+        return image
+
+    if mode in ('RGBA', 'LA', 'PA'):
+        alpha = image.getchannel('A')
+        rgb = image.convert('RGB')
+        if alpha.getextrema()[0] == 255:
+            return rgb  # Fully opaque, nothing to composite
+        canvas = Image.new('RGB', image.size, background)
+        canvas.paste(rgb, mask=alpha)
+        return canvas
+
+    if mode in ('I', 'I;16', 'I;16L', 'I;16B'):
+        # 16-bit samples: keep the top 8 bits instead of clipping at 255
+        if mode != 'I':
+            image = image.convert('I')
+        return image.point(lambda v: v * (1 / 256)).convert('L').convert('RGB')
+
+    if mode == 'F':
+        # Floating point data has no fixed range; stretch it to 0..255
+        low, high = image.getextrema()
+        scale = 255 / (high - low) if high > low else 1
+        return image.point(lambda v: (v - low) * scale).convert('L').convert('RGB')
+
+    # L, CMYK, YCbCr, RGBX, 1, P, ...: Pillow's direct conversions are fine
+    return image.convert('RGB')
+
+
+def open_image(path):
+    """Image.open for files, archive members ('deck.zip::slides/01.jpg'),
+    pages of multi-page files ('scan.tif#page=3') and compiled deck slides
+    ('show.qdeck::12')"""
+    from archives import open_file
+    from compiled_deck import open_slide, split_slide_path
+    from pages import split_page_path
+    if split_slide_path(path) is not None:
+        return open_slide(path)
+    path, page = split_page_path(path)
+    image = Image.open(open_file(path))
+    if page:
+        image.seek(page)
+    return image
+
+
+def load_fitted_image(path, target_size, resample=Image.Resampling.LANCZOS, color_manager=None,
+                      background=DEFAULT_BACKGROUND):
+    """Open an image, fix its orientation, resize it to fit target_size and
+    convert it to display RGB in the display colour profile"""
+    from compiled_deck import load_slide, split_slide_path
+    if split_slide_path(path) is not None:
+        return load_slide(path, target_size, resample)  # Compiled already oriented, converted and fitted
+    image = open_image(path)
+    icc_profile = image.info.get('icc_profile')
+    request_draft(image, target_size)
+    # Fix orientation before resizing
+    image = fix_image_orientation(image)
+    image = prepare_for_resize(image, background)
+    image = image.resize(fit_size(image.size, target_size), resample)
+    # Colour and mode conversion run on the downscaled frame, which is much cheaper
+    if color_manager is not None:
+        image = color_manager.convert(image, icc_profile)
+    return to_display_rgb(image, background)
+
+
+def read_exif_thumbnail(image):
+    """The JPEG thumbnail embedded in an opened image's EXIF data (IFD1), or None
+
+    Only the already-read EXIF block is parsed; the main image is not decoded.
+    """
+    raw = image.info.get('exif')
+    ifd = getattr(ExifTags, 'IFD', None)  # Pillow 9.3+
+    if not raw or ifd is None:
+        return None
+    try:
+        thumbnail_ifd = image.getexif().get_ifd(ifd.IFD1)
+        offset, length = thumbnail_ifd.get(0x0201), thumbnail_ifd.get(0x0202)
+        if not offset or not length:
+            return None
+        start = 6 if raw.startswith(b'Exif\x00\x00') else 0  # Offsets count from the TIFF header
+        thumbnail = Image.open(io.BytesIO(raw[start + offset:start + offset + length]))
+        thumbnail.load()
+    except Exception:
+        return None
+    aspect = image.width / image.height
+    if abs(thumbnail.width / thumbnail.height - aspect) > aspect * THUMBNAIL_ASPECT_TOLERANCE:
+        return None
+    return thumbnail
+
+
+def load_placeholder(path, target_size, color_manager=None, background=DEFAULT_BACKGROUND):
+    """Cheapest presentable version of an image, for showing until the full frame is decoded
+
+    Uses the embedded EXIF thumbnail when there is one (no decode of the main
+    image at all), otherwise a JPEG draft decode (up to 1/8 scale) fitted to
+    target_size. The result may be smaller than target_size. Other formats
+    have no cheap source and give None: their placeholder would cost as much
+    as the full frame.
+    """
+    with open_image(path) as image:
+        thumbnail = read_exif_thumbnail(image)
+        orientation = get_orientation(image)
+        draft = image.format == 'JPEG'
+    if thumbnail is None:
+        if not draft:
+            return None
+        return load_fitted_image(path, target_size, Image.Resampling.BILINEAR, color_manager, background)
+    if orientation in _ORIENTATION_ROTATION:
+        thumbnail = thumbnail.rotate(_ORIENTATION_ROTATION[orientation], expand=True)
+    return to_display_rgb(thumbnail, background)
+
+
+def image_bytes(image):
+    """Approximate memory held by a PIL image (Pillow keeps RGB at 4 bytes per pixel)"""
+    try:
+        width, height = image.size
+        mode = image.mode
+    except AttributeError:
+        return 0
+    if mode in ('1', 'L', 'P'):
+        return width * height
+    if mode.startswith('I;16'):
+        return width * height * 2
+    return width * height * 4
+
+
+class FrameCache:
+    """Small thread-safe LRU cache of fitted frames keyed by (path, size)
+
+    Tracks the bytes it holds; limit() caps them as well as the item count
+    (the most recent frame is always kept).
+    """
+
+    def __init__(self, max_items=DEFAULT_CACHE_SIZE, max_bytes=None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is None:
+                self.misses += 1
+                return None
+            self._frames.move_to_end(key)
+            self.hits += 1
+            return frame
+
+    def peek(self, key):
+        """Cached frame or None, without counting a hit or miss or refreshing its age"""
+        with self._lock:
+            return self._frames.get(key)
+
+    def put(self, key, frame):
+        with self._lock:
+            old = self._frames.get(key)
+            if old is not None:
+                self.bytes -= image_bytes(old)
+            self._frames[key] = frame
+            self._frames.move_to_end(key)
+            self.bytes += image_bytes(frame)
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used frames until within limits; bytes freed (lock held)"""
+        freed = 0
+        while len(self._frames) > self.max_items or (
+                self.max_bytes is not None and self.bytes > self.max_bytes and len(self._frames) > 1):
+            _, frame = self._frames.popitem(last=False)
+            size = image_bytes(frame)
+            self.bytes -= size
+            freed += size
+        return freed
+
+    def limit(self, max_bytes):
+        """Cap the cache at max_bytes (None lifts the cap); returns bytes freed"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            return self._evict()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._frames
+
+    def __len__(self):
+        with self._lock:
+            return len(self._frames)
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self.bytes = 0
+
+
+class DecodeJob:
+    """One queued or running decode"""
+
+    __slots__ = ('key', 'priority', 'state', 'done', 'callbacks')
+
+    QUEUED, RUNNING, DONE, CANCELLED = range(4)
+
+    def __init__(self, key, priority):
+        self.key = key
+        self.priority = priority
+        self.state = DecodeJob.QUEUED
+        self.done = threading.Event()
+        self.callbacks = []
+
+
+class Prefetcher:
+    """Decodes upcoming slides on worker threads into a FrameCache
+
+    Jobs are taken in priority order (PRIORITY_CURRENT first). retarget()
+    re-ranks the queue around a new position and cancels queued jobs that
+    are no longer wanted, so rapid navigation does not leave the workers
+    busy with slides that have already been skipped.
+
+    on_error(path, size, error) is called on the worker thread when a
+    background decode fails; decodes done by get_frame() raise instead.
+    """
+
+    def __init__(self, cache=None, workers=DEFAULT_DECODE_WORKERS, color_manager=None,
+                 background=DEFAULT_BACKGROUND, loader=load_fitted_image, on_error=None):
+        self.cache = cache if cache is not None else FrameCache()
+        self.loader = loader
+        self.on_error = on_error
+        self.color_manager = color_manager
+        self.background = background
+        self.workers = workers
+        self.cancelled = 0
+        self._jobs = {}
+        self._queue = []
+        self._order = itertools.count()
+        self._threads = []
+        self._closed = False
+        self._lock = threading.Condition()
+
+    def _load(self, path, size):
+        return self.loader(path, size, color_manager=self.color_manager, background=self.background)
+
+    def _start_workers(self):
+        # Called with the lock held; threads are only started once there is work
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._worker, name=f'decode-{len(self._threads)}', daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _push(self, job):
+        heapq.heappush(self._queue, (job.priority, next(self._order), job))
+        self._lock.notify()
+
+    def _pop(self):
+        """Highest-priority live job, or None (lock held); stale heap entries are skipped"""
+        while self._queue:
+            priority, _, job = heapq.heappop(self._queue)
+            if job.state == DecodeJob.QUEUED and job.priority == priority:
+                job.state = DecodeJob.RUNNING
+                return job
+        return None
+
+    def _retire(self):
+        """Remove the calling worker if the pool was shrunk; True if it should exit (lock held)"""
+        if len(self._threads) <= self.workers:
+            return False
+        self._threads.remove(threading.current_thread())
+        return True
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                if self._retire():
+                    return
+                job = self._pop()
+                while job is None:
+                    if self._closed or self._retire():
+                        return
+                    self._lock.wait()
+                    job = self._pop()
+            self._run(job)
+
+    def set_workers(self, workers):
+        """Resize the pool; surplus threads exit once their current decode is done"""
+        with self._lock:
+            self.workers = workers
+            if self._jobs:
+                self._start_workers()
+            self._lock.notify_all()
+
+    def _run(self, job):
+        path, size = job.key
+        try:
+            frame = self._load(path, size)
+            if frame is not None:  # A loader may have nothing to offer (placeholders)
+                self.cache.put(job.key, frame)
+        except Exception as e:
+            print(f"Error prefetching {path}: {e}")
+            if self.on_error:
+                self.on_error(path, size, e)
+        finally:
+            self._finish(job, DecodeJob.DONE)
+
+    def _finish(self, job, state):
+        with self._lock:
+            job.state = state
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+            callbacks, job.callbacks = job.callbacks, []
+        job.done.set()
+        if state == DecodeJob.DONE:
+            for callback in callbacks:
+                callback()
+
+    def _queue_job(self, key, priority):
+        """Queue key or re-rank its queued job; None if already cached (lock held)"""
+        job = self._jobs.get(key)
+        if job is None:
+            if key in self.cache:
+                return None
+            job = self._jobs[key] = DecodeJob(key, priority)
+            self._push(job)
+            self._start_workers()
+        elif job.state == DecodeJob.QUEUED and job.priority != priority:
+            job.priority = priority
+            self._push(job)
+        return job
+
+    def prefetch(self, path, size, on_ready=None, priority=PRIORITY_FURTHER):
+        """Queue a background decode unless the frame is cached
+
+        on_ready() is called once the frame is in the cache (right away if it
+        already is); it may run on a worker thread. A job that is already
+        queued keeps the more urgent of its two priorities.
+        """
+        key = (path, size)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.state == DecodeJob.QUEUED and job.priority <= priority:
+                priority = job.priority
+            job = self._queue_job(key, priority)
+            if job is not None and on_ready is not None:
+                job.callbacks.append(on_ready)
+        if job is None and on_ready is not None:
+            on_ready()
+
+    def retarget(self, wanted):
+        """Make {(path, size): priority} the whole queue: re-rank those jobs and
+        cancel every other job that has not started yet"""
+        with self._lock:
+            stale = [job for key, job in self._jobs.items()
+                     if key not in wanted and job.state == DecodeJob.QUEUED]
+            for job in stale:
+                job.state = DecodeJob.CANCELLED
+                del self._jobs[job.key]
+                job.done.set()
+            self.cancelled += len(stale)
+            for key, priority in wanted.items():
+                self._queue_job(key, priority)
+
+    def get_frame(self, path, size):
+        """Return the fitted frame, waiting for or performing the decode"""
+        key = (path, size)
+        frame = self.cache.get(key)
+        if frame is not None:
+            return frame
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.state == DecodeJob.QUEUED:
+                # Needed right now: decode on this thread instead of waiting for a worker
+                job.state = DecodeJob.RUNNING
+                stolen = True
+            else:
+                stolen = False
+        if job is not None and not stolen:
+            job.done.wait()
+            frame = self.cache.get(key)
+            if frame is not None:
+                return frame
+        try:
+            frame = self._load(path, size)
+            if frame is not None:
+                self.cache.put(key, frame)
+            return frame
+        finally:
+            if stolen:
+                self._finish(job, DecodeJob.DONE)
+
+    def stats(self):
+        """Cache and queue state for status displays"""
+        with self._lock:
+            pending = len(self._jobs)
+            cancelled = self.cancelled
+        return {'cached': len(self.cache), 'bytes': self.cache.bytes, 'pending': pending,
+                'hits': self.cache.hits, 'misses': self.cache.misses, 'cancelled': cancelled}
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            for job in self._jobs.values():
+                if job.state == DecodeJob.QUEUED:
+                    job.state = DecodeJob.CANCELLED
+                    job.done.set()
+            self._jobs.clear()
+            self._lock.notify_all()
@@ -0,0 +1,143 @@
+"""
+Ken Burns pan-and-zoom for Quick Image Presenter.
+
+Each slide is decoded once into a buffer slightly larger than the screen
+(OVERSIZE). Every animation frame is a crop of that buffer, scaled to the
+display size in a single resize-with-box call, so no frame ever touches the
+original file again.
+
+Motion is driven by wall-clock time: the crop for a frame is computed from
+how far into the slide we are, so when rendering is slow frames are dropped
+and the slide still lasts exactly its display time. FramePacer measures the
+render cost and lowers the frame rate so that rendering only takes a
+bounded share of the CPU, which keeps low-end kiosks responsive.
+"""
+
+import time
+
+from PIL import Image
+
+# Buffer size relative to the displayed frame; also the maximum zoom
+OVERSIZE = 1.2
+
+DEFAULT_TARGET_FPS = 30
+DEFAULT_MIN_FPS = 4
+# Share of wall-clock time rendering may use (the rest is left for decoding etc.)
+DEFAULT_CPU_BUDGET = 0.35
+
+# Start/end crops as (zoom, horizontal focus, vertical focus); zoom 1.0 shows
+# the whole buffer, OVERSIZE shows the frame-sized centre. Slides cycle
+# through these so consecutive motions differ.
+MOTIONS = [
+    ((1.0, 0.5, 0.5), (OVERSIZE, 0.3, 0.4)),   # zoom in towards upper left
+    ((OVERSIZE, 0.7, 0.5), (1.0, 0.5, 0.5)),   # zoom out from the right
+    ((1.1, 0.0, 0.5), (1.1, 1.0, 0.5)),        # pan left to right
+    ((1.0, 0.5, 0.5), (OVERSIZE, 0.6, 0.7)),   # zoom in towards lower right
+    ((1.1, 0.5, 0.0), (1.1, 0.5, 1.0)),        # pan top to bottom
+]
+
+
+def ease_in_out(t):
+    """Smoothstep easing so motion starts and ends gently"""
+    return t * t * (3 - 2 * t)
+
+
+class KenBurnsMotion:
+    """Computes per-frame crop boxes within an oversized buffer"""
+
+    def __init__(self, buffer_size, motion_index=0):
+        self.buffer_size = buffer_size
+        self.start, self.end = MOTIONS[motion_index % len(MOTIONS)]
+
+    def _box(self, zoom, focus_x, focus_y):
+        width, height = self.buffer_size
+        crop_width, crop_height = width / zoom, height / zoom
+        left = (width - crop_width) * focus_x
+        top = (height - crop_height) * focus_y
+        return (left, top, left + crop_width, top + crop_height)
+
+    def box_at(self, progress):
+        """Crop box (floats, buffer coordinates) for progress in 0..1"""
+        t = ease_in_out(min(max(progress, 0.0), 1.0))
+        params = [a + (b - a) * t for a, b in zip(self.start, self.end)]
+        return self._box(*params)
+
+
+def render_frame(buffer, box, frame_size, resample=Image.Resampling.BILINEAR):
+    """Crop and scale the buffer in one pass (sub-pixel boxes keep motion smooth)"""
+    return buffer.resize(frame_size, resample, box=box)
+
+
+class FramePacer:
+    """Chooses the delay until the next frame from the measured render cost"""
+
+    def __init__(self, target_fps=DEFAULT_TARGET_FPS, min_fps=DEFAULT_MIN_FPS, cpu_budget=DEFAULT_CPU_BUDGET):
+        self.min_interval = 1.0 / target_fps
+        self.max_interval = 1.0 / min_fps
+        self.cpu_budget = cpu_budget
+        self.render_cost = None
+        self.frames = 0
+        self.dropped = 0
+        self._expected = None
+        self._started = time.perf_counter()
+
+    def record(self, cost):
+        """Record how long the last frame took to render (seconds)"""
+        self.frames += 1
+        # Exponential moving average smooths out single slow frames
+        self.render_cost = cost if self.render_cost is None else self.render_cost * 0.8 + cost * 0.2
+
+    def next_interval(self):
+        """Seconds to wait before rendering the next frame"""
+        if self.render_cost is None:
+            interval = self.min_interval
+        else:
+            interval = min(max(self.min_interval, self.render_cost / self.cpu_budget), self.max_interval)
+        now = time.perf_counter()
+        if self._expected is not None and now - self._expected > interval:
+            # We woke up more than a frame late; those frames are simply skipped
+            self.dropped += int((now - self._expected) / interval)
+        self._expected = now + interval
+        return interval
+
+    @property
+    def fps(self):
+        elapsed = time.perf_counter() - self._started
+        return self.frames / elapsed if elapsed > 0 else 0.0
+
+
+class KenBurnsAnimator:
+    """One slide's motion: the decoded buffer, its path and a wall-clock position"""
+
+    def __init__(self, buffer, frame_size, duration, motion_index=0, pacer=None, clock=time.perf_counter):
+        self.buffer = buffer
+        self.frame_size = frame_size
+        self.duration = max(duration, 0.001)
+        self.motion = KenBurnsMotion(buffer.size, motion_index)
+        self.pacer = pacer if pacer is not None else FramePacer()
+        self.clock = clock
+        self.started = clock()
+        self.paused_at = None
+
+    @property
+    def progress(self):
+        now = self.paused_at if self.paused_at is not None else self.clock()
+        return min((now - self.started) / self.duration, 1.0)
+
+    @property
+    def finished(self):
+        return self.progress >= 1.0
+
+    def pause(self):
+        if self.paused_at is None:
+            self.paused_at = self.clock()
+
+    def resume(self):
+        if self.paused_at is not None:
+            # Shift the start so the motion continues where it stopped
+            self.started += self.clock() - self.paused_at
+            self.paused_at = None
+
+    def render(self):
+        """Frame for the current moment (whatever frames were missed are skipped)"""
+        return render_frame(self.buffer, self.motion.box_at(self.progress), self.frame_size)
@@ -0,0 +1,226 @@
+"""
+Memory accounting for Quick Image Presenter.
+
+Every cache or buffer that holds decoded pixels registers with a
+MemoryBudget as a consumer: a function reporting the bytes it holds and,
+optionally, a function that caps it. check() adds the consumers up,
+compares the total with the budget and looks at the process RSS and the
+memory still available to the system. Under pressure the consumers are
+capped (least important first) and the prefetch depth is reduced; once
+the pressure is gone the caps are lifted again.
+
+The budget defaults to DEFAULT_BUDGET_MB and can be set with the
+QIP_MEMORY_BUDGET_MB environment variable. psutil is used for the process
+and system figures when it is installed, otherwise /proc on Linux and the
+Win32 API on Windows.
+"""
+
+import os
+import sys
+
+DEFAULT_BUDGET_MB = 512
+BUDGET_ENV = 'QIP_MEMORY_BUDGET_MB'
+
+# System memory below which the app counts as under pressure / critical
+LOW_MEMORY_MB = 512
+CRITICAL_MEMORY_MB = 192
+
+# Process RSS above this multiple of the budget counts as pressure
+RSS_FACTOR = 2.5
+
+# Pressure levels
+NORMAL, HIGH, CRITICAL = range(3)
+LEVEL_NAMES = ('normal', 'high', 'critical')
+
+# Share of the budget the caches are capped at per level
+CAP_FRACTION = {HIGH: 0.6, CRITICAL: 0.2}
+
+MB = 1024 * 1024
+
+
+def configured_budget():
+    """Budget in bytes from QIP_MEMORY_BUDGET_MB, else the default"""
+    value = os.environ.get(BUDGET_ENV)
+    if value:
+        try:
+            return max(16, int(value)) * MB
+        except ValueError:
+            print(f"Ignoring invalid {BUDGET_ENV}={value!r}")
+    return DEFAULT_BUDGET_MB * MB
+
+
+def _psutil():
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil
+
+
+def process_rss():
+    """Resident set size of this process in bytes, or None if unknown"""
+    psutil = _psutil()
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    if sys.platform.startswith('linux'):
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage',
+                    'QuotaPagedPoolUsage', 'QuotaPeakNonPagedPoolUsage',
+                    'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+    return None
+
+
+def available_memory():
+    """Memory the system can still hand out in bytes, or None if unknown"""
+    psutil = _psutil()
+    if psutil is not None:
+        return psutil.virtual_memory().available
+    if sys.platform.startswith('linux'):
+        try:
+            with open('/proc/meminfo') as f:
+                for line in f:
+                    if line.startswith('MemAvailable:'):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            return None
+        return None
+    if sys.platform == 'win32':
+        import ctypes
+
+        class MemoryStatusEx(ctypes.Structure):
+            _fields_ = [('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong)] + [
+                (name, ctypes.c_ulonglong) for name in (
+                    'ullTotalPhys', 'ullAvailPhys', 'ullTotalPageFile', 'ullAvailPageFile',
+                    'ullTotalVirtual', 'ullAvailVirtual', 'ullAvailExtendedVirtual')]
+
+        status = MemoryStatusEx()
+        status.dwLength = ctypes.sizeof(status)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys
+    return None
+
+
+class MemoryBudget:
+    """Tracks registered consumers against a byte budget and relieves pressure
+
+    Consumers are registered with usage() -> bytes and optionally
+    limit(max_bytes) -> bytes freed, where limit(None) lifts the cap.
+    Consumers registered first are capped first.
+    """
+
+    def __init__(self, budget=None, low_memory=LOW_MEMORY_MB * MB, critical_memory=CRITICAL_MEMORY_MB * MB,
+                 rss=process_rss, available=available_memory):
+        self.budget = budget or configured_budget()
+        self.low_memory = low_memory
+        self.critical_memory = critical_memory
+        self._rss = rss
+        self._available = available
+        self._consumers = {}
+        self.level = NORMAL
+        self.freed = 0
+        self.snapshot = None
+
+    def register(self, name, usage, limit=None):
+        self._consumers[name] = (usage, limit)
+
+    def unregister(self, name):
+        self._consumers.pop(name, None)
+
+    def usage(self):
+        """{consumer: bytes held}"""
+        return {name: usage() for name, (usage, _) in self._consumers.items()}
+
+    def pressure(self, held, rss, available):
+        """Pressure level for the given figures (None means unknown)"""
+        if held > self.budget * 1.5 or (available is not None and available < self.critical_memory):
+            return CRITICAL
+        if (held > self.budget or (available is not None and available < self.low_memory)
+                or (rss is not None and rss > self.budget * RSS_FACTOR)):
+            return HIGH
+        return NORMAL
+
+    def check(self):
+        """Measure, cap or release consumers for the current pressure and return a snapshot"""
+        usage = self.usage()
+        held = sum(usage.values())
+        rss = self._rss()
+        available = self._available()
+        level = self.pressure(held, rss, available)
+        if level != self.level:
+            print(f"Memory pressure {LEVEL_NAMES[self.level]} -> {LEVEL_NAMES[level]}: "
+                  f"{held / MB:.0f} MB cached, budget {self.budget / MB:.0f} MB")
+        if level == NORMAL:
+            if self.level != NORMAL:
+                for _, limit in self._consumers.values():
+                    if limit is not None:
+                        limit(None)
+        else:
+            freed = self._relieve(usage, int(min(self.budget, held) * CAP_FRACTION[level]))
+            if freed:
+                self.freed += freed
+                held -= freed
+                print(f"Memory pressure {LEVEL_NAMES[level]}: freed {freed / MB:.1f} MB")
+        self.level = level
+        self.snapshot = {
+            'level': LEVEL_NAMES[level],
+            'cached': held,
+            'budget': self.budget,
+            'rss': rss,
+            'available': available,
+            'freed': self.freed,
+            'consumers': usage,
+        }
+        return self.snapshot
+
+    def _relieve(self, usage, target):
+        """Cap consumers, in registration order, until the total fits target"""
+        excess = sum(usage.values()) - target
+        freed = 0
+        for name, (_, limit) in self._consumers.items():
+            if limit is None:
+                continue
+            held = usage.get(name, 0)
+            cap = max(0, held - max(excess, 0))
+            released = limit(cap) or 0
+            excess -= released
+            freed += released
+        return freed
+
+    def prefetch_radius(self, radius):
+        """Prefetch depth allowed at the current pressure"""
+        if self.level == CRITICAL:
+            return 0
+        if self.level == HIGH:
+            return min(radius, 1)
+        return radius
+
+    def status_text(self):
+        """One-line summary for the status line"""
+        snapshot = self.snapshot
+        if snapshot is None:
+            return ""
+        text = f"Memory: {snapshot['cached'] / MB:.0f}/{snapshot['budget'] / MB:.0f} MB cached"
+        if snapshot['rss'] is not None:
+            text += f", process {snapshot['rss'] / MB:.0f} MB"
+        if snapshot['available'] is not None:
+            text += f", {snapshot['available'] / MB:.0f} MB free"
+        if self.level != NORMAL:
+            text += f" ({snapshot['level']} pressure)"
+        return text
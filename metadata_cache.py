@@ -0,0 +1,132 @@
+"""
+Persistent per-file metadata cache for Quick Image Presenter.
+
+Values that are expensive to compute from an image (perceptual hashes,
+header metadata) are stored per absolute path together with the file's
+mtime and size, in a JSON file in the user's cache directory. A record is
+only reused while both still match, so rescans only touch new or changed
+files.
+"""
+
+import json
+import os
+import sys
+import threading
+
+CACHE_FILENAME = 'metadata.json'
+CACHE_VERSION = 1
+
+_shared_lock = threading.Lock()
+_shared_cache = None
+
+
+def cache_dir():
+    """Per-user cache directory for this application"""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~\\AppData\\Local')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'quick-image-presenter')
+
+
+def file_signature(path):
+    """(mtime_ns, size) of a file, or None if it cannot be read
+
+    Archive members are identified by the archive's mtime and the member's size,
+    pages and compiled deck slides by their file's signature.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        from pages import split_page_path
+        base, page = split_page_path(path)
+        if page:
+            return file_signature(base)  # A page changes with its file
+        from compiled_deck import split_slide_path
+        slide = split_slide_path(path)
+        if slide is not None:
+            return file_signature(slide[0])
+        from archives import member_signature
+        try:
+            return member_signature(path)
+        except (OSError, ValueError) as e:
+            print(f"Could not read archive for {path}: {e}")
+            return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class MetadataCache:
+    """Thread-safe {path: {field: value}} store, valid per (mtime, size)"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(cache_dir(), CACHE_FILENAME)
+        self._records = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable metadata cache {self.path}: {e}")
+            return
+        if isinstance(data, dict) and data.get('version') == CACHE_VERSION:
+            self._records = data.get('files', {})
+
+    def __len__(self):
+        with self._lock:
+            return len(self._records)
+
+    def get(self, path, signature, field):
+        """Cached value of field for path, or None if missing or stale"""
+        if signature is None:
+            return None
+        with self._lock:
+            record = self._records.get(path)
+            if record is None or record.get('sig') != list(signature):
+                return None
+            return record.get(field)
+
+    def put(self, path, signature, **fields):
+        """Store fields for path; a changed signature drops the old fields"""
+        if signature is None:
+            return
+        with self._lock:
+            record = self._records.get(path)
+            if record is None or record.get('sig') != list(signature):
+                record = self._records[path] = {'sig': list(signature)}
+            record.update(fields)
+            self._dirty = True
+
+    def save(self):
+        """Write the cache if anything changed (atomically, via a temporary file)"""
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                data = json.dumps({'version': CACHE_VERSION, 'files': self._records}, separators=(',', ':'))
+                self._dirty = False
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                temp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    f.write(data)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                print(f"Could not save metadata cache {self.path}: {e}")
+
+
+def shared_cache():
+    """The process-wide MetadataCache, loaded on first use"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = MetadataCache()
+        return _shared_cache
@@ -0,0 +1,108 @@
+"""
+Multi-page image support for Quick Image Presenter.
+
+A multi-page TIFF (for example a scanned document, or a PDF exported page
+by page to TIFF) starts out as a single slide. When it comes near the
+prefetch window its pages are counted by following the TIFF directory
+chain, which reads a few bytes of header per page and no pixel data, and
+the slide is replaced by one slide per page. Page slides refer to
+"scan.tif#page=N" (N counted from 0, page 0 keeps the plain path), so
+each page is decoded only when the prefetcher gets to it.
+"""
+
+import struct
+
+from playlist import PlaylistEntry
+
+PAGE_SEPARATOR = '#page='
+MULTIPAGE_EXTENSIONS = ('.tif', '.tiff')
+
+# Stop following a directory chain after this many pages (corrupt or hostile files)
+MAX_PAGES = 10000
+
+
+def may_have_pages(path):
+    return split_page_path(path)[0].lower().endswith(MULTIPAGE_EXTENSIONS)
+
+
+def split_page_path(path):
+    """(file path, page index) for a page path; plain paths are page 0"""
+    base, separator, page = path.rpartition(PAGE_SEPARATOR)
+    if separator and page.isdigit():
+        return base, int(page)
+    return path, 0
+
+
+def page_path(path, page):
+    return path if page == 0 else f"{path}{PAGE_SEPARATOR}{page}"
+
+
+def count_tiff_pages(f, limit=MAX_PAGES):
+    """Number of image directories (pages) in a TIFF file object
+
+    Only the directory headers are read: for each page the entry count and
+    the offset of the next directory. Classic and BigTIFF are supported.
+    """
+    header = f.read(16)
+    if header[:2] == b'II':
+        order = '<'
+    elif header[:2] == b'MM':
+        order = '>'
+    else:
+        raise ValueError("Not a TIFF file")
+    version = struct.unpack(order + 'H', header[2:4])[0]
+    if version == 42:
+        offset = struct.unpack(order + 'I', header[4:8])[0]
+        count_format, entry_size, offset_format = 'H', 12, 'I'
+    elif version == 43:
+        offset = struct.unpack(order + 'Q', header[8:16])[0]
+        count_format, entry_size, offset_format = 'Q', 20, 'Q'
+    else:
+        raise ValueError(f"Unknown TIFF version {version}")
+    count_size = struct.calcsize(count_format)
+    offset_size = struct.calcsize(offset_format)
+
+    pages = 0
+    seen = set()
+    while offset and offset not in seen and pages < limit:
+        seen.add(offset)
+        f.seek(offset)
+        data = f.read(count_size)
+        if len(data) < count_size:
+            break  # Truncated file: count the pages found so far
+        entries = struct.unpack(order + count_format, data)[0]
+        f.seek(offset + count_size + entries * entry_size)
+        data = f.read(offset_size)
+        pages += 1
+        if len(data) < offset_size:
+            break
+        offset = struct.unpack(order + offset_format, data)[0]
+    return pages
+
+
+def expand_entry(entry):
+    """One PlaylistEntry per page of a multi-page file, or None for single pages
+
+    Either way the original entry is marked as checked (entry.page = 0).
+    """
+    from archives import open_file
+
+    entry.page = 0
+    source = open_file(entry.path)
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            count = count_tiff_pages(f)
+    else:
+        count = count_tiff_pages(source)
+    if count <= 1:
+        return None
+    pages = []
+    for page in range(count):
+        slide = PlaylistEntry(f"{entry.filename} [{page + 1}/{count}]", page_path(entry.path, page),
+                              entry.duration, entry.transition)
+        slide.page = page
+        slide.sort_key = entry.sort_key
+        slide.order = entry.order
+        slide.duplicate_of = entry.duplicate_of
+        pages.append(slide)
+    return pages
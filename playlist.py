@@ -0,0 +1,210 @@
+"""
+Playlist support for Quick Image Presenter.
+
+A playlist manifest lists slides from any number of folders, each with its
+own display time and optional transition. Manifests can be JSON or CSV:
+
+    JSON: {"entries": [{"path": "intro/a.jpg", "duration": 8, "transition": "Fade"}, ...]}
+          or simply a top-level list of such objects (or plain path strings)
+    CSV:  path,duration,transition
+          intro/a.jpg,8,Fade
+
+Relative paths are resolved against the manifest's own folder. Manifests are
+parsed incrementally so the first slides are available long before a large
+file has been read completely.
+"""
+
+import csv
+import json
+import os
+
+MANIFEST_EXTENSIONS = {'.json', '.csv'}
+
+# Size of each read when streaming a JSON manifest
+JSON_CHUNK_SIZE = 64 * 1024
+
+
+class PlaylistEntry:
+    """A single slide: where it comes from and how it should be shown"""
+
+    __slots__ = ('filename', 'path', 'duration', 'transition', 'sort_key', 'duplicate_of', 'page', 'order')
+
+    def __init__(self, filename, path, duration=None, transition=None):
+        self.filename = filename
+        self.path = path
+        self.duration = duration
+        self.transition = transition
+        self.sort_key = None
+        self.duplicate_of = None
+        self.page = None  # Page of a multi-page file; None until the file has been checked
+        self.order = None  # Position in the loaded slide list, for going back to it after other sorts
+
+    def __repr__(self):
+        return f"PlaylistEntry({self.filename!r}, {self.path!r}, duration={self.duration!r})"
+
+
+class ManifestError(ValueError):
+    """Raised when a playlist manifest cannot be parsed"""
+
+
+def is_manifest(path):
+    """Return True if path looks like a playlist manifest file"""
+    return os.path.isfile(path) and os.path.splitext(path)[1].lower() in MANIFEST_EXTENSIONS
+
+
+def parse_duration(value):
+    """Parse a manifest duration; returns seconds or None when not given"""
+    if value is None or value == '':
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        raise ManifestError(f"Invalid duration: {value!r}")
+    if seconds <= 0:
+        raise ManifestError(f"Duration must be positive: {value!r}")
+    return int(seconds) if seconds.is_integer() else seconds
+
+
+def make_entry(raw, base_dir):
+    """Build a PlaylistEntry from a manifest record (dict or path string)"""
+    if isinstance(raw, str):
+        raw = {'path': raw}
+    if not isinstance(raw, dict) or not raw.get('path'):
+        raise ManifestError(f"Manifest entry has no path: {raw!r}")
+
+    path = os.path.expanduser(str(raw['path']).strip())
+    if not os.path.isabs(path):
+        path = os.path.join(base_dir, path)
+    path = os.path.normpath(path)
+
+    transition = raw.get('transition') or None
+    return PlaylistEntry(os.path.basename(path), path,
+                         duration=parse_duration(raw.get('duration')),
+                         transition=transition)
+
+
+def iter_manifest(manifest_path):
+    """Yield PlaylistEntry objects from a JSON or CSV manifest, one at a time"""
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    ext = os.path.splitext(manifest_path)[1].lower()
+
+    if ext == '.csv':
+        records = _iter_csv_records(manifest_path)
+    elif ext == '.json':
+        records = _iter_json_records(manifest_path)
+    else:
+        raise ManifestError(f"Unsupported manifest type: {ext}")
+
+    for record in records:
+        yield make_entry(record, base_dir)
+
+
+def _iter_csv_records(manifest_path):
+    """Yield dict records from a CSV manifest (header row optional)"""
+    columns = ['path', 'duration', 'transition']
+    with open(manifest_path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        first = True
+        for row in reader:
+            if not row or not row[0].strip() or row[0].lstrip().startswith('#'):
+                continue
+            if first:
+                first = False
+                if row[0].strip().lower() == 'path':
+                    # Header row: honour its column order
+                    columns = [c.strip().lower() for c in row]
+                    continue
+            yield dict(zip(columns, (c.strip() for c in row)))
+
+
+class _JsonStream:
+    """Minimal pull parser that decodes a JSON document value by value"""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        chunk = self.f.read(JSON_CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop the consumed prefix so the buffer stays small
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ManifestError(f"Expected {char!r} in manifest at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        """Decode one complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+                # A number that ends exactly at the buffer edge may be truncated
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise ManifestError(f"Invalid JSON manifest: {e}")
+            self._fill()
+
+    def iter_array(self):
+        """Yield the elements of the array starting at the current position"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise ManifestError("Expected ',' or ']' in manifest entries")
+
+
+def _iter_json_records(manifest_path):
+    """Yield entry records from a JSON manifest without loading it whole"""
+    with open(manifest_path, encoding='utf-8-sig') as f:
+        stream = _JsonStream(f)
+        start = stream.peek()
+
+        if start == '[':
+            yield from stream.iter_array()
+            return
+
+        if start != '{':
+            raise ManifestError("JSON manifest must be a list or an object with an 'entries' list")
+
+        # Walk the top-level object until the "entries" array is reached
+        stream.expect('{')
+        while stream.peek() != '}':
+            key = stream.value()
+            stream.expect(':')
+            if key == 'entries':
+                yield from stream.iter_array()
+                return
+            stream.value()
+            if stream.peek() == ',':
+                stream.pos += 1
+        raise ManifestError("JSON manifest has no 'entries' list")
@@ -0,0 +1,154 @@
+"""
+Power profiles and wake-up accounting for Quick Image Presenter.
+
+The normal profile wakes up once a second per slide to redraw the
+countdown, checks memory every two seconds and animates transitions and
+Ken Burns motion. The low-power profile, for battery-backed and fanless
+kiosks, waits for each slide's whole display time in a single timer wait
+and shows no countdown. It checks memory less often, cuts between slides
+and decodes with bilinear instead of Lanczos resampling on one worker, so
+the next slide is decoded in one burst right after a slide change and the
+CPU sleeps for the rest of the slide.
+
+Low power is switched on in the settings or with QIP_LOW_POWER=1.
+QIP_MEASURE_POWER=1 turns on a WakeupMeter that prints, once a minute, the
+application wake-ups by source, the process CPU time and (where the
+operating system reports them) the context switches of all threads, all
+per minute, so the two profiles can be compared.
+"""
+
+import os
+import sys
+import time
+from collections import Counter
+
+LOW_POWER_ENV = 'QIP_LOW_POWER'
+MEASURE_ENV = 'QIP_MEASURE_POWER'
+
+# Seconds between wake-up reports in measurement mode
+MEASURE_INTERVAL = 60.0
+
+
+class PowerProfile:
+    """Timer, animation and decode settings that trade smoothness for wake-ups
+
+    countdown_step: seconds between countdown redraws (None: no countdown,
+    one timer wait per slide). resample: name of the Pillow resampling
+    filter used for slides.
+    """
+
+    def __init__(self, name, countdown_step, memory_check_ms, resample, decode_workers, animations):
+        self.name = name
+        self.countdown_step = countdown_step
+        self.memory_check_ms = memory_check_ms
+        self.resample = resample
+        self.decode_workers = decode_workers
+        self.animations = animations
+
+    def __repr__(self):
+        return f"PowerProfile({self.name!r})"
+
+
+NORMAL = PowerProfile('normal', countdown_step=1, memory_check_ms=2000, resample='LANCZOS',
+                      decode_workers=2, animations=True)
+LOW_POWER = PowerProfile('low power', countdown_step=None, memory_check_ms=15000, resample='BILINEAR',
+                         decode_workers=1, animations=False)
+
+
+def _enabled(name):
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def low_power_configured():
+    """True if QIP_LOW_POWER asks for the low-power profile"""
+    return _enabled(LOW_POWER_ENV)
+
+
+def measurement_configured():
+    return _enabled(MEASURE_ENV)
+
+
+def context_switches():
+    """Voluntary + involuntary context switches of all threads of this process, or None
+
+    A voluntary switch is a thread going to sleep, so this counts wake-ups
+    that the application's own counters cannot see (Tk, Pillow, sockets).
+    """
+    try:
+        import psutil
+        switches = psutil.Process().num_ctx_switches()
+        return switches.voluntary + switches.involuntary
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    if not sys.platform.startswith('linux'):
+        return None
+    total = 0
+    try:
+        for task in os.listdir('/proc/self/task'):
+            try:
+                with open(f'/proc/self/task/{task}/status') as f:
+                    for line in f:
+                        if line.startswith(('voluntary_ctxt_switches', 'nonvoluntary_ctxt_switches')):
+                            total += int(line.split()[1])
+            except OSError:
+                continue  # Thread exited while listing
+    except (OSError, ValueError):
+        return None
+    return total
+
+
+class WakeupMeter:
+    """Counts application wake-ups by source and reports them with CPU time per minute"""
+
+    def __init__(self, interval=MEASURE_INTERVAL, clock=time.monotonic, cpu_time=time.process_time,
+                 switches=context_switches):
+        import threading
+        self.interval = interval
+        self.clock = clock
+        self.cpu_time = cpu_time
+        self.switches = switches
+        self.last_report = None
+        self._lock = threading.Lock()  # The countdown thread counts too
+        self._reset()
+
+    def _reset(self):
+        self.counts = Counter()
+        self.started = self.clock()
+        self.cpu_started = self.cpu_time()
+        self.switches_started = self.switches()
+
+    def count(self, source):
+        with self._lock:
+            self.counts[source] += 1
+
+    def report(self, reset=True):
+        """{'seconds', 'wakeups_per_minute', 'sources', 'cpu_seconds_per_minute',
+        'context_switches_per_minute'} since the last report"""
+        with self._lock:
+            seconds = max(self.clock() - self.started, 1e-6)
+            scale = 60.0 / seconds
+            switches = self.switches()
+            report = {
+                'seconds': round(seconds, 1),
+                'wakeups_per_minute': round(sum(self.counts.values()) * scale, 1),
+                'sources': {source: round(count * scale, 1) for source, count in self.counts.most_common()},
+                'cpu_seconds_per_minute': round((self.cpu_time() - self.cpu_started) * scale, 3),
+                'context_switches_per_minute': (round((switches - self.switches_started) * scale, 1)
+                                                if switches is not None and self.switches_started is not None
+                                                else None),
+            }
+            if reset:
+                self._reset()
+        self.last_report = report
+        return report
+
+    @staticmethod
+    def format(report, profile_name):
+        sources = ', '.join(f"{source} {rate:g}" for source, rate in report['sources'].items()) or 'none'
+        text = (f"Power ({profile_name}, {report['seconds']:g} s): {report['wakeups_per_minute']:g} wake-ups/min "
+                f"[{sources}], CPU {report['cpu_seconds_per_minute']:.3f} s/min")
+        if report['context_switches_per_minute'] is not None:
+            text += f", {report['context_switches_per_minute']:g} context switches/min"
+        return text
@@ -0,0 +1,161 @@
+"""
+Presenter view for Quick Image Presenter.
+
+While a presentation runs, the control window shows the current slide, the
+upcoming slide, the time left on the current slide and the whole slide
+list. The previews are downscaled from frames that are already in memory
+(the frame on screen and the prefetcher's caches, read without touching
+their LRU order or statistics), so the view never triggers a decode of its
+own. A slide that is not decoded yet shows a placeholder until the next
+refresh finds its frame.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from PIL import Image, ImageTk
+
+from image_pipeline import fit_size
+
+CURRENT_PREVIEW_SIZE = (560, 315)
+NEXT_PREVIEW_SIZE = (360, 203)
+
+
+def make_preview(frame, box):
+    """Fit frame into box cheaply: integer box reduction first, then one bilinear pass"""
+    factor = max(1, min(frame.width // box[0], frame.height // box[1]))
+    if factor > 1:
+        frame = frame.reduce(factor)
+    return frame.resize(fit_size(frame.size, box), Image.Resampling.BILINEAR)
+
+
+class PresenterView:
+    """Frame in the control window; on_select(index) jumps to a slide from the list"""
+
+    def __init__(self, parent, entries, on_select):
+        self.entries = entries
+        self.on_select = on_select
+        self.current_photo = None
+        self.next_photo = None
+        self.next_entry = None
+
+        self.frame = ttk.Frame(parent, padding="20")
+        self.frame.columnconfigure(0, weight=3)
+        self.frame.columnconfigure(1, weight=2)
+        self.frame.rowconfigure(1, weight=1)
+
+        current_frame = ttk.LabelFrame(self.frame, text="Current Slide", padding="10")
+        current_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10))
+        self.current_label = self._preview_box(current_frame, CURRENT_PREVIEW_SIZE)
+        self.current_title = ttk.Label(current_frame, text="", style='Subtitle.TLabel')
+        self.current_title.pack(pady=(8, 0))
+
+        side = ttk.Frame(self.frame)
+        side.grid(row=0, column=1, sticky=(tk.W, tk.E, tk.N))
+        next_frame = ttk.LabelFrame(side, text="Next Slide", padding="10")
+        next_frame.pack(fill='x')
+        self.next_label = self._preview_box(next_frame, NEXT_PREVIEW_SIZE)
+        self.next_title = ttk.Label(next_frame, text="", style='Info.TLabel')
+        self.next_title.pack(pady=(8, 0))
+        self.time_label = ttk.Label(side, text="", font=('Segoe UI', 36, 'bold'))
+        self.time_label.pack(pady=(20, 0))
+        self.position_label = ttk.Label(side, text="", style='Info.TLabel')
+        self.position_label.pack()
+
+        list_frame = ttk.LabelFrame(self.frame, text="Slides", padding="10")
+        list_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(20, 0))
+        list_frame.columnconfigure(0, weight=1)
+        list_frame.rowconfigure(0, weight=1)
+        self.slide_list = tk.Listbox(list_frame, activestyle='none', font=('Segoe UI', 10), exportselection=False)
+        scrollbar = ttk.Scrollbar(list_frame, orient='vertical', command=self.slide_list.yview)
+        self.slide_list.configure(yscrollcommand=scrollbar.set)
+        self.slide_list.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.slide_list.bind('<Double-Button-1>', self._on_activate)
+        self.slide_list.bind('<Return>', self._on_activate)
+        self.listed = 0
+        self.sync_list()
+
+    @staticmethod
+    def _preview_box(parent, size):
+        """Label inside a black box of a fixed pixel size"""
+        box = tk.Frame(parent, bg='black', width=size[0], height=size[1])
+        box.pack_propagate(False)
+        box.pack()
+        label = tk.Label(box, bg='black', fg='#888888')
+        label.pack(expand=True, fill='both')
+        return label
+
+    def grid(self, **options):
+        self.frame.grid(**options)
+
+    def set_entries(self, entries):
+        """Relist the slides after the slide list was replaced (e.g. duplicates skipped)"""
+        self.entries = entries
+        self.slide_list.delete(0, 'end')
+        self.listed = 0
+        self.sync_list()
+
+    def sync_list(self):
+        """Append entries added since the last call (playlists keep loading while presenting)"""
+        if len(self.entries) > self.listed:
+            self.slide_list.insert('end', *(f"{number}. {entry.filename}" for number, entry in
+                                            enumerate(self.entries[self.listed:], self.listed + 1)))
+            self.listed = len(self.entries)
+
+    def _on_activate(self, event):
+        selection = self.slide_list.curselection()
+        if selection:
+            self.on_select(selection[0])
+
+    def show(self, index, frame, next_entry, next_frame):
+        """Show slide index (frame: the PIL image on screen) and the upcoming slide"""
+        self.sync_list()
+        entry = self.entries[index]
+        self.current_photo = self._preview(self.current_label, frame, CURRENT_PREVIEW_SIZE)
+        self.current_title.config(text=entry.filename)
+        self.position_label.config(text=f"Slide {index + 1} of {len(self.entries)}")
+        self.slide_list.selection_clear(0, 'end')
+        self.slide_list.selection_set(index)
+        self.slide_list.see(index)
+        self.next_entry = next_entry
+        self.show_next(next_entry, next_frame)
+
+    def show_next(self, next_entry, next_frame):
+        """Fill in the upcoming slide; next_frame is None until it has been decoded"""
+        if next_entry is None:
+            self.next_photo = None
+            self.next_label.config(image='', text="End of presentation")
+            self.next_title.config(text="")
+            return
+        self.next_title.config(text=next_entry.filename)
+        if next_frame is None:
+            self.next_photo = None
+            self.next_label.config(image='', text="Not decoded yet")
+        else:
+            self.next_photo = self._preview(self.next_label, next_frame, NEXT_PREVIEW_SIZE)
+
+    @property
+    def needs_next_frame(self):
+        return self.next_entry is not None and self.next_photo is None
+
+    def _preview(self, label, frame, box):
+        if frame is None:
+            label.config(image='', text="")
+            return None
+        photo = ImageTk.PhotoImage(make_preview(frame, box))
+        label.config(image=photo, text="")
+        return photo
+
+    def set_remaining(self, seconds):
+        self.time_label.config(text="" if seconds is None else f"{seconds}s")
+
+    def memory_bytes(self):
+        """Bytes held by the two preview PhotoImages (Tk keeps 4 bytes per pixel)"""
+        return sum(photo.width() * photo.height() * 4
+                   for photo in (self.current_photo, self.next_photo) if photo is not None)
+
+    def destroy(self):
+        self.frame.destroy()
+        self.current_photo = None
+        self.next_photo = None
@@ -1,13 +1,39 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
-import re
+import sys
 import time
-from PIL import Image, ImageTk, ImageOps
-import threading
 import math
-import platform
-import subprocess
+from playlist import PlaylistEntry, ManifestError, is_manifest, iter_manifest
+from filename_rules import FilenameRules
+from power_profile import NORMAL, LOW_POWER, low_power_configured, measurement_configured
+
+# PIL, threading, subprocess and the decode/sync/remote modules are imported
+# where they are first needed so the window appears as early as possible.
+# Run bench_startup.py to check the import cost.
+
+# Entries are handed to the Tk thread in batches while a playlist is parsed
+PLAYLIST_BATCH_SIZE = 500
+
+# Transparent thumbnails are composited onto the preview frame colour
+PREVIEW_BACKGROUND = (245, 245, 245)
+
+# Pre-shrunk icon decoded at startup; the full-size icon is only a fallback
+ICON_FILES = ("icon_small.png", "icon.png")
+
+# Jumps show a frame decoded at 1/LOW_RES_SCALE of the screen until the full one is ready
+LOW_RES_SCALE = 4
+LOW_RES_CACHE_SIZE = 24
+# Slides around a jump target decoded at full (JUMP_WARM_RADIUS) and low resolution
+JUMP_WARM_RADIUS = 2
+LOW_RES_WARM_RADIUS = 6
+# Shortest time a slide is shown, in seconds (manifests and filename rules allow fractions)
+MIN_DISPLAY_TIME = 0.1
+# How long a normal advance keeps the previous slide up waiting for the next full frame,
+# so the slide's transition runs on it; after that the placeholder (if any) is shown with a cut
+PROGRESSIVE_WAIT_MS = 300
+# Quiet time after the last navigation key before the slide it landed on is painted
+NAVIGATION_SETTLE_MS = 150
 
 class QuickImagePresenter:
     def __init__(self, root):
@@ -16,14 +42,8 @@ class QuickImagePresenter:
         self.root.geometry("1400x900")
         self.root.resizable(True, True)
         
-        # Set application icon
-        try:
-            icon_path = os.path.join(os.path.dirname(__file__), "icon.png")
-            if os.path.exists(icon_path):
-                icon_image = tk.PhotoImage(file=icon_path)
-                self.root.iconphoto(True, icon_image)
-        except Exception as e:
-            print(f"Could not load icon: {e}")
+        # Set application icon once the window is up
+        self.root.after_idle(self.load_icon)
         
         # Configure style for modern look
         self.setup_styles()
@@ -38,9 +58,66 @@ class QuickImagePresenter:
         self.presentation_window = None
         self.timer_thread = None
         self.stop_timer = False
+        self.timer_cancel = None
         self.preview_images = []
+        self.preview_frames = []
+        self.previews_trimmed = False  # Thumbnails were dropped under memory pressure
         self.current_photo = None
+        self.current_frame = None
+        self.transition = None
+        self.transition_fps = None
+        self.transition_dropped = None
+        self.ken_burns_stats = None  # Frame rate of the last slide's pan/zoom, for the status
         self.sleep_prevention_active = False
+        self.playlist_loading = False
+        self.playlist_generation = 0
+        self.filename_rules = FilenameRules()
+        self._prefetcher = None
+        self._low_res_prefetcher = None
+        self._memory_budget = None
+        self.memory_job = None
+        self._slide_index = None
+        self._slide_index_key = None
+        self.low_res_index = None  # Slide still waiting for its full frame (placeholder or previous slide up)
+        self.pending_transition = None
+        self.displayed_index = None
+        self.navigation_job = None
+        self.search_frame = None
+        self.search_entry = None
+        self.search_candidates = []
+        self.search_choice = 0
+        self._sleep_inhibitor = None
+        self.sync_mode = tk.StringVar(value="Off")
+        self.sync_node = None
+        self.sync_schedule = None
+        self.sync_warning = None
+        self.sync_durations = []
+        self.remote_enabled = tk.BooleanVar(value=False)
+        self.remote_server = None
+        self.remote_latency_ms = None  # Receipt to execution of the last remote command
+        self.paused = False
+        self.overview = None
+        self.ken_burns = tk.BooleanVar(value=False)
+        self.duplicate_mode = tk.StringVar(value="Off")
+        self.ken_burns_animator = None
+        self.ken_burns_job = None
+        self.extra_display_count = tk.IntVar(value=0)
+        self.extra_display_offset = tk.StringVar(value="0")  # One step for all displays, or "0, 5, 10"
+        self.extra_playlist = tk.StringVar()
+        self.extra_displays = []
+        self.presenter_view = None
+        self.low_power = tk.BooleanVar(value=low_power_configured())
+        self.power_profile = NORMAL
+        self.wakeup_meter = None
+        self.measure_job = None
+        self.timer_deadline = None
+        self.show_captions = tk.BooleanVar(value=False)
+        self.loader_key = None
+        self.quarantine = {}
+        self.sort_mode = tk.StringVar(value="Name")
+        self.shuffle_seed = tk.IntVar(value=0)
+        self.sort_records = {}
+        self.sort_records_key = None
         
         # Transition types
         self.transitions = [
@@ -51,6 +128,170 @@ class QuickImagePresenter:
         
         self.setup_ui()
     
+    def load_icon(self):
+        """Set the window icon (deferred so it does not delay the first window)"""
+        try:
+            base_dir = os.path.dirname(__file__)
+            for name in ICON_FILES:
+                icon_path = os.path.join(base_dir, name)
+                if os.path.exists(icon_path):
+                    self.icon_image = tk.PhotoImage(file=icon_path)
+                    self.root.iconphoto(True, self.icon_image)
+                    break
+        except Exception as e:
+            print(f"Could not load icon: {e}")
+    
+    @property
+    def prefetcher(self):
+        """Background decoder, created on first use"""
+        if self._prefetcher is None:
+            from image_pipeline import Prefetcher
+            from color_management import ColorManager
+            self._prefetcher = Prefetcher(
+                workers=self.power_profile.decode_workers, color_manager=ColorManager(),
+                on_error=lambda path, size, e: self.root.after(0, self.decode_failed, path,
+                                                               str(e) or type(e).__name__))
+        return self._prefetcher
+    
+    @property
+    def low_res_prefetcher(self):
+        """Decoder for placeholder frames (embedded thumbnails, reduced decodes), with its own small cache"""
+        if self._low_res_prefetcher is None:
+            from image_pipeline import Prefetcher, FrameCache, load_placeholder
+            self._low_res_prefetcher = Prefetcher(cache=FrameCache(LOW_RES_CACHE_SIZE), workers=1,
+                                                  color_manager=self.prefetcher.color_manager,
+                                                  loader=load_placeholder)
+        return self._low_res_prefetcher
+    
+    @property
+    def memory_budget(self):
+        """Accounts for every decoded-pixel cache; the first consumers are capped first under pressure"""
+        if self._memory_budget is None:
+            from memory_budget import MemoryBudget
+            budget = self._memory_budget = MemoryBudget()
+            budget.register('overview',
+                            lambda: self.overview.memory_bytes() if self.overview and self.overview.is_open else 0,
+                            lambda cap: self.overview.limit(cap) if self.overview and self.overview.is_open else 0)
+            budget.register('previews', self.preview_bytes, self.limit_previews)
+            budget.register('low-res frames',
+                            lambda: self._low_res_prefetcher.cache.bytes if self._low_res_prefetcher else 0,
+                            lambda cap: self._low_res_prefetcher.cache.limit(cap) if self._low_res_prefetcher else 0)
+            budget.register('archive buffers', self.archive_buffer_bytes, self.limit_archive_buffers)
+            budget.register('frames',
+                            lambda: self._prefetcher.cache.bytes if self._prefetcher else 0,
+                            lambda cap: self._prefetcher.cache.limit(cap) if self._prefetcher else 0)
+            budget.register('screen', self.screen_bytes)
+            budget.register('presenter view', lambda: self.presenter_view.memory_bytes() if self.presenter_view else 0)
+            budget.register('extra displays', lambda: sum(display.memory_bytes() for display in self.extra_displays))
+        return self._memory_budget
+    
+    def preview_bytes(self):
+        """Bytes held by the control window's preview thumbnails (Tk keeps 4 bytes per pixel)"""
+        return sum(photo.width() * photo.height() * 4 for photo in self.preview_images)
+    
+    def limit_previews(self, cap):
+        """Drop preview thumbnails from the end until they fit cap; None brings dropped ones back"""
+        if cap is None:
+            if self.previews_trimmed:
+                self.previews_trimmed = False
+                self.root.after_idle(self.update_preview)
+            return 0
+        freed = 0
+        while self.preview_images and self.preview_bytes() > cap:
+            photo = self.preview_images.pop()
+            self.preview_frames.pop().destroy()
+            freed += photo.width() * photo.height() * 4
+            self.previews_trimmed = True
+        return freed
+    
+    def archive_buffer_bytes(self):
+        archives = sys.modules.get('archives')
+        return archives.buffered_bytes() if archives else 0
+    
+    def limit_archive_buffers(self, cap):
+        archives = sys.modules.get('archives')
+        return archives.limit_buffers(cap) if archives else 0
+    
+    def screen_bytes(self):
+        """Bytes held by the slide on screen: its frame, PhotoImage and Ken Burns buffer"""
+        from image_pipeline import image_bytes
+        held = image_bytes(self.current_frame) if self.current_frame is not None else 0
+        if self.current_photo is not None:
+            held += self.current_photo.width() * self.current_photo.height() * 4
+        if self.ken_burns_animator is not None:
+            held += image_bytes(self.ken_burns_animator.buffer)
+        return held
+    
+    def check_memory(self):
+        """Periodic memory check while presenting: relieve pressure and report the figures"""
+        self.memory_job = None
+        if not self.presentation_running or not self.presentation_window:
+            return
+        self.note_wakeup('memory check')
+        self.memory_budget.check()
+        self.status_label.config(text=self.memory_budget.status_text())
+        self.memory_job = self.presentation_window.after(self.power_profile.memory_check_ms, self.check_memory)
+    
+    def apply_power_profile(self):
+        """Pick the power profile for a presentation that is about to start"""
+        self.power_profile = LOW_POWER if self.low_power.get() else NORMAL
+        self.configure_loader()
+        self.prefetcher.set_workers(self.power_profile.decode_workers)
+        if measurement_configured() and self.wakeup_meter is None:
+            from power_profile import WakeupMeter
+            self.wakeup_meter = WakeupMeter()
+    
+    def configure_loader(self):
+        """Set how the prefetcher decodes slides: resampling filter and captions drawn in
+        
+        Captioned and plain frames share cache keys, so the cache is emptied when this changes.
+        """
+        from functools import partial
+        from PIL import Image
+        from image_pipeline import load_fitted_image
+        resample = getattr(Image.Resampling, self.power_profile.resample)
+        # Ken Burns crops into the frame, which would cut the caption off
+        captions = self.show_captions.get() and not (self.ken_burns.get() and self.power_profile.animations)
+        style = None
+        if captions:
+            from captions import CaptionStyle, load_captioned_image
+            source = self.folder_path.get()
+            style = CaptionStyle.for_folder(source if os.path.isdir(source) else os.path.dirname(os.path.abspath(source)))
+            loader = partial(load_captioned_image, resample=resample, style=style)
+        else:
+            loader = partial(load_fitted_image, resample=resample)
+        key = (resample, style)
+        if key != self.loader_key:
+            self.prefetcher.cache.clear()
+            self.loader_key = key
+        self.prefetcher.loader = loader
+    
+    def note_wakeup(self, source):
+        """Count a wake-up in measurement mode (QIP_MEASURE_POWER=1)"""
+        if self.wakeup_meter is not None:
+            self.wakeup_meter.count(source)
+    
+    def report_power(self, final=False):
+        """Print the wake-ups and CPU time per minute since the last report"""
+        self.measure_job = None
+        meter = self.wakeup_meter
+        if meter is None:
+            return
+        print(meter.format(meter.report(), self.power_profile.name))
+        self.publish_status()
+        if not final and self.presentation_running and self.presentation_window:
+            self.measure_job = self.presentation_window.after(int(meter.interval * 1000), self.report_power)
+    
+    @property
+    def slide_index(self):
+        """Sorted filename index, rebuilt when the slide list changes"""
+        key = (self.playlist_generation, len(self.images))
+        if self._slide_index is None or self._slide_index_key != key:
+            from slide_index import SlideIndex
+            self._slide_index = SlideIndex(self.images)
+            self._slide_index_key = key
+        return self._slide_index
+    
     def setup_styles(self):
         """Setup modern styling for the application"""
         style = ttk.Style()
@@ -70,7 +311,7 @@ class QuickImagePresenter:
     
     def setup_ui(self):
         # Main frame with padding
-        main_frame = ttk.Frame(self.root, padding="20")
+        main_frame = self.main_frame = ttk.Frame(self.root, padding="20")
         main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Configure grid weights
@@ -95,6 +336,9 @@ class QuickImagePresenter:
         
         ttk.Entry(folder_input_frame, textvariable=self.folder_path, font=('Segoe UI', 11)).grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 10))
         ttk.Button(folder_input_frame, text="Browse", command=self.browse_folder, style='Secondary.TButton').grid(row=0, column=1)
+        ttk.Button(folder_input_frame, text="Playlist", command=self.browse_playlist, style='Secondary.TButton').grid(row=0, column=2, padx=(5, 0))
+        ttk.Button(folder_input_frame, text="Archive", command=self.browse_archive, style='Secondary.TButton').grid(row=0, column=3, padx=(5, 0))
+        ttk.Button(folder_input_frame, text="Overview", command=self.open_overview, style='Secondary.TButton').grid(row=0, column=4, padx=(5, 0))
         
         # Enhanced settings frame (right side)
         settings_frame = ttk.LabelFrame(main_frame, text="⚙️ Presentation Settings", padding="15", style='Settings.TLabelframe')
@@ -108,6 +352,66 @@ class QuickImagePresenter:
         
         # Removed transition type selection for stable timer
         
+        # Synchronized playback across several kiosks on the LAN
+        ttk.Label(settings_frame, text="Sync Mode:", style='Subtitle.TLabel').grid(row=1, column=0, sticky=tk.W, pady=8)
+        sync_combo = ttk.Combobox(settings_frame, textvariable=self.sync_mode, values=["Off", "Leader", "Follower"],
+                                  state='readonly', width=10, font=('Segoe UI', 11))
+        sync_combo.grid(row=1, column=1, sticky=tk.W, pady=8)
+        
+        # Local HTTP/WebSocket remote control
+        ttk.Checkbutton(settings_frame, text="Remote Control Server",
+                        variable=self.remote_enabled, command=self.toggle_remote_control).grid(
+                            row=2, column=0, columnspan=2, sticky=tk.W, pady=8)
+        
+        # Slow pan and zoom over each slide
+        ttk.Checkbutton(settings_frame, text="Ken Burns Pan & Zoom", variable=self.ken_burns).grid(
+            row=3, column=0, columnspan=2, sticky=tk.W, pady=8)
+        
+        # Perceptual duplicate detection when a folder is loaded
+        ttk.Label(settings_frame, text="Duplicates:", style='Subtitle.TLabel').grid(row=4, column=0, sticky=tk.W, pady=8)
+        duplicate_combo = ttk.Combobox(settings_frame, textvariable=self.duplicate_mode, values=["Off", "Flag", "Skip"],
+                                       state='readonly', width=10, font=('Segoe UI', 11))
+        duplicate_combo.grid(row=4, column=1, sticky=tk.W, pady=8)
+        duplicate_combo.bind('<<ComboboxSelected>>', lambda e: self.load_images())
+        
+        # Further monitors following the presentation, optionally offset or with another deck
+        ttk.Label(settings_frame, text="Extra Displays:", style='Subtitle.TLabel').grid(row=5, column=0, sticky=tk.W, pady=8)
+        displays_frame = ttk.Frame(settings_frame)
+        displays_frame.grid(row=5, column=1, sticky=tk.W, pady=8)
+        ttk.Spinbox(displays_frame, from_=0, to=3, textvariable=self.extra_display_count, width=4,
+                    font=('Segoe UI', 11)).grid(row=0, column=0)
+        ttk.Label(displays_frame, text="Offset:").grid(row=0, column=1, padx=(10, 5))
+        ttk.Spinbox(displays_frame, from_=-99, to=99, textvariable=self.extra_display_offset, width=8,
+                    font=('Segoe UI', 11)).grid(row=0, column=2)
+        
+        ttk.Label(settings_frame, text="Extra Display Deck:", style='Subtitle.TLabel').grid(row=6, column=0, sticky=tk.W, pady=8)
+        deck_frame = ttk.Frame(settings_frame)
+        deck_frame.grid(row=6, column=1, sticky=(tk.W, tk.E), pady=8)
+        deck_frame.columnconfigure(0, weight=1)
+        ttk.Entry(deck_frame, textvariable=self.extra_playlist, font=('Segoe UI', 11)).grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 5))
+        ttk.Button(deck_frame, text="Browse", command=self.browse_extra_playlist, style='Secondary.TButton').grid(row=0, column=1)
+        
+        # Fewer timer wake-ups, no countdown or animations and cheaper resampling for battery-backed kiosks
+        ttk.Checkbutton(settings_frame, text="Low-Power Mode", variable=self.low_power).grid(
+            row=7, column=0, columnspan=2, sticky=tk.W, pady=8)
+        
+        # Captions from sidecar .txt files or XMP/EXIF descriptions, drawn into the decoded frames
+        ttk.Checkbutton(settings_frame, text="Captions", variable=self.show_captions).grid(
+            row=8, column=0, columnspan=2, sticky=tk.W, pady=8)
+        
+        # Slide order: filenames, image header metadata, file stats or a repeatable shuffle
+        ttk.Label(settings_frame, text="Sort Order:", style='Subtitle.TLabel').grid(row=9, column=0, sticky=tk.W, pady=8)
+        sort_frame = ttk.Frame(settings_frame)
+        sort_frame.grid(row=9, column=1, sticky=tk.W, pady=8)
+        sort_combo = ttk.Combobox(sort_frame, textvariable=self.sort_mode,
+                                  values=["Name", "Capture Time", "Modified", "File Size", "Dimensions", "Shuffle"],
+                                  state='readonly', width=14, font=('Segoe UI', 11))
+        sort_combo.grid(row=0, column=0)
+        sort_combo.bind('<<ComboboxSelected>>', lambda e: self.apply_sort_order())
+        ttk.Label(sort_frame, text="Seed:").grid(row=0, column=1, padx=(10, 5))
+        ttk.Spinbox(sort_frame, from_=0, to=99999, textvariable=self.shuffle_seed, width=6, font=('Segoe UI', 11),
+                    command=self.change_shuffle_seed).grid(row=0, column=2)
+        
         # Image preview section
         preview_frame = ttk.LabelFrame(main_frame, text="🖼️ Image Preview", padding="15")
         preview_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 20))
@@ -146,200 +450,38 @@ class QuickImagePresenter:
         self.status_label = ttk.Label(main_frame, text="Ready to present images", style='Info.TLabel')
         self.status_label.grid(row=4, column=0, columnspan=2, pady=(10, 0))
         
+        # Files that failed validation or decoding; shown only when there are any
+        self.quarantine_frame = ttk.LabelFrame(main_frame, text="⚠ Quarantined Files (skipped)", padding="10")
+        self.quarantine_frame.columnconfigure(0, weight=1)
+        self.quarantine_list = tk.Listbox(self.quarantine_frame, height=4, font=('Segoe UI', 10), activestyle='none')
+        quarantine_scrollbar = ttk.Scrollbar(self.quarantine_frame, orient='vertical', command=self.quarantine_list.yview)
+        self.quarantine_list.configure(yscrollcommand=quarantine_scrollbar.set)
+        self.quarantine_list.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        quarantine_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        
         # Bind canvas resize
         self.preview_container.bind('<Configure>', lambda e: self.preview_canvas.configure(scrollregion=self.preview_canvas.bbox("all")))
     
+    @property
+    def sleep_inhibitor(self):
+        """Background sleep inhibitor, created on first use"""
+        if self._sleep_inhibitor is None:
+            from sleep_inhibitor import SleepInhibitor
+            self._sleep_inhibitor = SleepInhibitor()
+        return self._sleep_inhibitor
+    
     def prevent_sleep(self):
-        """Prevent system from going to sleep during presentation"""
-        try:
-            system = platform.system()
-            print(f"Preventing sleep on {system} system...")
-            
-            if system == "Windows":
-                # Windows: Use SetThreadExecutionState API via ctypes
-                try:
-                    import ctypes
-                    from ctypes import wintypes
-                    
-                    # Define the SetThreadExecutionState function
-                    kernel32 = ctypes.windll.kernel32
-                    SetThreadExecutionState = kernel32.SetThreadExecutionState
-                    SetThreadExecutionState.argtypes = [wintypes.DWORD]
-                    SetThreadExecutionState.restype = wintypes.DWORD
-                    
-                    # Constants for preventing sleep
-                    ES_CONTINUOUS = 0x80000000
-                    ES_SYSTEM_REQUIRED = 0x00000001
-                    ES_DISPLAY_REQUIRED = 0x00000002
-                    
-                    # Prevent system sleep and display dimming
-                    result = SetThreadExecutionState(ES_CONTINUOUS | ES_SYSTEM_REQUIRED | ES_DISPLAY_REQUIRED)
-                    if result:
-                        print("Windows sleep prevention activated successfully")
-                        self.windows_sleep_prevention_active = True
-                    else:
-                        print("Failed to activate Windows sleep prevention")
-                        
-                except Exception as e:
-                    print(f"Windows sleep prevention failed: {e}")
-                    # Fallback to powercfg
-                    try:
-                        subprocess.run(['powercfg', '/change', 'monitor-timeout-ac', '0'], 
-                                    capture_output=True, check=False)
-                        subprocess.run(['powercfg', '/change', 'monitor-timeout-dc', '0'], 
-                                    capture_output=True, check=False)
-                        subprocess.run(['powercfg', '/change', 'standby-timeout-ac', '0'], 
-                                    capture_output=True, check=False)
-                        subprocess.run(['powercfg', '/change', 'standby-timeout-dc', '0'], 
-                                    capture_output=True, check=False)
-                        print("Windows sleep prevention activated via powercfg")
-                    except Exception as e2:
-                        print(f"Powercfg fallback also failed: {e2}")
-                
-            elif system == "Darwin":  # macOS
-                # macOS: Use caffeinate to prevent sleep
-                try:
-                    result = subprocess.run(['caffeinate', '-i', '-d'], 
-                                        capture_output=True, text=True, check=False)
-                    if result.returncode == 0:
-                        print("macOS sleep prevention activated successfully")
-                        self.macos_caffeinate_process = True
-                    else:
-                        print(f"macOS sleep prevention failed: {result.stderr}")
-                except Exception as e:
-                    print(f"macOS sleep prevention failed: {e}")
-                
-            elif system == "Linux":
-                # Linux: Use xset to prevent screen saver and DPMS
-                try:
-                    result1 = subprocess.run(['xset', 's', 'off'], capture_output=True, text=True, check=False)
-                    result2 = subprocess.run(['xset', 's', 'noblank'], capture_output=True, text=True, check=False)
-                    result3 = subprocess.run(['xset', '-dpms'], capture_output=True, text=True, check=False)
-                    
-                    if result1.returncode == 0 and result2.returncode == 0 and result3.returncode == 0:
-                        print("Linux sleep prevention activated successfully")
-                        self.linux_sleep_prevention_active = True
-                    else:
-                        print(f"Linux sleep prevention failed: {result1.stderr}, {result2.stderr}, {result3.stderr}")
-                        
-                except FileNotFoundError:
-                    print("xset not found, trying alternative methods...")
-                    # Try alternative methods for Linux
-                    try:
-                        subprocess.run(['gsettings', 'set', 'org.gnome.desktop.session', 'idle-delay', 'uint32', '0'], 
-                                    capture_output=True, check=False)
-                        print("Linux sleep prevention activated via gsettings")
-                    except:
-                        print("Linux sleep prevention methods not available")
-                    
-        except Exception as e:
-            print(f"Could not prevent sleep: {e}")
+        """Prevent system from going to sleep during presentation (without blocking the UI)"""
+        self.sleep_inhibitor.inhibit()
     
     def restore_sleep_settings(self):
-        """Restore normal sleep settings after presentation"""
-        try:
-            system = platform.system()
-            print(f"Restoring sleep settings on {system} system...")
-            
-            if system == "Windows":
-                # Windows: Restore using SetThreadExecutionState
-                try:
-                    import ctypes
-                    from ctypes import wintypes
-                    
-                    # Define the SetThreadExecutionState function
-                    kernel32 = ctypes.windll.kernel32
-                    SetThreadExecutionState = kernel32.SetThreadExecutionState
-                    SetThreadExecutionState.argtypes = [wintypes.DWORD]
-                    SetThreadExecutionState.restype = wintypes.DWORD
-                    
-                    # Constants for normal operation
-                    ES_CONTINUOUS = 0x80000000
-                    
-                    # Restore normal sleep behavior
-                    result = SetThreadExecutionState(ES_CONTINUOUS)
-                    if result:
-                        print("Windows sleep settings restored successfully")
-                        self.windows_sleep_prevention_active = False
-                    else:
-                        print("Failed to restore Windows sleep settings")
-                        
-                except Exception as e:
-                    print(f"Windows sleep restoration failed: {e}")
-                    # Fallback to powercfg
-                    try:
-                        subprocess.run(['powercfg', '/change', 'monitor-timeout-ac', '10'], 
-                                    capture_output=True, check=False)
-                        subprocess.run(['powercfg', '/change', 'monitor-timeout-dc', '5'], 
-                                    capture_output=True, check=False)
-                        subprocess.run(['powercfg', '/change', 'standby-timeout-ac', '30'], 
-                                    capture_output=True, check=False)
-                        subprocess.run(['powercfg', '/change', 'standby-timeout-dc', '15'], 
-                                    capture_output=True, check=False)
-                        print("Windows sleep settings restored via powercfg")
-                    except Exception as e2:
-                        print(f"Powercfg fallback also failed: {e2}")
-                
-            elif system == "Darwin":  # macOS
-                # macOS: Kill caffeinate process
-                try:
-                    result = subprocess.run(['pkill', 'caffeinate'], 
-                                        capture_output=True, text=True, check=False)
-                    if result.returncode == 0:
-                        print("macOS sleep settings restored successfully")
-                        self.macos_caffeinate_process = False
-                    else:
-                        print(f"macOS sleep restoration failed: {result.stderr}")
-                except Exception as e:
-                    print(f"macOS sleep restoration failed: {e}")
-                
-            elif system == "Linux":
-                # Linux: Restore screen saver and DPMS
-                try:
-                    result1 = subprocess.run(['xset', 's', 'on'], capture_output=True, text=True, check=False)
-                    result2 = subprocess.run(['xset', 's', 'blank'], capture_output=True, text=True, check=False)
-                    result3 = subprocess.run(['xset', '+dpms'], capture_output=True, text=True, check=False)
-                    
-                    if result1.returncode == 0 and result2.returncode == 0 and result3.returncode == 0:
-                        print("Linux sleep settings restored successfully")
-                        self.linux_sleep_prevention_active = False
-                    else:
-                        print(f"Linux sleep restoration failed: {result1.stderr}, {result2.stderr}, {result3.stderr}")
-                        
-                except FileNotFoundError:
-                    print("xset not found, trying alternative methods...")
-                    # Try alternative methods for Linux
-                    try:
-                        subprocess.run(['gsettings', 'set', 'org.gnome.desktop.session', 'idle-delay', 'uint32', '600'], 
-                                    capture_output=True, check=False)
-                        print("Linux sleep settings restored via gsettings")
-                    except:
-                        print("Linux sleep restoration methods not available")
-                    
-        except Exception as e:
-            print(f"Could not restore sleep settings: {e}")
+        """Restore normal sleep settings after presentation (without blocking the UI)"""
+        self.sleep_inhibitor.release()
     
     def fix_image_orientation(self, image):
         """Fix image orientation based on EXIF data"""
-        try:
-            # Check if image has EXIF data
-            if hasattr(image, '_getexif') and image._getexif() is not None:
-                exif = image._getexif()
-                if exif is not None:
-                    # Get orientation tag
-                    orientation = exif.get(274)  # 274 is the orientation tag
-                    if orientation is not None:
-                        # Apply the correct rotation
-                        if orientation == 3:
-                            image = image.rotate(180, expand=True)
-                        elif orientation == 6:
-                            image = image.rotate(270, expand=True)
-                        elif orientation == 8:
-                            image = image.rotate(90, expand=True)
-        except Exception as e:
-            print(f"Error fixing image orientation: {e}")
-        
-        return image
+        from image_pipeline import fix_image_orientation
+        return fix_image_orientation(image)
     
     def browse_folder(self):
         folder = filedialog.askdirectory(title="Select Image Folder")
@@ -347,54 +489,393 @@ class QuickImagePresenter:
             self.folder_path.set(folder)
             self.load_images()
     
+    def browse_playlist(self):
+        manifest = filedialog.askopenfilename(title="Select Playlist Manifest",
+                                              filetypes=[("Playlist manifest", "*.json *.csv"),
+                                                         ("All files", "*.*")])
+        if manifest:
+            self.folder_path.set(manifest)
+            self.load_images()
+    
+    def browse_extra_playlist(self):
+        """Pick a folder for the extra displays (a manifest path can be typed in instead)"""
+        folder = filedialog.askdirectory(title="Select Folder for Extra Displays")
+        if folder:
+            self.extra_playlist.set(folder)
+    
+    def read_folder(self, folder):
+        """(entries, filename rules, skipped count) for the images in a folder or archive"""
+        # Supported image formats
+        image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.webp'}
+        
+        if os.path.isfile(folder) and folder.lower().endswith('.qdeck'):
+            # Compiled deck: order, durations and transitions were fixed when compiling
+            from compiled_deck import deck_entries
+            rules = FilenameRules.for_folder(os.path.dirname(os.path.abspath(folder)))
+            entries, skipped = rules.apply(deck_entries(folder), sort=False)
+            return entries, rules, skipped
+        elif os.path.isfile(folder):
+            # ZIP/TAR deck: members are listed once and read into memory on demand
+            from archives import archive_entries, split_member_path
+            rules = FilenameRules.for_folder(os.path.dirname(os.path.abspath(folder)))
+            # Sorted by the whole member path, so chapter folders stay together
+            entries, skipped = rules.apply(archive_entries(folder, image_extensions),
+                                           sort_name=lambda entry: split_member_path(entry.path)[1])
+            return entries, rules, skipped
+        else:
+            entries = []
+            for filename in os.listdir(folder):
+                if os.path.splitext(filename)[1].lower() in image_extensions:
+                    filepath = os.path.join(folder, filename)
+                    entries.append(PlaylistEntry(filename, filepath))
+        
+        # Order, durations and skip markers come from the folder's filename rules
+        rules = FilenameRules.for_folder(folder)
+        entries, skipped = rules.apply(entries)
+        return entries, rules, skipped
+    
+    def browse_archive(self):
+        archive = filedialog.askopenfilename(title="Select Image Archive or Compiled Deck",
+                                             filetypes=[("Image archives", "*.zip *.cbz *.tar *.tar.gz *.tgz *.tar.bz2 *.tar.xz *.cbt"),
+                                                        ("Compiled decks", "*.qdeck"),
+                                                        ("All files", "*.*")])
+        if archive:
+            self.folder_path.set(archive)
+            self.load_images()
+    
     def load_images(self):
         folder = self.folder_path.get()
         if not folder or not os.path.exists(folder):
             return
         
-        # Supported image formats
-        image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.webp'}
+        # Cancel any playlist that is still being parsed
+        self.playlist_generation += 1
+        self.playlist_loading = False
         
-        self.images = []
-        for filename in os.listdir(folder):
-            if any(filename.lower().endswith(ext) for ext in image_extensions):
-                filepath = os.path.join(folder, filename)
-                self.images.append((filename, filepath))
-        
-        # Sort images using natural sort (handles numbers properly)
-        def natural_sort_key(filename):
-            # Split filename into parts: numbers and non-numbers
-            import re
-            parts = re.split(r'(\d+)', filename.lower())
-            # Convert number parts to integers for proper numerical sorting
-            return [int(part) if part.isdigit() else part for part in parts]
-        
-        self.images.sort(key=lambda x: natural_sort_key(x[0]))
-        
-        self.status_label.config(text=f"Loaded {len(self.images)} images")
+        # The overview shows the old slide list; indices would no longer match
+        if self.overview and self.overview.is_open:
+            self.overview.close()
+        
+        if is_manifest(folder):
+            self.load_playlist(folder)
+            return
+        
+        self.quarantine = {}
+        self.update_quarantine_view()
+        if 'archives' in sys.modules:
+            sys.modules['archives'].close_archives()  # Release the previous deck's archive
+        if 'compiled_deck' in sys.modules:
+            sys.modules['compiled_deck'].close_decks()
+        try:
+            self.images, self.filename_rules, skipped = self.read_folder(folder)
+        except OSError as e:
+            # Unreadable folder, or a file that is not a valid ZIP/TAR archive or deck
+            self.images = []
+            self.update_preview()
+            self.status_label.config(text=f"Could not read {folder}: {e}")
+            return
+        for position, entry in enumerate(self.images):
+            entry.order = position
+        
+        status = f"Loaded {len(self.images)} images"
+        if skipped:
+            status += f" ({skipped} skipped)"
+        self.status_label.config(text=status)
         self.update_preview()
+        self.publish_status()
+        if self.sort_mode.get() != "Name":
+            self.apply_sort_order()
+        
+        if self.images:
+            self.start_validation()
+        if self.duplicate_mode.get() != "Off" and self.images:
+            self.start_duplicate_scan()
+    
+    def start_validation(self):
+        """Check every loaded file in the background and quarantine the ones that are broken"""
+        generation = self.playlist_generation
+        paths = [entry.path for entry in self.images]
+        
+        def check():
+            from validation import validate_files
+            from metadata_cache import shared_cache
+            
+            cache = shared_cache()
+            bad = validate_files(paths, cache, cancelled=lambda: generation != self.playlist_generation)
+            cache.save()
+            if generation == self.playlist_generation and bad:
+                self.root.after(0, self.apply_validation, generation, bad)
+        
+        import threading
+        threading.Thread(target=check, daemon=True).start()
+    
+    def apply_validation(self, generation, bad):
+        """Quarantine the files the validation pass rejected (Tk thread)"""
+        if generation != self.playlist_generation:
+            return
+        print(f"Quarantined {len(bad)} file(s) that failed validation")  # Reasons are listed in the window
+        self.quarantine.update(bad)
+        self.update_quarantine_view()
+        self.status_label.config(text=f"Loaded {len(self.images)} images ({len(self.quarantine)} quarantined)")
+        self.publish_status()
+    
+    def quarantine_entry(self, entry, reason):
+        """Quarantine a slide that failed to decode during playback"""
+        self.quarantine[entry.path] = reason
+        self.update_quarantine_view()
+    
+    def decode_failed(self, path, reason):
+        """Quarantine a slide whose background decode failed, and skip it if it is still waiting for that decode"""
+        if path in self.quarantine:
+            return
+        entry = next((entry for entry in self.images if entry.path == path), None)
+        if entry is None:
+            return  # Slide of a deck that has since been replaced
+        self.quarantine_entry(entry, reason)  # The prefetcher has printed the error
+        self.publish_status()
+        index = self.current_image_index
+        if (self.presentation_running and not self.sync_node and self.low_res_index == index
+                and 0 <= index < len(self.images) and self.images[index] is entry):
+            # Advance the way show_next_image does when display_slide raises
+            self.current_image_index += 1
+            self.show_next_image()
+    
+    def update_quarantine_view(self):
+        """List the quarantined files below the status line, or hide the list if there are none"""
+        self.quarantine_list.delete(0, 'end')
+        if not self.quarantine:
+            self.quarantine_frame.grid_remove()
+            return
+        names = {entry.path: entry.filename for entry in self.images}
+        self.quarantine_list.insert('end', *(f"{names.get(path, os.path.basename(path))}: {reason}"
+                                             for path, reason in self.quarantine.items()))
+        self.quarantine_frame.grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(10, 0))
+    
+    def playable_index(self, index, step=1):
+        """First slide from index on (step -1: backwards) that is not quarantined, or None"""
+        while 0 <= index < len(self.images):
+            if self.images[index].path not in self.quarantine:
+                return index
+            index += step
+        return None
+    
+    def apply_sort_order(self):
+        """Reorder the slides by the chosen sort order, reading file metadata first if needed"""
+        if not self.images or self.playlist_loading:
+            return  # Playlists are sorted once they have finished loading
+        if self.sync_node:
+            self.status_label.config(text="The slide order cannot change during synchronized playback")
+            return
+        from sort_orders import HEADER_MODES, SORT_NAME, SORT_SHUFFLE, sort_entries
+        mode = self.sort_mode.get()
+        if mode not in (SORT_NAME, SORT_SHUFFLE):
+            headers = mode in HEADER_MODES
+            # Records gathered with headers also serve the stat-only orders
+            if self.sort_records_key not in ((self.playlist_generation, True), (self.playlist_generation, headers)):
+                self.start_metadata_scan(headers)
+                return
+        try:
+            seed = int(self.shuffle_seed.get())
+        except (tk.TclError, ValueError):
+            seed = 0
+        self.reorder_slides(sort_entries(self.images, mode, self.sort_records, seed))
+        self.status_label.config(text=f"Loaded {len(self.images)} images, sorted by {mode.lower()}")
+    
+    def change_shuffle_seed(self):
+        if self.sort_mode.get() == "Shuffle":
+            self.apply_sort_order()
+    
+    def start_metadata_scan(self, headers):
+        """Read file stats (and image headers) for the loaded slides in the background, then sort"""
+        generation = self.playlist_generation
+        paths = [entry.path for entry in self.images]
+        
+        def scan():
+            from sort_orders import collect_metadata
+            from metadata_cache import shared_cache
+            
+            cache = shared_cache()
+            records = collect_metadata(
+                paths, cache, headers,
+                progress=lambda done, total: self.root.after(0, self.show_metadata_progress, generation, done, total),
+                cancelled=lambda: generation != self.playlist_generation)
+            cache.save()
+            if generation == self.playlist_generation:
+                self.root.after(0, self.apply_sort_records, generation, records, headers)
+        
+        import threading
+        threading.Thread(target=scan, daemon=True).start()
+    
+    def show_metadata_progress(self, generation, done, total):
+        if generation == self.playlist_generation and total:
+            self.status_label.config(text=f"Loaded {len(self.images)} images - reading image headers ({done}/{total})")
+    
+    def apply_sort_records(self, generation, records, headers):
+        """Keep the scanned metadata for this slide list, so later sort changes need no scan (Tk thread)"""
+        if generation != self.playlist_generation:
+            return
+        self.sort_records = records
+        self.sort_records_key = (generation, headers)
+        self.apply_sort_order()
+    
+    def reorder_slides(self, entries):
+        """Replace the slide list with the same slides in a new order, staying on the current slide"""
+        current = None
+        if self.presentation_running and 0 <= self.current_image_index < len(self.images):
+            current = self.images[self.current_image_index]
+        self.images = entries
+        if current is not None:
+            self.current_image_index = self.images.index(current)
+        self._slide_index = None  # Search results point at positions
+        if self.overview and self.overview.is_open:
+            self.overview.close()
+        if self.presenter_view:
+            self.presenter_view.set_entries(self.images)
+        self.update_preview()
+        self.publish_status()
+        if self.presentation_running and current is not None:
+            self.schedule_decodes(self.current_image_index)
+    
+    def start_duplicate_scan(self):
+        """Hash the loaded images in the background, then flag or skip near-duplicates"""
+        generation = self.playlist_generation
+        entries = list(self.images)
+        mode = self.duplicate_mode.get()
+        
+        def scan():
+            from duplicates import compute_hashes, find_duplicates
+            from metadata_cache import shared_cache
+            
+            cache = shared_cache()
+            hashes = compute_hashes(
+                [entry.path for entry in entries], cache,
+                progress=lambda done, total: self.root.after(0, self.show_duplicate_progress, generation, done, total),
+                cancelled=lambda: generation != self.playlist_generation)
+            cache.save()
+            if generation == self.playlist_generation:
+                self.root.after(0, self.apply_duplicates, generation, mode, find_duplicates(entries, hashes))
+        
+        import threading
+        threading.Thread(target=scan, daemon=True).start()
+    
+    def show_duplicate_progress(self, generation, done, total):
+        if generation == self.playlist_generation and total:
+            self.status_label.config(text=f"Loaded {len(self.images)} images - checking for duplicates ({done}/{total})")
+    
+    def apply_duplicates(self, generation, mode, duplicates):
+        """Mark duplicates and, in Skip mode, drop them from the slide list (Tk thread)"""
+        if generation != self.playlist_generation:
+            return
+        for duplicate, original in duplicates:
+            duplicate.duplicate_of = original.filename  # Shown next to the slide counter
+        
+        # Synchronized playback needs every screen to keep the same slide list
+        if mode == "Skip" and duplicates and not self.sync_node:
+            skipped = {id(duplicate) for duplicate, _ in duplicates}
+            current = None
+            if self.presentation_running and 0 <= self.current_image_index < len(self.images):
+                current = self.images[self.current_image_index]
+            self.images = [entry for entry in self.images if id(entry) not in skipped]
+            if current is not None and id(current) not in skipped:
+                self.current_image_index = self.images.index(current)
+            else:
+                self.current_image_index = min(self.current_image_index, max(0, len(self.images) - 1))
+            self.update_preview()
+            summary = f"{len(duplicates)} duplicates skipped"
+        else:
+            summary = f"{len(duplicates)} duplicates flagged"
+        self.status_label.config(text=f"Loaded {len(self.images)} images ({summary if duplicates else 'no duplicates'})")
+        self.publish_status()
+    
+    def load_playlist(self, manifest_path):
+        """Load a playlist manifest in the background, feeding self.images in batches"""
+        self.images = []
+        self.playlist_loading = True
+        self.filename_rules = FilenameRules.for_folder(os.path.dirname(os.path.abspath(manifest_path)))
+        generation = self.playlist_generation
+        self.status_label.config(text="Loading playlist...")
+        
+        def parse():
+            batch = []
+            batch_size = 1  # Hand over the very first entry at once so playback can start
+            error = None
+            try:
+                for entry in iter_manifest(manifest_path):
+                    if generation != self.playlist_generation:
+                        return  # Superseded by another load
+                    batch.append(entry)
+                    if len(batch) >= batch_size:
+                        self.root.after(0, self.add_playlist_entries, generation, batch, False)
+                        batch = []
+                        batch_size = PLAYLIST_BATCH_SIZE
+            except (OSError, ManifestError) as e:
+                error = e
+            self.root.after(0, self.add_playlist_entries, generation, batch, True, error)
+        
+        import threading
+        threading.Thread(target=parse, daemon=True).start()
+    
+    def add_playlist_entries(self, generation, entries, finished, error=None):
+        """Append parsed playlist entries (runs on the Tk thread)"""
+        if generation != self.playlist_generation:
+            return  # A newer folder or playlist was selected meanwhile
+        
+        had_preview = len(self.images) >= 8
+        # Manifest order is kept; rules only fill in missing durations and skips
+        entries, _ = self.filename_rules.apply(entries, sort=False)
+        for position, entry in enumerate(entries, len(self.images)):
+            entry.order = position
+        self.images.extend(entries)
+        
+        if finished:
+            self.playlist_loading = False
+            if error:
+                print(f"Error reading playlist: {error}")
+                self.status_label.config(text=f"Playlist error after {len(self.images)} entries: {error}")
+            else:
+                self.status_label.config(text=f"Loaded {len(self.images)} images from playlist")
+                self.start_validation()
+                if self.sort_mode.get() != "Name":
+                    self.apply_sort_order()
+        else:
+            self.status_label.config(text=f"Loading playlist... {len(self.images)} entries")
+        
+        if not had_preview and entries:
+            self.update_preview()
+        if finished:
+            self.publish_status()
     
     def update_preview(self):
         """Update the image preview section"""
+        from PIL import Image, ImageTk
+        from image_pipeline import open_image, prepare_for_resize, to_display_rgb
+        
         # Clear existing previews
         for widget in self.preview_container.winfo_children():
             widget.destroy()
         
         self.preview_images = []
+        self.preview_frames = []
+        self.previews_trimmed = False
         
         # Show up to 8 preview images
         preview_count = min(len(self.images), 8)
         
         for i in range(preview_count):
             if i < len(self.images):
-                filename, filepath = self.images[i]
+                entry = self.images[i]
+                filename, filepath = entry.filename, entry.path
                 
                 try:
                     # Load and resize image for preview
-                    image = Image.open(filepath)
+                    image = open_image(filepath)
+                    icc_profile = image.info.get('icc_profile')
                     # Fix orientation before resizing
                     image = self.fix_image_orientation(image)
+                    image = prepare_for_resize(image)
                     image.thumbnail((120, 120), Image.Resampling.LANCZOS)
+                    image = self.prefetcher.color_manager.convert(image, icc_profile)
+                    image = to_display_rgb(image, PREVIEW_BACKGROUND)
                     photo = ImageTk.PhotoImage(image)
                     
                     # Create preview frame
@@ -412,6 +893,7 @@ class QuickImagePresenter:
                     name_label.pack(pady=2)
                     
                     self.preview_images.append(photo)
+                    self.preview_frames.append(preview_frame)
                     
                 except Exception as e:
                     print(f"Error loading preview for {filepath}: {e}")
@@ -422,23 +904,24 @@ class QuickImagePresenter:
     
     def extract_time_from_filename(self, filename):
         """Extract time from filename like '1a-11' -> 11 seconds"""
-        # Remove file extension
-        name_without_ext = os.path.splitext(filename)[0]
-        
-        # Look for pattern like '-11' at the end
-        match = re.search(r'-(\d+)$', name_without_ext)
-        if match:
-            return int(match.group(1))
-        
-        return None
+        return self.filename_rules.duration_for(filename)
     
-    def start_presentation(self):
+    def start_presentation(self, start_index=0):
         if not self.images:
             messagebox.showwarning("No Images", "Please select a folder with images first.")
             return
         
+        if self.sync_mode.get() != "Off":
+            if self.playlist_loading:
+                messagebox.showwarning("Playlist Loading", "Synchronized playback needs the whole playlist. "
+                                                           "Please wait until it has finished loading.")
+                return
+            if not self.start_sync_node():
+                return
+        
         self.presentation_running = True
-        self.current_image_index = 0
+        self.current_image_index = start_index
+        self.apply_power_profile()
         
         # Create fullscreen presentation window
         self.presentation_window = tk.Toplevel(self.root)
@@ -525,12 +1008,140 @@ class QuickImagePresenter:
         self.prevent_sleep()
         self.sleep_prevention_active = True
         
+        self.memory_job = self.presentation_window.after(self.power_profile.memory_check_ms, self.check_memory)
+        if self.wakeup_meter is not None:
+            self.wakeup_meter.report()  # Start counting from here
+            self.measure_job = self.presentation_window.after(int(self.wakeup_meter.interval * 1000),
+                                                              self.report_power)
+        self.open_extra_displays()
+        self.open_presenter_view()
+        self.presentation_window.focus_force()
+        
         # Start presentation
-        self.show_next_image()
+        if self.sync_node:
+            self.sync_tick()
+        else:
+            self.show_next_image()
+    
+    def open_extra_displays(self):
+        """Open the configured extra displays; they share the main decode pool and frame cache"""
+        from displays import (ExtraDisplay, MAX_EXTRA_DISPLAYS, display_decks, display_offsets, extra_geometries,
+                              frame_size, list_monitors)
+        try:
+            count = min(max(0, int(self.extra_display_count.get())), MAX_EXTRA_DISPLAYS)
+            offsets = display_offsets(self.extra_display_offset.get(), count)
+        except (tk.TclError, ValueError):
+            count = 0
+        if not count or not self.images:
+            return
+        from image_pipeline import DEFAULT_CACHE_SIZE
+        
+        decks = display_decks(self.extra_playlist.get(), count)
+        screen = (self.presentation_window.winfo_screenwidth(), self.presentation_window.winfo_screenheight())
+        image_size = self.get_display_size()
+        pending = {}
+        for number, geometry in enumerate(extra_geometries(list_monitors(self.root), count)):
+            # Displays with a deck of their own stay black until it has been read
+            deck = decks[number]
+            entries = pending.setdefault(deck, ([], []))[0] if deck else self.images
+            display = ExtraDisplay(self.presentation_window, geometry, entries, offsets[number], self.prefetcher,
+                                   size=frame_size(geometry, screen, image_size), on_close=self.stop_presentation)
+            self.extra_displays.append(display)
+            if deck:
+                pending[deck][1].append(display)
+        # Room in the shared cache for every screen's current and next frames
+        self.prefetcher.cache.max_items = DEFAULT_CACHE_SIZE * (1 + len(self.extra_displays))
+        print(f"Opened {len(self.extra_displays)} extra display(s), offsets {offsets}")
+        for deck, (entries, displays) in pending.items():
+            self.load_extra_deck(deck, entries, displays)
+    
+    def load_extra_deck(self, deck, entries, displays):
+        """Read a deck for extra displays on a background thread; manifests arrive in batches"""
+        def add(batch, error=None):
+            self.root.after(0, self.add_extra_entries, deck, entries, displays, batch, error)
+        
+        def load():
+            try:
+                if is_manifest(deck):
+                    batch = []
+                    for entry in iter_manifest(deck):
+                        batch.append(entry)
+                        if len(batch) >= PLAYLIST_BATCH_SIZE:
+                            add(batch)
+                            batch = []
+                    add(batch)
+                else:
+                    add(self.read_folder(deck)[0])
+            except (OSError, ManifestError) as e:
+                add([], e)
+        
+        import threading
+        threading.Thread(target=load, daemon=True).start()
+    
+    def add_extra_entries(self, deck, entries, displays, batch, error):
+        """Append a batch of an extra deck (Tk thread) and show the matching slides"""
+        displays = [display for display in displays if display in self.extra_displays]
+        if not displays:
+            return  # The presentation has ended
+        if error is not None:
+            if entries:
+                print(f"Stopped reading {deck}: {error}")
+                return
+            messagebox.showwarning("Extra Displays", f"Could not load {deck}: {error}\nShowing the main deck instead.")
+            batch = self.images
+        entries.extend(batch)
+        if self.presentation_running and 0 <= self.current_image_index < len(self.images):
+            for display in displays:
+                display.show(self.current_image_index)
+    
+    def open_presenter_view(self):
+        """Swap the control window's settings for the presenter view"""
+        from presenter_view import PresenterView
+        self.presenter_view = PresenterView(self.root, self.images, self.jump_to)
+        self.main_frame.grid_remove()
+        self.presenter_view.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+    
+    def close_presenter_view(self):
+        if self.presenter_view:
+            self.presenter_view.destroy()
+            self.presenter_view = None
+            self.main_frame.grid()
+    
+    def refresh_presenter_view(self, index):
+        """Show slide `index` and the next one in the presenter view, from frames already in memory"""
+        if self.presenter_view.entries is not self.images:
+            self.presenter_view.set_entries(self.images)
+        next_index = (index + 1) % len(self.images) if self.sync_node else index + 1
+        next_entry = self.images[next_index] if next_index < len(self.images) else None
+        self.presenter_view.show(index, self.current_frame, next_entry, self.peek_frame(next_entry))
+    
+    def peek_frame(self, entry):
+        """Decoded frame of entry at full or low resolution if one is cached; never decodes"""
+        if entry is None:
+            return None
+        size = self.get_display_size()
+        frame = self.prefetcher.cache.peek((entry.path, self.get_decode_size(size)))
+        if frame is None and self._low_res_prefetcher:
+            frame = self._low_res_prefetcher.cache.peek((entry.path, self.get_low_res_size(size)))
+        return frame
+    
+    def close_extra_displays(self):
+        for display in self.extra_displays:
+            display.close()
+        if self.extra_displays and self._prefetcher:
+            from image_pipeline import DEFAULT_CACHE_SIZE
+            self._prefetcher.cache.max_items = DEFAULT_CACHE_SIZE
+        self.extra_displays = []
     
     def handle_key_press(self, event):
         """Handle key presses during presentation"""
-        if event.keysym == 'Escape':
+        if self.search_entry is not None and event.widget is self.search_entry:
+            return  # Typing in the search bar
+        if event.char.isdigit():
+            self.open_search(event.char)
+        elif event.keysym in ('slash', 'g'):
+            self.open_search()
+        elif event.keysym == 'Escape':
             self.stop_presentation()
         elif event.keysym == 'Left':
             self.previous_image()
@@ -538,31 +1149,244 @@ class QuickImagePresenter:
             self.next_image()
         elif event.keysym == 'space':
             self.toggle_pause()
+        elif event.keysym == 'o':
+            self.open_overview()
     
     def previous_image(self):
         """Go to previous image"""
-        if self.current_image_index > 0:
-            # Go to previous image (timer will be stopped in show_next_image)
-            self.current_image_index -= 1
-            self.show_next_image()
+        if self.sync_node:
+            return  # Synchronized slides follow the shared clock
+        index = self.playable_index(self.current_image_index - 1, -1)
+        if index is not None:
+            self.navigate_to(index)
     
     def next_image(self):
         """Go to next image"""
-        if self.current_image_index < len(self.images) - 1:
-            # Go to next image (timer will be stopped in show_next_image)
-            self.current_image_index += 1
+        if self.sync_node:
+            return  # Synchronized slides follow the shared clock
+        index = self.playable_index(self.current_image_index + 1)
+        if index is not None:
+            self.navigate_to(index)
+    
+    def navigate_to(self, index):
+        """Step to slide `index`; a burst of steps (key repeat) only paints the slide it lands on"""
+        self.current_image_index = index
+        if self.navigation_job is None:
+            # A single step is shown at once (timer will be stopped in show_next_image)
             self.show_next_image()
+        else:
+            # Still navigating: move the target, decode it first and paint once the keys stop
+            self.presentation_window.after_cancel(self.navigation_job)
+            self.cancel_timer()
+            self.counter_label.config(text=f"Image {index + 1} of {len(self.images)}")
+            self.schedule_decodes(index)
+        self.navigation_job = self.presentation_window.after(NAVIGATION_SETTLE_MS, self.finish_navigation)
+    
+    def finish_navigation(self):
+        self.navigation_job = None
+        if not self.presentation_running:
+            return
+        if self.displayed_index != self.current_image_index or self.low_res_index == self.current_image_index:
+            # A slide still waiting for its full frame is requested again: the burst may have cancelled its decode
+            self.show_next_image(jump=True)
+        else:
+            # The burst came back to the slide on screen: nothing to paint, but its timer was cancelled
+            self.start_timer(self.current_display_time)
+    
+    def jump_to(self, index):
+        """Jump straight to slide `index`"""
+        if self.sync_node or not self.presentation_running or not self.images:
+            return
+        self.current_image_index = max(0, min(index, len(self.images) - 1))
+        self.show_next_image(jump=True)
+        self.schedule_decodes(self.current_image_index, JUMP_WARM_RADIUS, LOW_RES_WARM_RADIUS)
+    
+    def schedule_decodes(self, index, radius=1, low_res_radius=0):
+        """Rank background decodes around `index` and cancel queued ones that are no longer needed"""
+        size = self.get_display_size()
+        # Memory pressure shrinks how far ahead slides are decoded
+        radius = self.memory_budget.prefetch_radius(radius)
+        low_res_radius = self.memory_budget.prefetch_radius(low_res_radius)
+        self.expand_pages(index, max(radius, low_res_radius, 1))
+        targets = self.decode_targets(index, radius, self.get_decode_size(size))
+        for display in self.extra_displays:
+            # Extra displays queue on the same workers; a shared frame keeps its most urgent rank
+            for key, priority in display.decode_targets(index).items():
+                targets[key] = min(priority, targets.get(key, priority))
+        self.prefetcher.retarget(targets)
+        if low_res_radius:
+            self.low_res_prefetcher.retarget(self.decode_targets(index, low_res_radius, self.get_low_res_size(size)))
+    
+    def expand_pages(self, index, ahead):
+        """Split multi-page files among slides index..index+ahead into one slide per page
+
+        Only the files' page directories are read; pages are decoded when they
+        reach the prefetch window. Slides before `index` are left alone, so the
+        current slide number never shifts.
+        """
+        if self.sync_node:
+            return  # Every synchronized screen has to keep the same slide list
+        from pages import expand_entry, may_have_pages
+        
+        added = 0
+        for position in range(min(index + ahead, len(self.images) - 1), index - 1, -1):
+            entry = self.images[position]
+            if entry.page is not None or not may_have_pages(entry.path):
+                continue
+            try:
+                pages = expand_entry(entry)
+            except (OSError, ValueError) as e:
+                print(f"Could not read pages of {entry.path}: {e}")
+                continue
+            if pages:
+                self.images[position:position + 1] = pages
+                added += len(pages) - 1
+        if added:
+            if self.presenter_view:
+                self.presenter_view.set_entries(self.images)
+            if self.overview and self.overview.is_open:
+                self.overview.set_entries(self.images)
+    
+    def decode_targets(self, index, radius, size):
+        """{(path, size): priority}: current, then next, previous, and further slides by distance"""
+        from image_pipeline import PRIORITY_CURRENT, PRIORITY_NEXT, PRIORITY_PREVIOUS, PRIORITY_FURTHER
+        
+        count = len(self.images)
+        targets = {}
+        
+        def add(neighbour, priority):
+            if self.sync_node:
+                neighbour %= count  # Synchronized decks loop
+            if 0 <= neighbour < count and self.images[neighbour].path not in self.quarantine:
+                targets.setdefault((self.images[neighbour].path, size), priority)
+        
+        add(index, PRIORITY_CURRENT)
+        if radius >= 1:
+            add(index + 1, PRIORITY_NEXT)
+            add(index - 1, PRIORITY_PREVIOUS)
+        for offset in range(2, radius + 1):
+            add(index + offset, PRIORITY_FURTHER + offset - 2)
+            add(index - offset, PRIORITY_FURTHER + offset - 2)
+        return targets
+    
+    def open_overview(self):
+        """Show every slide in a contact-sheet window"""
+        if not self.images:
+            messagebox.showwarning("No Images", "Please select a folder with images first.")
+            return
+        if self.overview and self.overview.is_open:
+            self.overview.lift()
+            return
+        from contact_sheet import ContactSheetView
+        self.overview = ContactSheetView(self.root, self.images, self.select_from_overview,
+                                         color_manager=self.prefetcher.color_manager,
+                                         current_index=self.current_image_index if self.presentation_running else None)
+    
+    def open_search(self, text=""):
+        """Show the go-to bar: a slide number or the start of a filename"""
+        if self.sync_node:
+            return  # Synchronized slides follow the shared clock
+        if self.search_frame is None:
+            self.search_frame = tk.Frame(self.presentation_window, bg='#222', padx=15, pady=10)
+            tk.Label(self.search_frame, text="Go to:", bg='#222', fg='white',
+                     font=('Segoe UI', 16)).pack(side='left')
+            self.search_var = tk.StringVar()
+            self.search_entry = tk.Entry(self.search_frame, textvariable=self.search_var, width=30,
+                                         bg='#333', fg='white', insertbackground='white', relief='flat',
+                                         font=('Segoe UI', 16))
+            self.search_entry.pack(side='left', padx=10)
+            self.search_result = tk.Label(self.search_frame, text="", bg='#222', fg='#aaa',
+                                          font=('Segoe UI', 14), width=45, anchor='w')
+            self.search_result.pack(side='left')
+            self.search_entry.bind('<Return>', lambda e: self.confirm_search())
+            self.search_entry.bind('<Escape>', lambda e: self.close_search())
+            self.search_entry.bind('<Tab>', lambda e: self.cycle_search(1))
+            self.search_entry.bind('<Shift-Tab>', lambda e: self.cycle_search(-1))
+            self.search_entry.bind('<ISO_Left_Tab>', lambda e: self.cycle_search(-1))
+            self.search_var.trace_add('write', lambda *args: self.update_search())
+            self.search_frame.place(relx=0.5, y=100, anchor='n')
+        self.search_var.set(text)
+        self.search_entry.icursor('end')
+        self.search_entry.focus_set()
+    
+    def update_search(self):
+        """Recompute the candidates for the text typed so far"""
+        text = self.search_var.get().strip()
+        candidates = []
+        if text.isdigit() and 1 <= int(text) <= len(self.images):
+            candidates.append(int(text) - 1)
+        if text:
+            # Slide number first, then filenames starting with the text
+            candidates += [i for i in self.slide_index.search(text, limit=100) if i not in candidates]
+        self.search_candidates = candidates
+        self.search_choice = 0
+        self.show_search_choice()
+        
+        # Decode likely targets while the user is still typing
+        size = self.get_low_res_size(self.get_display_size())
+        for index in candidates[:3]:
+            self.low_res_prefetcher.prefetch(self.images[index].path, size)
+    
+    def show_search_choice(self):
+        if not self.search_candidates:
+            text = "No match" if self.search_var.get().strip() else "Slide number or filename"
+            self.search_result.config(text=text)
+            return
+        index = self.search_candidates[self.search_choice]
+        more = f"  ({self.search_choice + 1} of {len(self.search_candidates)}, Tab for next)" \
+            if len(self.search_candidates) > 1 else ""
+        self.search_result.config(text=f"{index + 1}: {self.images[index].filename}{more}")
+    
+    def cycle_search(self, step):
+        if self.search_candidates:
+            self.search_choice = (self.search_choice + step) % len(self.search_candidates)
+            self.show_search_choice()
+        return 'break'
+    
+    def confirm_search(self):
+        candidates = self.search_candidates
+        index = candidates[self.search_choice] if candidates else None
+        self.close_search()
+        if index is not None:
+            self.jump_to(index)
+        return 'break'
+    
+    def close_search(self):
+        if self.search_frame is not None:
+            self.search_frame.destroy()
+        self.search_frame = None
+        self.search_entry = None
+        self.search_candidates = []
+        if self.presentation_window:
+            self.presentation_window.focus_set()
+        return 'break'
+    
+    def select_from_overview(self, index):
+        """Jump to (or start presenting from) a slide clicked in the overview"""
+        if self.presentation_running:
+            if self.sync_node:
+                return  # Synchronized slides follow the shared clock
+            self.jump_to(index)
+        else:
+            self.start_presentation(start_index=index)
+        if self.presentation_window:
+            self.presentation_window.lift()
+            self.presentation_window.focus_force()
     
     def toggle_pause(self):
         """Toggle pause/resume"""
-        if not hasattr(self, 'paused'):
-            self.paused = False
+        if self.sync_node:
+            return  # Pausing one screen would break lockstep
         
         self.paused = not self.paused
         
         if self.paused:
-            # Pause: stop the timer
-            self.stop_timer = True
+            # Pause: stop the timer, keeping the time left (the countdown may not have ticked)
+            if self.timer_deadline is not None:
+                self.remaining_time = round(max(MIN_DISPLAY_TIME, self.timer_deadline - time.monotonic()), 1)
+            self.cancel_timer()
+            if self.ken_burns_animator:
+                self.ken_burns_animator.pause()
             # Update timer label to show paused state
             self.timer_label.config(text="PAUSED")
             # Show pause indicator
@@ -573,274 +1397,500 @@ class QuickImagePresenter:
             # Resume: restart the timer with remaining time
             remaining = getattr(self, 'remaining_time', self.current_display_time)
             self.start_timer(remaining)
+            if self.ken_burns_animator:
+                self.ken_burns_animator.resume()
+                self.ken_burns_frame()
             # Hide pause indicator
             self.pause_label.config(text="")
             # Update pause button
             self.pause_button.config(text="⏸")
+        self.publish_status()
     
-    def show_next_image(self):
-        if not self.presentation_running or self.current_image_index >= len(self.images):
-            self.stop_presentation()
-            return
-        
+    def show_next_image(self, jump=False):
         # Ensure any existing timer is completely stopped before loading new image
-        self.stop_timer = True
+        self.cancel_timer()
         if self.timer_thread and self.timer_thread.is_alive():
-            self.timer_thread.join(timeout=1.0)  # Wait up to 1 second
+            self.timer_thread.join(timeout=1.0)  # Returns at once: the countdown wakes on cancel
         self.timer_thread = None
         self.remaining_time = None
-        
-        filename, filepath = self.images[self.current_image_index]
-        
-        try:
-            # Load and resize image
-            image = Image.open(filepath)
-            # Fix orientation before resizing
-            image = self.fix_image_orientation(image)
-            
-            # Get screen dimensions
-            screen_width = self.presentation_window.winfo_screenwidth()
-            screen_height = self.presentation_window.winfo_screenheight() - 80  # Account for control bar
-            
-            # Calculate aspect ratio
-            img_width, img_height = image.size
-            aspect_ratio = img_width / img_height
-            screen_ratio = screen_width / screen_height
-            
-            if aspect_ratio > screen_ratio:
-                # Image is wider than screen
-                new_width = screen_width
-                new_height = int(screen_width / aspect_ratio)
-            else:
-                # Image is taller than screen
-                new_height = screen_height
-                new_width = int(screen_height * aspect_ratio)
-            
-            # Resize image
-            image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(image)
+        self.note_wakeup('slide')
+        
+        # Quarantined and undecodable slides are skipped in this loop, never by recursion
+        while True:
+            if (self.presentation_running and self.playlist_loading
+                    and self.current_image_index >= len(self.images)):
+                # Playback caught up with the playlist parser; try again shortly
+                self.presentation_window.after(100, self.show_next_image)
+                return
             
-            # Apply transition effect
-            self.apply_transition(photo)
+            if not self.presentation_running or self.current_image_index >= len(self.images):
+                self.stop_presentation()
+                return
             
-            # Update counter label
-            self.counter_label.config(text=f"Image {self.current_image_index + 1} of {len(self.images)}")
+            entry = self.images[self.current_image_index]
+            if entry.path in self.quarantine:
+                self.current_image_index += 1
+                continue
             
-            # Determine display time
-            display_time = self.extract_time_from_filename(filename)
-            if display_time is None:
-                display_time = self.default_time.get()
+            try:
+                # Jumps cut straight to the slide; the timer starts while a placeholder may be showing
+                self.display_slide(self.current_image_index, None if jump else entry.transition, wait=not jump)
+            except Exception as e:
+                print(f"Error loading image {entry.path}: {e}")
+                self.quarantine_entry(entry, str(e) or type(e).__name__)
+                self.current_image_index += 1
+                continue
             
+            display_time = self.get_display_time(entry)
             self.current_display_time = display_time
             
             # Start timer only after ensuring previous one is stopped
             self.start_timer(display_time)
-            
-        except Exception as e:
-            print(f"Error loading image {filepath}: {e}")
-            self.current_image_index += 1
-            self.show_next_image()
+            return
     
-    def apply_transition(self, new_photo):
-        """Apply immediate image change without transitions for stable timer"""
-        # Store the new photo
-        self.current_photo = new_photo
+    def start_sync_node(self):
+        """Join the LAN sync group as leader or follower"""
+        from sync_playback import SyncNode, MulticastTransport, deck_signature
         
-        # Immediate change - no transitions to avoid timer conflicts
-        self.image_label.configure(image=new_photo)
-        self.image_label.image = new_photo
+        self.sync_durations = [self.get_display_time(entry) for entry in self.images]
+        try:
+            transport = MulticastTransport()
+        except OSError as e:
+            messagebox.showerror("Sync Mode", f"Could not join the sync network: {e}")
+            return False
+        self.sync_node = SyncNode(transport, leader=self.sync_mode.get() == "Leader",
+                                  signature=deck_signature(self.sync_durations))
+        self.sync_node.start()
+        self.sync_schedule = None
+        self.sync_warning = None
+        return True
     
-    def apply_dissolve_transition(self, new_photo):
-        """Apply dissolve transition effect"""
-        # Create a crossfade effect with multiple steps
-        steps = 10
-        for i in range(steps + 1):
-            if not self.presentation_running:
-                return
-            progress = i / steps
-            # Simulate dissolve with brief delays
-            self.root.after(int(progress * 50))
-        
-        self.image_label.configure(image=new_photo)
-        self.image_label.image = new_photo
-    
-    def apply_fade_transition(self, new_photo):
-        """Apply fade transition effect"""
-        # Create a fade effect with multiple steps
-        steps = 15
-        for i in range(steps + 1):
-            if not self.presentation_running:
-                return
-            progress = i / steps
-            # Simulate fade with brief delays
-            self.root.after(int(progress * 30))
+    def sync_tick(self):
+        """Show whatever slide the shared clock says is current and schedule the next tick"""
+        if not self.presentation_running or not self.sync_node:
+            return
+        
+        node = self.sync_node
+        if node.warning != self.sync_warning:
+            self.sync_warning = node.warning
+            self.status_label.config(text=f"Sync warning: {node.warning}" if node.warning else "Sync: decks match")
+            self.publish_status()
+        if not node.synchronized:
+            self.timer_label.config(text="SYNC")
+            self.presentation_window.after(50, self.sync_tick)
+            return
         
-        self.image_label.configure(image=new_photo)
-        self.image_label.image = new_photo
+        if self.sync_schedule is None or self.sync_schedule.epoch != node.epoch:
+            from sync_playback import SyncSchedule
+            self.sync_schedule = SyncSchedule(self.sync_durations, node.epoch)
+            self.current_image_index = -1
+        
+        now = node.now()
+        index, deadline, _ = self.sync_schedule.position(now)
+        if index != self.current_image_index:
+            self.current_image_index = index
+            try:
+                self.display_slide(index)
+            except Exception as e:
+                print(f"Error loading image {self.images[index].path}: {e}")
+        
+        remaining = deadline - now
+        self.remaining_time = math.ceil(remaining)
+        if self.power_profile.countdown_step is None:
+            # Low power: no countdown; wake only when the shared clock changes the slide
+            self.note_wakeup('sync')
+            self.timer_label.config(text="")
+            if self.presenter_view:
+                self.presenter_view.set_remaining(None)
+            delay = remaining
+        else:
+            self.update_timer_label(self.remaining_time)
+            # Wake at the next whole-second label change or exactly at the deadline
+            delay = remaining % 1.0 or 1.0
+            delay = min(delay, remaining)
+        self.presentation_window.after(max(1, int(delay * 1000 + 0.5)), self.sync_tick)
     
-    def apply_slide_transition(self, new_photo, direction):
-        """Apply slide transition effect"""
-        # Get current image position
-        x, y = 0, 0
+    def get_display_size(self):
+        """Size of the image area below the control bar"""
         screen_width = self.presentation_window.winfo_screenwidth()
-        screen_height = self.presentation_window.winfo_screenheight() - 80
-        
-        # Set initial position based on direction
-        if direction == "left":
-            x = screen_width
-        elif direction == "right":
-            x = -screen_width
-        elif direction == "up":
-            y = screen_height
-        elif direction == "down":
-            y = -screen_height
-        
-        # Create temporary label for transition
-        temp_label = tk.Label(self.presentation_window, image=new_photo, bg='black')
-        temp_label.image = new_photo
-        temp_label.place(x=x, y=y)
-        
-        # Animate the slide
-        steps = 20
-        for i in range(steps + 1):
-            if not self.presentation_running:
-                temp_label.destroy()
-                return
-            
-            progress = i / steps
-            if direction == "left":
-                new_x = screen_width * (1 - progress)
-            elif direction == "right":
-                new_x = -screen_width * (1 - progress)
-            elif direction == "up":
-                new_y = screen_height * (1 - progress)
-            elif direction == "down":
-                new_y = -screen_height * (1 - progress)
-            
-            temp_label.place(x=new_x, y=new_y)
-            self.root.after(20)  # 20ms delay between steps
-        
-        # Replace the main image
-        self.image_label.configure(image=new_photo)
-        self.image_label.image = new_photo
-        temp_label.destroy()
-    
-    def apply_zoom_transition(self, new_photo, zoom_type):
-        """Apply zoom transition effect"""
-        # Create temporary label for transition
-        temp_label = tk.Label(self.presentation_window, image=new_photo, bg='black')
-        temp_label.image = new_photo
-        temp_label.place(relx=0.5, rely=0.5, anchor='center')
-        
-        # Animate the zoom
-        steps = 15
-        for i in range(steps + 1):
-            if not self.presentation_running:
-                temp_label.destroy()
-                return
-            
-            progress = i / steps
-            if zoom_type == "in":
-                scale = 0.1 + (0.9 * progress)
-            else:  # zoom out
-                scale = 1.0 - (0.9 * progress)
-            
-            # Apply scaling effect
-            temp_label.configure(width=int(self.presentation_window.winfo_screenwidth() * scale),
-                               height=int((self.presentation_window.winfo_screenheight() - 80) * scale))
-            self.root.after(25)  # 25ms delay between steps
-        
-        # Replace the main image
-        self.image_label.configure(image=new_photo)
-        self.image_label.image = new_photo
-        temp_label.destroy()
-    
-    def apply_rotate_transition(self, new_photo):
-        """Apply rotate transition effect"""
-        # Create temporary label for transition
-        temp_label = tk.Label(self.presentation_window, image=new_photo, bg='black')
-        temp_label.image = new_photo
-        temp_label.place(relx=0.5, rely=0.5, anchor='center')
-        
-        # Animate the rotation (simulated with scaling)
-        steps = 20
-        for i in range(steps + 1):
-            if not self.presentation_running:
-                temp_label.destroy()
-                return
-            
-            progress = i / steps
-            # Simulate rotation with scaling changes
-            scale = 0.5 + (0.5 * abs(math.sin(progress * math.pi)))
-            
-            temp_label.configure(width=int(self.presentation_window.winfo_screenwidth() * scale),
-                               height=int((self.presentation_window.winfo_screenheight() - 80) * scale))
-            self.root.after(30)  # 30ms delay between steps
-        
-        # Replace the main image
-        self.image_label.configure(image=new_photo)
-        self.image_label.image = new_photo
-        temp_label.destroy()
-    
-    def apply_flip_transition(self, new_photo):
-        """Apply flip transition effect"""
-        # Create temporary label for transition
-        temp_label = tk.Label(self.presentation_window, image=new_photo, bg='black')
-        temp_label.image = new_photo
-        temp_label.place(relx=0.5, rely=0.5, anchor='center')
-        
-        # Animate the flip (simulated with scaling)
-        steps = 15
-        for i in range(steps + 1):
-            if not self.presentation_running:
-                temp_label.destroy()
+        screen_height = self.presentation_window.winfo_screenheight() - 80  # Account for control bar
+        return screen_width, screen_height
+    
+    def get_display_time(self, entry):
+        """Display time in seconds (fractions kept): playlist entry or filename rules, then default"""
+        display_time = entry.duration
+        if display_time is None:
+            display_time = self.default_time.get()
+        return max(MIN_DISPLAY_TIME, display_time)
+    
+    def display_slide(self, index, transition=None, progressive=True, wait=False):
+        """Show slide `index` (decoded ahead where possible) and prefetch the next one
+
+        With progressive, a slide that is not decoded yet is decoded in the
+        background and painted when it is ready; until then it is shown from a
+        placeholder (embedded thumbnail or JPEG draft, upscaled) if there is
+        one, else the previous slide stays up. With wait (normal advances),
+        the placeholder is held back for PROGRESSIVE_WAIT_MS, so a decode that
+        is nearly done still gets its transition. The Tk thread never waits
+        for a decode on this path.
+        """
+        from image_pipeline import PRIORITY_CURRENT
+        
+        self.finish_transition()
+        self.stop_ken_burns()
+        self.low_res_index = None
+        self.expand_pages(index, 0)
+        if not self.power_profile.animations:
+            transition = None  # Low power: cut between slides
+        entry = self.images[index]
+        size = self.get_display_size()
+        decode_size = self.get_decode_size(size)
+        
+        if progressive and decode_size == size and (entry.path, size) not in self.prefetcher.cache:
+            self.low_res_index = index
+            self.pending_transition = transition
+            self.prefetcher.prefetch(entry.path, size, priority=PRIORITY_CURRENT,
+                                     on_ready=lambda: self.root.after(0, self.swap_in_full_frame, index))
+            if wait and self.current_frame is not None:
+                # Normal advance: give the decode a moment before cutting to the placeholder
+                self.low_res_prefetcher.prefetch(entry.path, self.get_low_res_size(size), priority=PRIORITY_CURRENT)
+                self.presentation_window.after(PROGRESSIVE_WAIT_MS, self.show_placeholder, index)
+            else:
+                self.show_placeholder(index)
+        else:
+            self.paint_slide(index, self.prefetcher.get_frame(entry.path, decode_size), transition)
+        
+        # Update counter label
+        counter = f"Image {index + 1} of {len(self.images)}"
+        if entry.duplicate_of:
+            counter += f"  (duplicate of {entry.duplicate_of})"
+        self.counter_label.config(text=counter)
+        if self.overview and self.overview.is_open:
+            self.overview.show_current(index)
+        for display in self.extra_displays:
+            display.show(index)
+        self.publish_status()
+        
+        # Decode the neighbouring slides while this one is on screen
+        self.displayed_index = index
+        self.schedule_decodes(index)
+    
+    def paint_slide(self, index, image, transition=None):
+        """Put a decoded frame of slide `index` on screen, with Ken Burns motion if it is oversized"""
+        from PIL import ImageTk
+        from image_pipeline import fit_size
+        
+        animator = None
+        size = self.get_display_size()
+        if self.get_decode_size(size) != size:
+            # Ken Burns: the slide moves within a slightly larger buffer
+            from ken_burns import KenBurnsAnimator
+            animator = KenBurnsAnimator(image, fit_size(image.size, size), self.get_display_time(self.images[index]),
+                                        motion_index=index)
+            animator.pause()  # Time spent on the transition does not count
+            image = animator.render()
+        photo = ImageTk.PhotoImage(image)
+        
+        def start_motion():
+            if not self.paused:
+                animator.resume()
+            self.ken_burns_animator = animator
+            self.ken_burns_frame()
+        
+        # Apply transition effect
+        old_frame, self.current_frame = self.current_frame, image
+        self.apply_transition(photo, transition, old_frame, image, start_motion if animator else None)
+        if self.presenter_view:
+            self.refresh_presenter_view(index)
+    
+    def show_placeholder(self, index, request=True):
+        """Cut to the placeholder of a slide still waiting for its full frame, if one is cached
+
+        Otherwise it is loaded on the low-res decoder and shown when it arrives;
+        files without a cheap placeholder leave the previous slide up.
+        """
+        from PIL import Image
+        from image_pipeline import fit_size, PRIORITY_CURRENT
+        
+        if not self.presentation_running or self.low_res_index != index or self.current_image_index != index:
+            return
+        path = self.images[index].path
+        size = self.get_display_size()
+        low_res_size = self.get_low_res_size(size)
+        placeholder = self.low_res_prefetcher.cache.get((path, low_res_size))
+        if placeholder is not None:
+            self.pending_transition = None  # Cut now; the full frame then replaces the placeholder in place
+            self.paint_slide(index, placeholder.resize(fit_size(placeholder.size, size), Image.Resampling.BILINEAR))
+        elif request:
+            self.low_res_prefetcher.prefetch(path, low_res_size, priority=PRIORITY_CURRENT,
+                                             on_ready=lambda: self.root.after(0, self.show_placeholder, index, False))
+    
+    def swap_in_full_frame(self, index):
+        """Paint a slide's full frame once it is decoded, over its placeholder or the previous slide
+        (the timer keeps running)"""
+        if not self.presentation_running or self.low_res_index != index or self.current_image_index != index:
+            return
+        if (self.images[index].path, self.get_display_size()) not in self.prefetcher.cache:
+            return  # Decode failed; decode_failed() has skipped the slide
+        try:
+            self.display_slide(index, self.pending_transition)
+        except Exception as e:
+            print(f"Error loading image {self.images[index].path}: {e}")
+    
+    def get_low_res_size(self, size):
+        return max(1, size[0] // LOW_RES_SCALE), max(1, size[1] // LOW_RES_SCALE)
+    
+    def get_decode_size(self, size):
+        """Size slides are decoded at: the display size, or oversized for Ken Burns"""
+        if not self.ken_burns.get() or not self.power_profile.animations:
+            return size
+        from ken_burns import OVERSIZE
+        return int(size[0] * OVERSIZE), int(size[1] * OVERSIZE)
+    
+    def ken_burns_frame(self):
+        """Render one pan/zoom frame and schedule the next one from the measured cost"""
+        if self.ken_burns_job:
+            # Called directly (resume) while a frame was still scheduled
+            self.presentation_window.after_cancel(self.ken_burns_job)
+        self.ken_burns_job = None
+        animator = self.ken_burns_animator
+        if not animator or not self.presentation_running or self.paused:
+            return
+        
+        self.note_wakeup('ken burns')
+        start = time.perf_counter()
+        self.current_frame = animator.render()
+        self.current_photo.paste(self.current_frame)
+        animator.pacer.record(time.perf_counter() - start)
+        
+        if not animator.finished:
+            delay = int(animator.pacer.next_interval() * 1000)
+            self.ken_burns_job = self.presentation_window.after(max(1, delay), self.ken_burns_frame)
+    
+    def stop_ken_burns(self):
+        """Cancel the running pan/zoom animation"""
+        animator = self.ken_burns_animator
+        if self.ken_burns_job and self.presentation_window:
+            self.presentation_window.after_cancel(self.ken_burns_job)
+        self.ken_burns_job = None
+        self.ken_burns_animator = None
+        if animator and animator.pacer.frames:
+            self.ken_burns_stats = {'frames': animator.pacer.frames, 'fps': round(animator.pacer.fps, 1),
+                                    'dropped': animator.pacer.dropped}
+    
+    def apply_transition(self, new_photo, transition=None, old_frame=None, new_frame=None, on_done=None):
+        """Show new_photo, through a frame-paced transition if the playlist entry asks for one"""
+        from transitions import get_effect
+        
+        self.finish_transition()
+        self.current_photo = new_photo
+        
+        def show_final():
+            self.transition = None
+            self.image_label.configure(image=new_photo)
+            self.image_label.image = new_photo
+            if on_done:
+                on_done()
+        
+        if transition and new_frame is not None:
+            if get_effect(transition):
+                self.start_transition(transition, old_frame, new_frame, show_final)
                 return
-            
-            progress = i / steps
-            # Simulate flip with horizontal scaling
-            scale_x = abs(math.cos(progress * math.pi))
-            scale_y = 1.0
-            
-            temp_label.configure(width=int(self.presentation_window.winfo_screenwidth() * scale_x),
-                               height=int((self.presentation_window.winfo_screenheight() - 80) * scale_y))
-            self.root.after(25)  # 25ms delay between steps
+            print(f"Unknown transition '{transition}', showing image directly")
         
-        # Replace the main image
-        self.image_label.configure(image=new_photo)
-        self.image_label.image = new_photo
-        temp_label.destroy()
+        show_final()
+    
+    def start_transition(self, transition, old_frame, new_frame, on_done):
+        """Composite the transition into a display-sized photo on the Tk event loop"""
+        from PIL import Image, ImageTk
+        from transitions import TransitionCompositor, letterbox
+        
+        size = self.get_display_size()
+        old = letterbox(old_frame, size) if old_frame is not None else Image.new('RGB', size)
+        canvas_photo = ImageTk.PhotoImage('RGB', size)
+        self.image_label.configure(image=canvas_photo)
+        self.image_label.image = canvas_photo
+        
+        def done():
+            self.transition_fps = compositor.fps
+            self.transition_dropped = compositor.pacer.dropped
+            on_done()
+        
+        compositor = TransitionCompositor(self.presentation_window, transition, old, letterbox(new_frame, size),
+                                          canvas_photo.paste, done)
+        self.transition = compositor
+        compositor.start()
+    
+    def finish_transition(self):
+        """Jump to the end of a running transition"""
+        if self.transition:
+            self.transition.finish()
+            self.transition = None
     
     def start_timer(self, duration):
         # Start new timer thread (previous timer should already be stopped)
         self.stop_timer = False
         self.remaining_time = duration
-        self.timer_thread = threading.Thread(target=self.countdown_timer, args=(duration,))
+        self.timer_deadline = time.monotonic() + duration
+        if self.power_profile.countdown_step is None and self.timer_label:
+            self.timer_label.config(text="")  # No countdown in low-power mode
+            if self.presenter_view:
+                self.presenter_view.set_remaining(None)
+        import threading
+        self.timer_cancel = threading.Event()
+        self.timer_thread = threading.Thread(target=self.countdown_timer, args=(duration, self.timer_cancel))
         self.timer_thread.daemon = True
         self.timer_thread.start()
     
-    def countdown_timer(self, duration):
-        for i in range(duration, 0, -1):
-            if self.stop_timer:
+    def cancel_timer(self):
+        """Stop the countdown; its thread wakes up and exits immediately"""
+        self.stop_timer = True
+        if self.timer_cancel:
+            self.timer_cancel.set()
+    
+    def countdown_timer(self, duration, cancel):
+        # Without a countdown step (low power) the thread wakes only once, when the slide is over.
+        # Waits run to the deadline, so a fractional duration (1.5 s) first waits out its fraction
+        # and the label then changes on whole seconds left.
+        step = self.power_profile.countdown_step
+        deadline = time.monotonic() + duration
+        while True:
+            if self.stop_timer or cancel.is_set():
                 return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
             
-            # Update remaining time
-            self.remaining_time = i
+            # Update remaining time (rounded so a wait that ends a hair early does not show a second twice)
+            seconds = max(1, math.ceil(round(remaining, 3)))
+            self.remaining_time = seconds
             
             # Update timer label
-            if self.presentation_window and self.timer_label:
-                self.presentation_window.after(0, lambda t=i: self.timer_label.config(text=f"{t}s"))
-            time.sleep(1)
+            if step and self.presentation_window and self.timer_label:
+                self.presentation_window.after(0, self.update_timer_label, seconds)
+            wait = remaining - max(0, seconds - step) if step else remaining
+            if cancel.wait(wait):
+                return
+            self.note_wakeup('countdown')
         
         # Only proceed to next image if timer wasn't stopped
-        if not self.stop_timer and self.presentation_running:
+        if not self.stop_timer and not cancel.is_set() and self.presentation_running:
             # Move to next image
             self.current_image_index += 1
             if self.presentation_window:
                 self.presentation_window.after(0, self.show_next_image)
     
+    def update_timer_label(self, seconds):
+        """Show the countdown (runs on the Tk thread)"""
+        if self.presentation_running and self.timer_label:
+            self.note_wakeup('timer label')
+            self.timer_label.config(text=f"{seconds}s")
+            if self.presenter_view:
+                self.presenter_view.set_remaining(seconds)
+                if self.presenter_view.needs_next_frame:
+                    # The next slide may have been decoded since it was first looked up
+                    next_entry = self.presenter_view.next_entry
+                    self.presenter_view.show_next(next_entry, self.peek_frame(next_entry))
+            self.publish_status()
+    
+    def toggle_remote_control(self):
+        """Start or stop the local remote control server"""
+        if self.remote_enabled.get() and not self.remote_server:
+            from remote_control import RemoteControlServer
+            try:
+                self.remote_server = RemoteControlServer(
+                    wake=lambda: self.root.after(0, self.process_remote_commands))
+            except OSError as e:
+                self.remote_enabled.set(False)
+                messagebox.showerror("Remote Control", f"Could not start the remote control server: {e}")
+                return
+            self.remote_server.start()
+            host, port = self.remote_server.address
+            self.status_label.config(text=f"Remote control listening on http://{host}:{port}")
+            self.publish_status()
+        elif not self.remote_enabled.get() and self.remote_server:
+            self.remote_server.stop()
+            self.remote_server = None
+            self.status_label.config(text="Remote control stopped")
+    
+    def process_remote_commands(self):
+        """Run queued remote commands on the Tk thread"""
+        if not self.remote_server:
+            return
+        for command in self.remote_server.pending_commands():
+            self.remote_latency_ms = round((time.perf_counter() - command.received) * 1000, 1)
+            if command.name == 'reload':
+                self.load_images()
+            elif not self.presentation_running:
+                continue
+            elif command.name == 'next':
+                self.next_image()
+            elif command.name == 'previous':
+                self.previous_image()
+            elif command.name == 'pause':
+                self.toggle_pause()
+            elif command.name == 'jump':
+                self.jump_to(command.index)
+        self.publish_status()
+    
+    def publish_status(self):
+        """Hand the current state to the remote control server"""
+        if not self.remote_server:
+            return
+        current = None
+        if self.presentation_running and 0 <= self.current_image_index < len(self.images):
+            current = self.images[self.current_image_index].filename
+        self.remote_server.publish({
+            'running': self.presentation_running,
+            'paused': self.paused,
+            'index': self.current_image_index,
+            'total': len(self.images),
+            'filename': current,
+            'remaining_time': getattr(self, 'remaining_time', None),
+            'playlist_loading': self.playlist_loading,
+            'sync': self.sync_mode.get(),
+            'sync_warning': self.sync_node.warning if self.sync_node else None,
+            'cache': self._prefetcher.stats() if self._prefetcher else None,
+            'memory': self._memory_budget.snapshot if self._memory_budget else None,
+            'extra_displays': len(self.extra_displays),
+            'quarantined': len(self.quarantine),
+            'sort': self.sort_mode.get(),
+            'command_latency_ms': self.remote_latency_ms,
+            'transition_fps': round(self.transition_fps, 1) if self.transition_fps else None,
+            'transition_dropped': self.transition_dropped,
+            'ken_burns': self.ken_burns_stats,
+            'power_profile': self.power_profile.name,
+            'power': self.wakeup_meter.last_report if self.wakeup_meter else None,
+        })
+    
     def stop_presentation(self):
         self.presentation_running = False
-        self.stop_timer = True
+        self.cancel_timer()
+        self.finish_transition()
+        self.stop_ken_burns()
+        self.current_frame = None
+        self.low_res_index = None
+        self.pending_transition = None
+        self.displayed_index = None
+        if self.navigation_job and self.presentation_window:
+            self.presentation_window.after_cancel(self.navigation_job)
+        self.navigation_job = None
+        if self.memory_job and self.presentation_window:
+            self.presentation_window.after_cancel(self.memory_job)
+        self.memory_job = None
+        if self.measure_job and self.presentation_window:
+            self.presentation_window.after_cancel(self.measure_job)
+            self.report_power(final=True)
+        self.measure_job = None
+        self.timer_deadline = None
+        self.close_extra_displays()
+        self.close_presenter_view()
+        self.search_frame = None
+        self.search_entry = None
+        
+        if self.sync_node:
+            self.sync_node.stop()
+            self.sync_node = None
         
         # Restore sleep settings if they were changed
         if self.sleep_prevention_active:
@@ -850,6 +1900,7 @@ class QuickImagePresenter:
         if self.presentation_window:
             self.presentation_window.destroy()
             self.presentation_window = None
+        self.publish_status()
     
     def show_info(self):
         info_text = """Quick Image Presenter v2.0
@@ -0,0 +1,331 @@
+"""
+Remote control server for Quick Image Presenter.
+
+A small HTTP + WebSocket server that runs on its own threads, off the Tk
+thread. Commands are put on a thread-safe queue and the application is
+woken to process them on the Tk thread; status is served from a snapshot the
+application publishes, so requests never touch Tk.
+
+HTTP:
+    GET  /status                  current status as JSON
+    POST /next, /previous, /pause, /reload
+    POST /jump?index=N            (0-based index)
+
+WebSocket (GET /ws):
+    send    {"cmd": "next"} or {"cmd": "jump", "index": 12} ...
+    receive {"type": "status", ...} whenever the status changes
+"""
+
+import base64
+import hashlib
+import json
+import queue
+import socket
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+COMMANDS = {'next', 'previous', 'pause', 'jump', 'reload', 'status'}
+
+_WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+# Status messages queued per WebSocket client before it counts as stalled and is dropped
+SEND_QUEUE_SIZE = 16
+
+
+class RemoteCommand:
+    """A command received from a remote client"""
+
+    __slots__ = ('name', 'index', 'received')
+
+    def __init__(self, name, index=None):
+        self.name = name
+        self.index = index
+        self.received = time.perf_counter()
+
+    def __repr__(self):
+        return f"RemoteCommand({self.name!r}, index={self.index!r})"
+
+
+def parse_command(name, index=None):
+    """Validate a command name/index pair; raises ValueError if invalid"""
+    name = (name or '').strip().lower()
+    if name not in COMMANDS:
+        raise ValueError(f"Unknown command: {name!r}")
+    if name == 'jump':
+        if index is None:
+            raise ValueError("jump needs an index")
+        index = int(index)
+    return RemoteCommand(name, index)
+
+
+class _WebSocket:
+    """Server side of one WebSocket connection (RFC 6455, text frames only)
+
+    Messages are written by a sender thread per client, so publishing never
+    blocks the caller on a slow client.
+    """
+
+    def __init__(self, connection, rfile, wfile):
+        self.connection = connection
+        self.rfile = rfile
+        self.wfile = wfile
+        self.write_lock = threading.Lock()
+        self.open = True
+        self._outbox = queue.Queue(maxsize=SEND_QUEUE_SIZE)
+        self._sender = threading.Thread(target=self._send_loop, name='remote-ws-send', daemon=True)
+        self._sender.start()
+
+    def _read_exact(self, n):
+        data = self.rfile.read(n)
+        if len(data) < n:
+            raise ConnectionError("WebSocket closed")
+        return data
+
+    def receive(self):
+        """Return the next text message, or None when the connection closes"""
+        message = b''
+        while True:
+            head = self._read_exact(2)
+            fin = head[0] & 0x80
+            opcode = head[0] & 0x0F
+            length = head[1] & 0x7F
+            if length == 126:
+                length = struct.unpack('>H', self._read_exact(2))[0]
+            elif length == 127:
+                length = struct.unpack('>Q', self._read_exact(8))[0]
+            mask = self._read_exact(4) if head[1] & 0x80 else None
+            payload = self._read_exact(length)
+            if mask:
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+            if opcode == 0x8:  # close
+                self._send_frame(0x8, payload[:2])
+                return None
+            if opcode == 0x9:  # ping
+                self._send_frame(0xA, payload)
+                continue
+            if opcode == 0xA:  # pong
+                continue
+            message += payload
+            if fin:
+                return message.decode('utf-8', errors='replace')
+
+    def _send_frame(self, opcode, payload):
+        length = len(payload)
+        if length < 126:
+            header = struct.pack('>BB', 0x80 | opcode, length)
+        elif length < 65536:
+            header = struct.pack('>BBH', 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack('>BBQ', 0x80 | opcode, 127, length)
+        with self.write_lock:
+            self.wfile.write(header + payload)
+            self.wfile.flush()
+
+    def _send_loop(self):
+        while True:
+            text = self._outbox.get()
+            if text is None or not self.open:
+                return
+            try:
+                self._send_frame(0x1, text.encode('utf-8'))
+            except (OSError, ValueError):
+                self.close()
+                return
+
+    def send_text(self, text):
+        """Queue a text message without blocking; a client that stops reading is disconnected"""
+        if not self.open:
+            return
+        try:
+            self._outbox.put_nowait(text)
+        except queue.Full:
+            print("Remote control: disconnecting a WebSocket client that stopped reading")
+            self.close()
+
+    def close(self):
+        """Stop sending and wake the handler's blocking read; the handler closes its own streams"""
+        self.open = False
+        try:
+            self._outbox.put_nowait(None)
+        except queue.Full:
+            pass  # The sender checks `open` before each write
+        try:
+            self.connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # Already closed by the client
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server_version = 'QuickImagePresenter'
+
+    def log_message(self, format, *args):
+        pass  # Keep the console quiet; commands are logged by the app
+
+    def _send_json(self, code, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _cross_origin(self):
+        """True for a browser request made by a page from another origin
+
+        Browsers send Origin with WebSocket upgrades and POSTs; tools like curl
+        send none. Without this check any web page open on the LAN could drive
+        the presenter.
+        """
+        origin = self.headers.get('Origin')
+        if origin is None:
+            return False
+        return urlparse(origin).netloc.lower() != (self.headers.get('Host') or '').lower()
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/status':
+            self._send_json(200, self.server.control.status)
+        elif path == '/ws' and self.headers.get('Upgrade', '').lower() == 'websocket':
+            if self._cross_origin():
+                self._send_json(403, {'error': 'cross-origin WebSocket connections are not allowed'})
+                return
+            self._serve_websocket()
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self._cross_origin():
+            self._send_json(403, {'error': 'cross-origin requests are not allowed'})
+            return
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            try:
+                body = json.loads(self.rfile.read(length))
+            except ValueError:
+                body = None
+            if not isinstance(body, dict):
+                self._send_json(400, {'error': 'body must be a JSON object'})
+                return
+            params.update(body)
+        try:
+            command = parse_command(url.path.strip('/'), params.get('index'))
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        if command.name == 'status':
+            self._send_json(200, self.server.control.status)
+            return
+        self.server.control.submit(command)
+        self._send_json(202, {'queued': command.name})
+
+    def _serve_websocket(self):
+        key = self.headers.get('Sec-WebSocket-Key', '')
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode('ascii')).digest()).decode('ascii')
+        self.send_response(101, 'Switching Protocols')
+        self.send_header('Upgrade', 'websocket')
+        self.send_header('Connection', 'Upgrade')
+        self.send_header('Sec-WebSocket-Accept', accept)
+        self.end_headers()
+        self.wfile.flush()
+
+        control = self.server.control
+        ws = _WebSocket(self.connection, self.rfile, self.wfile)
+        control._add_client(ws)
+        ws.send_text(json.dumps(dict(control.status, type='status')))
+        try:
+            while ws.open:
+                text = ws.receive()
+                if text is None:
+                    break
+                try:
+                    message = json.loads(text)
+                    command = parse_command(message.get('cmd'), message.get('index'))
+                except (ValueError, AttributeError) as e:
+                    ws.send_text(json.dumps({'type': 'error', 'error': str(e)}))
+                    continue
+                if command.name == 'status':
+                    ws.send_text(json.dumps(dict(control.status, type='status')))
+                else:
+                    control.submit(command)
+        except (ConnectionError, OSError, ValueError):
+            pass  # Client went away or the server is shutting down
+        finally:
+            ws.close()
+            control._remove_client(ws)
+            self.close_connection = True
+
+
+class RemoteControlServer:
+    """Embedded control server; `wake` is called (from server threads) after each queued command"""
+
+    def __init__(self, wake, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.commands = queue.Queue()
+        self.wake = wake
+        self.status = {}
+        self._clients = []
+        self._clients_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _RequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.control = self
+        self._thread = None
+
+    @property
+    def address(self):
+        return self._httpd.server_address
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, kwargs={'poll_interval': 0.5},
+                                        name='remote-control', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        with self._clients_lock:
+            clients, self._clients = self._clients, []
+        for ws in clients:
+            ws.close()
+
+    def submit(self, command):
+        self.commands.put(command)
+        self.wake()
+
+    def pending_commands(self):
+        """Drain queued commands (call on the Tk thread)"""
+        while True:
+            try:
+                yield self.commands.get_nowait()
+            except queue.Empty:
+                return
+
+    def publish(self, status):
+        """Replace the status snapshot and queue it for WebSocket clients if it changed (never blocks)"""
+        if status == self.status:
+            return
+        self.status = status
+        with self._clients_lock:
+            clients = list(self._clients)
+        if clients:
+            text = json.dumps(dict(status, type='status'))
+            for ws in clients:
+                ws.send_text(text)
+
+    def _add_client(self, ws):
+        with self._clients_lock:
+            self._clients.append(ws)
+
+    def _remove_client(self, ws):
+        with self._clients_lock:
+            if ws in self._clients:
+                self._clients.remove(ws)
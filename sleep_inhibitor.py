@@ -0,0 +1,334 @@
+"""
+Sleep inhibition for Quick Image Presenter.
+
+Keeps the display awake during a presentation without blocking the UI.
+Available methods are probed once per process and cached. All calls into the
+operating system run on one background worker thread with timeouts, and
+wherever possible a single long-lived inhibitor is held (a
+SetThreadExecutionState on the worker thread, a `caffeinate` or
+`systemd-inhibit` child process) instead of shelling out repeatedly.
+Settings that have to be changed (xset, gsettings) are read first and the
+original values are restored on release and at exit.
+"""
+
+import atexit
+import os
+import platform
+import queue
+import re
+import shutil
+import subprocess
+import sys
+import threading
+from abc import ABC, abstractmethod
+
+# Seconds allowed for any single helper command
+COMMAND_TIMEOUT = 2.0
+
+_probe_lock = threading.Lock()
+_probed_backends = None
+
+
+def _run(args):
+    """Run a helper command with a timeout; returns CompletedProcess or None"""
+    try:
+        return subprocess.run(args, capture_output=True, text=True, timeout=COMMAND_TIMEOUT, check=False)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"Sleep inhibitor: {args[0]} failed: {e}")
+        return None
+
+
+class InhibitorBackend(ABC):
+    """One way of keeping the machine awake; subclasses implement acquire/release"""
+
+    name = 'base'
+
+    @classmethod
+    def available(cls):
+        """Cheap check whether this method can work here"""
+        return False
+
+    @abstractmethod
+    def acquire(self):
+        """Start inhibiting; return True on success"""
+
+    @abstractmethod
+    def release(self):
+        """Stop inhibiting and restore any changed settings"""
+
+
+class WindowsBackend(InhibitorBackend):
+    """SetThreadExecutionState, held by the inhibitor's worker thread"""
+
+    name = 'SetThreadExecutionState'
+
+    ES_CONTINUOUS = 0x80000000
+    ES_SYSTEM_REQUIRED = 0x00000001
+    ES_DISPLAY_REQUIRED = 0x00000002
+
+    @classmethod
+    def available(cls):
+        return sys.platform == 'win32'
+
+    def _set_state(self, flags):
+        import ctypes
+        from ctypes import wintypes
+        set_state = ctypes.windll.kernel32.SetThreadExecutionState
+        set_state.argtypes = [wintypes.DWORD]
+        set_state.restype = wintypes.DWORD
+        return set_state(flags) != 0
+
+    def acquire(self):
+        return self._set_state(self.ES_CONTINUOUS | self.ES_SYSTEM_REQUIRED | self.ES_DISPLAY_REQUIRED)
+
+    def release(self):
+        self._set_state(self.ES_CONTINUOUS)
+
+
+class _ChildProcessBackend(InhibitorBackend):
+    """Holds a long-lived helper process for as long as inhibition is wanted"""
+
+    command_name = None
+
+    def __init__(self):
+        self.process = None
+
+    @classmethod
+    def available(cls):
+        return shutil.which(cls.command_name) is not None
+
+    def acquire(self):
+        try:
+            self.process = subprocess.Popen(self.build_command(), stdin=subprocess.DEVNULL,
+                                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            print(f"Sleep inhibitor: could not start {self.command_name}: {e}")
+            return False
+        try:
+            # A helper that exits right away could not take the inhibitor
+            self.process.wait(timeout=0.2)
+            self.process = None
+            return False
+        except subprocess.TimeoutExpired:
+            return True
+
+    def release(self):
+        if self.process is None:
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=COMMAND_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self.process = None
+
+
+class CaffeinateBackend(_ChildProcessBackend):
+    """macOS `caffeinate`, tied to our process so it cannot outlive it"""
+
+    name = 'caffeinate'
+    command_name = 'caffeinate'
+
+    @classmethod
+    def available(cls):
+        return sys.platform == 'darwin' and super().available()
+
+    def build_command(self):
+        return ['caffeinate', '-d', '-i', '-w', str(os.getpid())]
+
+
+class SystemdInhibitBackend(_ChildProcessBackend):
+    """logind idle/sleep inhibitor lock held by a `systemd-inhibit` child, tied to our process"""
+
+    name = 'systemd-inhibit'
+    command_name = 'systemd-inhibit'
+
+    @classmethod
+    def available(cls):
+        return sys.platform.startswith('linux') and super().available()
+
+    def build_command(self):
+        return ['systemd-inhibit', '--what=idle:sleep', '--who=Quick Image Presenter',
+                '--why=Presentation running', '--mode=block',
+                # Exits with us, so a crash cannot leave the lock behind (like caffeinate -w)
+                'tail', f'--pid={os.getpid()}', '-f', '/dev/null']
+
+
+class XsetBackend(InhibitorBackend):
+    """X11 screen saver and DPMS, with the original settings restored afterwards"""
+
+    name = 'xset'
+
+    def __init__(self):
+        self.original = None
+
+    @classmethod
+    def available(cls):
+        if not sys.platform.startswith('linux') or not os.environ.get('DISPLAY') or not shutil.which('xset'):
+            return False
+        result = _run(['xset', 'q'])
+        return result is not None and result.returncode == 0
+
+    @staticmethod
+    def read_settings(output):
+        """Parse `xset q` output into (timeout, cycle, prefer_blanking, dpms_enabled)"""
+        timeout = re.search(r'timeout:\s*(\d+)\s+cycle:\s*(\d+)', output)
+        blanking = re.search(r'prefer blanking:\s*(\w+)', output)
+        dpms = re.search(r'DPMS is (\w+)', output)
+        return ((int(timeout.group(1)), int(timeout.group(2))) if timeout else (600, 600),
+                blanking.group(1).lower() == 'yes' if blanking else True,
+                dpms.group(1).lower() == 'enabled' if dpms else True)
+
+    def acquire(self):
+        result = _run(['xset', 'q'])
+        if result is None or result.returncode != 0:
+            return False
+        self.original = self.read_settings(result.stdout)
+        # One invocation instead of one process per option
+        result = _run(['xset', 's', 'off', 's', 'noblank', '-dpms'])
+        return result is not None and result.returncode == 0
+
+    def release(self):
+        if self.original is None:
+            return
+        (timeout, cycle), blanking, dpms = self.original
+        _run(['xset', 's', str(timeout), str(cycle), 's', 'blank' if blanking else 'noblank',
+              '+dpms' if dpms else '-dpms'])
+        self.original = None
+
+
+class GsettingsBackend(InhibitorBackend):
+    """GNOME idle delay (Wayland sessions), restored to its previous value"""
+
+    name = 'gsettings'
+    SCHEMA = ('org.gnome.desktop.session', 'idle-delay')
+
+    def __init__(self):
+        self.original = None
+
+    @classmethod
+    def available(cls):
+        if not sys.platform.startswith('linux') or not shutil.which('gsettings'):
+            return False
+        result = _run(['gsettings', 'get', *cls.SCHEMA])
+        return result is not None and result.returncode == 0
+
+    def acquire(self):
+        result = _run(['gsettings', 'get', *self.SCHEMA])
+        if result is None or result.returncode != 0:
+            return False
+        self.original = result.stdout.strip().split()[-1]
+        result = _run(['gsettings', 'set', *self.SCHEMA, '0'])
+        return result is not None and result.returncode == 0
+
+    def release(self):
+        if self.original is None:
+            return
+        _run(['gsettings', 'set', *self.SCHEMA, self.original])
+        self.original = None
+
+
+def probe_backends():
+    """Return the inhibitor backend classes usable here (probed once per process)"""
+    global _probed_backends
+    with _probe_lock:
+        if _probed_backends is None:
+            system = platform.system()
+            if system == 'Windows':
+                candidates = [WindowsBackend]
+            elif system == 'Darwin':
+                candidates = [CaffeinateBackend]
+            else:
+                # System sleep via logind, plus one way of stopping screen blanking
+                candidates = [SystemdInhibitBackend, XsetBackend, GsettingsBackend]
+            found = [backend for backend in candidates if backend.available()]
+            if system not in ('Windows', 'Darwin') and XsetBackend in found and GsettingsBackend in found:
+                found.remove(GsettingsBackend)
+            _probed_backends = found
+            print(f"Sleep inhibitor methods: {', '.join(b.name for b in found) or 'none'}")
+        return list(_probed_backends)
+
+
+class SleepInhibitor:
+    """Non-blocking front end: inhibit() and release() return immediately"""
+
+    def __init__(self, backends=None):
+        self._backend_classes = backends
+        self._active = []
+        self._wanted = False
+        self._jobs = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    @property
+    def active(self):
+        """Names of the methods currently holding the machine awake"""
+        return [backend.name for backend in self._active]
+
+    def inhibit(self):
+        self._submit(True)
+
+    def release(self):
+        self._submit(False)
+
+    def wait(self):
+        """Block until all queued requests have been carried out"""
+        self._jobs.join()
+
+    def shutdown(self):
+        """Restore settings synchronously (used at exit)"""
+        if self._thread and self._thread.is_alive():
+            self.release()
+            self._jobs.put(None)
+            self._thread.join(timeout=COMMAND_TIMEOUT * 3)
+
+    def _submit(self, wanted):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name='sleep-inhibitor', daemon=True)
+                self._thread.start()
+        self._jobs.put(wanted)
+
+    def _worker(self):
+        # Every OS call happens on this thread, which is what keeps a
+        # per-thread execution state held on Windows.
+        while True:
+            wanted = self._jobs.get()
+            try:
+                if wanted is None:
+                    return
+                if wanted and not self._wanted:
+                    self._acquire_all()
+                elif not wanted and self._wanted:
+                    self._release_all()
+            except Exception as e:
+                print(f"Sleep inhibitor error: {e}")
+            finally:
+                self._jobs.task_done()
+
+    def _acquire_all(self):
+        self._wanted = True
+        classes = self._backend_classes if self._backend_classes is not None else probe_backends()
+        for backend_class in classes:
+            backend = backend_class()
+            try:
+                if backend.acquire():
+                    self._active.append(backend)
+                    print(f"Sleep prevention active via {backend.name}")
+                else:
+                    backend.release()
+            except Exception as e:
+                print(f"Sleep prevention via {backend.name} failed: {e}")
+        if not self._active:
+            print("Sleep prevention methods not available")
+
+    def _release_all(self):
+        self._wanted = False
+        while self._active:
+            backend = self._active.pop()
+            try:
+                backend.release()
+                print(f"Sleep settings restored ({backend.name})")
+            except Exception as e:
+                print(f"Restoring sleep settings via {backend.name} failed: {e}")
@@ -0,0 +1,34 @@
+"""
+Filename search over the slide list for Quick Image Presenter.
+
+SlideIndex keeps the slides' filenames case-folded and sorted once, so each
+keystroke of an incremental prefix search is two binary searches instead of
+a scan over the whole playlist.
+"""
+
+from bisect import bisect_left
+
+# Sorts after every character a filename can contain
+_PREFIX_END = chr(0x10FFFF)
+
+
+class SlideIndex:
+    """Sorted filename index over a list of PlaylistEntry objects"""
+
+    def __init__(self, entries):
+        pairs = sorted((entry.filename.casefold(), index) for index, entry in enumerate(entries))
+        self.names = [name for name, _ in pairs]
+        self.indices = [index for _, index in pairs]
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, prefix, limit=None):
+        """Slide indices whose filename starts with prefix, in filename order"""
+        prefix = prefix.casefold()
+        start = bisect_left(self.names, prefix)
+        end = bisect_left(self.names, prefix + _PREFIX_END, start)
+        if limit is not None:
+            end = min(end, start + limit)
+        return self.indices[start:end]
+
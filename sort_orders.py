@@ -0,0 +1,175 @@
+"""
+Metadata sort orders for Quick Image Presenter.
+
+Besides the natural filename order a deck can be sorted by EXIF capture
+time, file modification time, file size, pixel dimensions or a seeded
+shuffle. Capture time and dimensions are read from image headers only:
+the EXIF block and the image size are parsed when a file is opened, and
+no pixel data is decoded. Modification time and size come from the same
+stat call that validates the metadata cache.
+
+The headers are read on a thread pool and stored in the MetadataCache per
+(mtime, size), so a library is only scanned once. The presenter keeps the
+records for the loaded slides in memory, so switching between sort orders
+is a plain in-memory sort, even for 100k slides.
+"""
+
+import random
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import ExifTags, Image
+
+from image_pipeline import open_image
+from metadata_cache import file_signature
+from pages import split_page_path
+
+SORT_NAME = "Name"
+SORT_CAPTURE_TIME = "Capture Time"
+SORT_MODIFIED = "Modified"
+SORT_SIZE = "File Size"
+SORT_DIMENSIONS = "Dimensions"
+SORT_SHUFFLE = "Shuffle"
+SORT_MODES = (SORT_NAME, SORT_CAPTURE_TIME, SORT_MODIFIED, SORT_SIZE, SORT_DIMENSIONS, SORT_SHUFFLE)
+
+# Sort modes that need image headers (the others only need the file list or a stat)
+HEADER_MODES = (SORT_CAPTURE_TIME, SORT_DIMENSIONS)
+
+HEADER_WORKERS = 8
+TAKEN_FIELD = 'taken'  # 'YYYY-MM-DD HH:MM:SS', or '' when the file has no capture time
+PIXELS_FIELD = 'pixels'
+
+EXIF_DATETIME = 0x0132
+EXIF_DATETIME_ORIGINAL = 0x9003
+EXIF_DATETIME_DIGITIZED = 0x9004
+
+# Formats whose getexif() reads tags that are already parsed (PNG's may decode the image)
+_HEADER_EXIF_FORMATS = ('JPEG', 'MPO', 'TIFF')
+
+_EXIF_TIME = re.compile(r'^(\d{4}):(\d{2}):(\d{2})[ T](\d{2}):(\d{2}):(\d{2})')
+
+
+def normalize_exif_time(value):
+    """'YYYY:MM:DD HH:MM:SS' (EXIF) -> 'YYYY-MM-DD HH:MM:SS', or None for missing or blank dates"""
+    if isinstance(value, bytes):
+        value = value.decode('ascii', errors='replace')
+    match = _EXIF_TIME.match(value.strip()) if isinstance(value, str) else None
+    if not match or match.group(1) == '0000':
+        return None
+    year, month, day, hour, minute, second = match.groups()
+    return f"{year}-{month}-{day} {hour}:{minute}:{second}"
+
+
+def _header_exif(image):
+    if image.format in _HEADER_EXIF_FORMATS:
+        return image.getexif()
+    raw = image.info.get('exif')  # PNG eXIf chunk before the pixels, WebP EXIF chunk
+    if not raw:
+        return None
+    exif = Image.Exif()
+    exif.load(raw[6:] if raw.startswith(b'Exif\x00\x00') else raw)
+    return exif
+
+
+def read_header(path):
+    """{'taken': capture time or '', 'pixels': width * height} from the image header"""
+    with open_image(path) as image:
+        width, height = image.size
+        taken = None
+        try:
+            exif = _header_exif(image)
+        except Exception:
+            exif = None
+        if exif:
+            exif_ifd = exif.get_ifd(ExifTags.IFD.Exif) if hasattr(ExifTags, 'IFD') else {}
+            for value in (exif_ifd.get(EXIF_DATETIME_ORIGINAL), exif_ifd.get(EXIF_DATETIME_DIGITIZED),
+                          exif.get(EXIF_DATETIME)):
+                taken = normalize_exif_time(value)
+                if taken:
+                    break
+    return {TAKEN_FIELD: taken or '', PIXELS_FIELD: width * height}
+
+
+def collect_metadata(paths, cache=None, headers=True, workers=HEADER_WORKERS, progress=None, cancelled=None):
+    """{path: {'mtime', 'size', 'taken', 'pixels'}}; headers are read in parallel where not cached
+
+    With headers=False only the stat fields are filled in. Unreadable files
+    get no 'taken' and no 'pixels'. progress(done, total) is called from the
+    calling thread; cancelled() is polled so a superseded scan can stop early.
+    """
+    records = {}
+    missing = []
+    for path in paths:
+        signature = file_signature(path)
+        record = records[path] = {'mtime': signature[0], 'size': signature[1]} if signature else {}
+        if not headers or signature is None:
+            continue
+        taken = cache.get(path, signature, TAKEN_FIELD) if cache is not None else None
+        pixels = cache.get(path, signature, PIXELS_FIELD) if cache is not None else None
+        if taken is None or pixels is None:
+            missing.append((path, signature))
+        else:
+            record[TAKEN_FIELD] = taken
+            record[PIXELS_FIELD] = pixels
+
+    def work(item):
+        path, signature = item
+        try:
+            return path, signature, read_header(path)
+        except Exception as e:
+            print(f"Could not read the header of {path}: {e}")
+            return path, signature, None
+
+    total = len(missing)
+    if progress:
+        progress(0, total)
+    if not missing:
+        return records
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='headers') as executor:
+        for done, (path, signature, header) in enumerate(executor.map(work, missing), 1):
+            if cancelled and cancelled():
+                executor.shutdown(wait=False, cancel_futures=True)
+                return records
+            if header is not None:
+                records[path].update(header)
+                if cache is not None:
+                    cache.put(path, signature, **header)
+            if progress and (done % 500 == 0 or done == total):
+                progress(done, total)
+    return records
+
+
+def _loaded_order(entry):
+    return (entry.order if entry.order is not None else float('inf'), entry.page or 0)
+
+
+def sort_entries(entries, mode, records=None, seed=0):
+    """entries in the given sort order (a new list); ties and missing values keep the loaded order
+
+    Slides without a capture time or unreadable headers sort last. Page
+    slides split off after the scan use their file's record, so the pages
+    of a file stay together.
+    """
+    records = records or {}
+    ordered = sorted(entries, key=_loaded_order)
+    if mode == SORT_NAME:
+        return ordered
+    if mode == SORT_SHUFFLE:
+        random.Random(seed).shuffle(ordered)
+        return ordered
+
+    field = {SORT_CAPTURE_TIME: TAKEN_FIELD, SORT_MODIFIED: 'mtime', SORT_SIZE: 'size',
+             SORT_DIMENSIONS: PIXELS_FIELD}.get(mode)
+    if field is None:
+        raise ValueError(f"Unknown sort order {mode!r}")
+
+    def key(entry):
+        record = records.get(entry.path)
+        if record is None:
+            record = records.get(split_page_path(entry.path)[0], {})
+        value = record.get(field)
+        if value in (None, ''):
+            return (1, 0)
+        return (0, value)
+
+    return sorted(ordered, key=key)  # Stable: equal keys stay in loaded order
@@ -0,0 +1,262 @@
+"""
+Wall-clock synchronized playback for Quick Image Presenter.
+
+Several presenter instances showing the same deck derive the current slide
+and its deadline from a shared epoch instead of free-running timers, so they
+change slides in lockstep. One instance acts as leader: it announces the
+epoch and answers clock pings. Followers estimate their clock offset to the
+leader NTP-style (keeping the sample with the smallest round trip) and use
+the leader's time to look up the current slide.
+
+Messages are small JSON datagrams sent over UDP multicast on the LAN. A
+LoopbackBus with the same interface connects nodes inside one process for
+tests.
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import queue
+import socket
+import struct
+import threading
+import time
+
+MULTICAST_GROUP = '239.255.42.99'
+MULTICAST_PORT = 50999
+
+# Seconds between epoch announcements from the leader
+ANNOUNCE_INTERVAL = 1.0
+# Seconds between clock pings from a follower once it is synchronized
+PING_INTERVAL = 2.0
+# Faster pings until enough samples have been collected
+INITIAL_PING_INTERVAL = 0.2
+INITIAL_PING_COUNT = 8
+# Offset samples kept; the one with the lowest round trip wins
+SAMPLE_WINDOW = 16
+
+
+def deck_signature(durations):
+    """Short hash identifying a deck by its slide count and durations"""
+    digest = hashlib.sha1(json.dumps(list(durations)).encode('utf-8')).hexdigest()
+    return f"{len(durations)}:{digest[:12]}"
+
+
+class SyncSchedule:
+    """Maps a synchronized time onto (slide index, deadline) in a looping deck"""
+
+    def __init__(self, durations, epoch):
+        if not durations:
+            raise ValueError("A synchronized deck needs at least one slide")
+        self.durations = list(durations)
+        self.epoch = epoch
+        # starts[i] is the offset of slide i within one pass through the deck
+        self.starts = []
+        total = 0.0
+        for duration in self.durations:
+            self.starts.append(total)
+            total += duration
+        self.cycle = total
+
+    def position(self, now):
+        """Return (index, deadline, slide_start) for the given synchronized time"""
+        elapsed = now - self.epoch
+        cycle_start = self.epoch + (elapsed // self.cycle) * self.cycle
+        offset = elapsed % self.cycle
+        index = bisect.bisect_right(self.starts, offset) - 1
+        slide_start = cycle_start + self.starts[index]
+        return index, slide_start + self.durations[index], slide_start
+
+
+class MulticastTransport:
+    """UDP multicast datagram transport for the LAN"""
+
+    def __init__(self, group=MULTICAST_GROUP, port=MULTICAST_PORT, ttl=1):
+        self.address = (group, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, 'SO_REUSEPORT'):
+            try:
+                self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            except OSError:
+                pass
+        self.sock.bind(('', port))
+        membership = struct.pack('4sl', socket.inet_aton(group), socket.INADDR_ANY)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+
+    def send(self, data):
+        self.sock.sendto(data, self.address)
+
+    def recv(self, timeout):
+        """Return the next datagram, or None after timeout seconds"""
+        self.sock.settimeout(timeout)
+        try:
+            data, _ = self.sock.recvfrom(2048)
+            return data
+        except socket.timeout:
+            return None
+
+    def close(self):
+        self.sock.close()
+
+
+class LoopbackBus:
+    """In-process stand-in for a multicast group, used by tests"""
+
+    def __init__(self):
+        self._members = []
+        self._lock = threading.Lock()
+
+    def transport(self):
+        """Create a transport joined to this bus"""
+        member = _LoopbackTransport(self)
+        with self._lock:
+            self._members.append(member)
+        return member
+
+    def _broadcast(self, data):
+        with self._lock:
+            members = list(self._members)
+        for member in members:
+            member._inbox.put(data)
+
+    def _leave(self, member):
+        with self._lock:
+            if member in self._members:
+                self._members.remove(member)
+
+
+class _LoopbackTransport:
+    def __init__(self, bus):
+        self._bus = bus
+        self._inbox = queue.Queue()
+
+    def send(self, data):
+        self._bus._broadcast(data)
+
+    def recv(self, timeout):
+        try:
+            return self._inbox.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._bus._leave(self)
+
+
+class SyncNode:
+    """One participant in synchronized playback (leader or follower)
+
+    `clock` returns local wall-clock seconds; now() returns the leader's
+    time as estimated by this node.
+    """
+
+    def __init__(self, transport, leader=False, epoch=None, signature=None, clock=time.time):
+        self.transport = transport
+        self.leader = leader
+        self.clock = clock
+        self.node_id = f"{socket.gethostname()}-{os.getpid()}-{id(self):x}"
+        self.signature = signature
+        self.epoch = epoch if epoch is not None else (clock() if leader else None)
+        self.offset = 0.0
+        self.best_rtt = None
+        self.warning = None  # Deck mismatch with the current leader, for the status line
+        self._warned = set()
+        self._samples = []
+        self._pings_sent = 0
+        self._running = False
+        self._thread = None
+        self._lock = threading.Lock()
+        self.epoch_event = threading.Event()
+        if self.epoch is not None:
+            self.epoch_event.set()
+
+    def now(self):
+        """Current time on the leader's clock"""
+        return self.clock() + self.offset
+
+    @property
+    def synchronized(self):
+        return self.epoch is not None and (self.leader or self.best_rtt is not None)
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='sync-node', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+        self.transport.close()
+
+    def _send(self, message):
+        message['from'] = self.node_id
+        try:
+            self.transport.send(json.dumps(message).encode('utf-8'))
+        except OSError as e:
+            print(f"Sync send failed: {e}")
+
+    def _run(self):
+        next_send = 0.0
+        while self._running:
+            now = time.monotonic()
+            if now >= next_send:
+                if self.leader:
+                    self._send({'type': 'epoch', 'epoch': self.epoch, 'deck': self.signature})
+                    next_send = now + ANNOUNCE_INTERVAL
+                else:
+                    self._send({'type': 'ping', 't0': self.clock()})
+                    self._pings_sent += 1
+                    fast = self._pings_sent < INITIAL_PING_COUNT
+                    next_send = now + (INITIAL_PING_INTERVAL if fast else PING_INTERVAL)
+
+            data = self.transport.recv(timeout=max(0.01, next_send - time.monotonic()))
+            if data is None:
+                continue
+            received = self.clock()
+            try:
+                message = json.loads(data.decode('utf-8'))
+            except ValueError:
+                continue
+            if message.get('from') == self.node_id:
+                continue
+            self._handle(message, received)
+
+    def _handle(self, message, received):
+        kind = message.get('type')
+        if self.leader:
+            if kind == 'ping':
+                self._send({'type': 'pong', 'to': message.get('from'), 't0': message.get('t0'),
+                            't1': received, 't2': self.clock()})
+            return
+
+        if kind == 'pong' and message.get('to') == self.node_id:
+            self._add_sample(message['t0'], message['t1'], message['t2'], received)
+        elif kind == 'epoch':
+            deck = message.get('deck')
+            if self.signature and deck and deck != self.signature:
+                # Leaders announce every second; print once per leader and deck
+                if (message.get('from'), deck) not in self._warned:
+                    self._warned.add((message.get('from'), deck))
+                    print(f"Sync warning: leader deck {deck} differs from ours {self.signature}")
+                self.warning = f"leader deck {deck} differs from ours {self.signature}"
+            else:
+                self.warning = None
+            if self.epoch != message.get('epoch'):
+                self.epoch = message.get('epoch')
+                self.epoch_event.set()
+
+    def _add_sample(self, t0, t1, t2, t3):
+        """Record one ping exchange; keep the offset from the fastest recent round trip"""
+        rtt = (t3 - t0) - (t2 - t1)
+        offset = ((t1 - t0) + (t2 - t3)) / 2
+        with self._lock:
+            self._samples.append((rtt, offset))
+            del self._samples[:-SAMPLE_WINDOW]
+            best_rtt, best_offset = min(self._samples)
+            self.best_rtt = best_rtt
+            self.offset = best_offset
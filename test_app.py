@@ -84,22 +84,1861 @@ def test_image_extensions():
     print(f"Image extension test: {passed}/{total} passed")
     return passed == total
 
+def test_playlist_manifest():
+    """Test JSON and CSV playlist manifest parsing."""
+    print("\nTesting playlist manifests...")
+    
+    import json
+    import tempfile
+    sys.path.append('.')
+    from playlist import iter_manifest
+    
+    passed = 0
+    total = 0
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "deck.json")
+        with open(json_path, "w") as f:
+            json.dump({"name": "Lobby [A]", "options": {"loop": True, "n": 12},
+                       "entries": [{"path": "intro/a.jpg", "duration": 8, "transition": "Fade"},
+                                   "b.png",
+                                   {"path": "/abs/c.jpg", "duration": 2.5}]}, f)
+        
+        csv_path = os.path.join(tmp, "deck.csv")
+        with open(csv_path, "w") as f:
+            f.write("path,duration,transition\nintro/a.jpg,8,Fade\n# comment\nb.png,,\n")
+        
+        # Large manifest spanning many read chunks
+        big_path = os.path.join(tmp, "big.json")
+        with open(big_path, "w") as f:
+            json.dump([{"path": f"img{i}.jpg", "duration": i % 7 + 1} for i in range(20000)], f)
+        
+        json_entries = list(iter_manifest(json_path))
+        csv_entries = list(iter_manifest(csv_path))
+        big_entries = iter_manifest(big_path)
+        first_big = next(big_entries)
+        big_count = 1 + sum(1 for _ in big_entries)
+        
+        checks = [
+            ("JSON entry count", len(json_entries) == 3),
+            ("JSON relative path", json_entries[0].path == os.path.join(tmp, "intro", "a.jpg")),
+            ("JSON duration/transition", (json_entries[0].duration, json_entries[0].transition) == (8, "Fade")),
+            ("JSON plain string entry", json_entries[1].filename == "b.png" and json_entries[1].duration is None),
+            ("JSON fractional duration", json_entries[2].duration == 2.5),
+            ("CSV entries", [(e.filename, e.duration) for e in csv_entries] == [("a.jpg", 8), ("b.png", None)]),
+            ("Streamed first entry", first_big.filename == "img0.jpg" and first_big.duration == 1),
+            ("Streamed entry count", big_count == 20000),
+        ]
+    
+    for name, ok in checks:
+        total += 1
+        print(f"{'✓' if ok else '✗'} {name}")
+        if ok:
+            passed += 1
+    
+    print(f"Playlist manifest test: {passed}/{total} passed")
+    return passed == total
+
+def test_filename_rules():
+    """Test the filename rule engine (durations, bounds, skips, ordering)."""
+    print("\nTesting filename rules...")
+    
+    sys.path.append('.')
+    from filename_rules import FilenameRules
+    from playlist import PlaylistEntry
+    
+    rules = FilenameRules()
+    
+    test_cases = [
+        ("slide-20.tiff", 20),
+        ("intro-2024.jpg", None),   # Out of bounds, not a duration
+        ("clip-2m.jpg", 120),
+        ("flash-1500ms.png", 1.5),
+        ("wait-10s.jpg", 10),
+        ("image.jpg", None),
+    ]
+    
+    passed = 0
+    total = len(test_cases) + 2
+    
+    for filename, expected in test_cases:
+        result = rules.duration_for(filename)
+        if result == expected:
+            print(f"✓ {filename} -> {result}")
+            passed += 1
+        else:
+            print(f"✗ {filename} -> {result} (expected {expected})")
+    
+    names = ["img10.jpg", "img2-3.jpg", "._img1.jpg", "draft-skip.png", "img1.jpg"]
+    entries, skipped = rules.apply([PlaylistEntry(n, n) for n in names])
+    order = [e.filename for e in entries]
+    if order == ["img1.jpg", "img2-3.jpg", "img10.jpg"] and skipped == 2:
+        print(f"✓ batch order {order}, {skipped} skipped")
+        passed += 1
+    else:
+        print(f"✗ batch order {order}, {skipped} skipped")
+    
+    if entries[1].duration == 3 and entries[0].duration is None and entries[0].sort_key is not None:
+        print("✓ durations and sort keys stored on entries")
+        passed += 1
+    else:
+        print("✗ durations and sort keys not stored on entries")
+    
+    # Fractional durations reach the countdown unrounded (1500ms is not shown for 2 s)
+    import threading
+    import time
+    from types import SimpleNamespace
+    from power_profile import NORMAL
+    from quick_image_presenter import QuickImagePresenter
+    presenter = SimpleNamespace(power_profile=NORMAL, stop_timer=False, presentation_window=None,
+                                timer_label=None, presentation_running=False, note_wakeup=lambda source: None)
+    display_time = QuickImagePresenter.get_display_time(
+        presenter, PlaylistEntry("flash-1500ms.png", "flash-1500ms.png", rules.duration_for("flash-1500ms.png")))
+    start = time.perf_counter()
+    QuickImagePresenter.countdown_timer(presenter, 0.35, threading.Event())
+    elapsed = time.perf_counter() - start
+    total += 1
+    if display_time == 1.5 and 0.3 <= elapsed < 0.6:
+        print(f"✓ fractional display time kept ({display_time} s, 0.35 s countdown took {elapsed:.2f} s)")
+        passed += 1
+    else:
+        print(f"✗ fractional display time -> {display_time} s, 0.35 s countdown took {elapsed:.2f} s")
+    
+    print(f"Filename rules test: {passed}/{total} passed")
+    return passed == total
+
+def test_sync_playback():
+    """Test shared-epoch scheduling and clock offset exchange over the loopback bus."""
+    print("\nTesting synchronized playback...")
+    
+    import time
+    sys.path.append('.')
+    from sync_playback import LoopbackBus, SyncNode, SyncSchedule
+    
+    passed = 0
+    total = 0
+    
+    schedule = SyncSchedule([5, 10, 3], epoch=1000.0)
+    positions = [
+        (1000.0, (0, 1005.0)),
+        (1007.5, (1, 1015.0)),
+        (1017.9, (2, 1018.0)),
+        (1018.0, (0, 1023.0)),   # Loops back to the first slide
+        (1036.0, (0, 1041.0)),
+    ]
+    for now, expected in positions:
+        total += 1
+        index, deadline, _ = schedule.position(now)
+        if (index, deadline) == expected:
+            print(f"✓ t={now} -> slide {index}, deadline {deadline}")
+            passed += 1
+        else:
+            print(f"✗ t={now} -> slide {index}, deadline {deadline} (expected {expected})")
+    
+    # A follower whose clock runs 5 s ahead should converge on the leader's time
+    bus = LoopbackBus()
+    leader = SyncNode(bus.transport(), leader=True, epoch=1000.0)
+    follower = SyncNode(bus.transport(), clock=lambda: time.time() + 5.0)
+    leader.start()
+    follower.start()
+    try:
+        deadline = time.monotonic() + 3.0
+        while not follower.synchronized and time.monotonic() < deadline:
+            time.sleep(0.02)
+        time.sleep(0.3)
+        error = abs(follower.now() - leader.now())
+    finally:
+        follower.stop()
+        leader.stop()
+    
+    total += 2
+    if follower.epoch == 1000.0:
+        print("✓ follower adopted the leader's epoch")
+        passed += 1
+    else:
+        print(f"✗ follower epoch {follower.epoch}")
+    if error < 0.005:
+        print(f"✓ clock offset error {error * 1000:.2f} ms")
+        passed += 1
+    else:
+        print(f"✗ clock offset error {error * 1000:.2f} ms")
+    
+    # A mismatched deck is reported once per leader and deck, and kept for the status line
+    import contextlib
+    import io
+    node = SyncNode(bus.transport(), signature='ours')
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        for deck in ['theirs', 'theirs', 'theirs', 'other']:
+            node._handle({'type': 'epoch', 'epoch': 1.0, 'deck': deck, 'from': 'leader'}, 0.0)
+    warned = node.warning
+    node._handle({'type': 'epoch', 'epoch': 1.0, 'deck': 'ours', 'from': 'leader'}, 0.0)
+    total += 1
+    if output.getvalue().count("Sync warning") == 2 and 'other' in warned and node.warning is None:
+        print("✓ deck mismatch warned once per leader deck")
+        passed += 1
+    else:
+        print(f"✗ deck mismatch output {output.getvalue()!r}, warning {warned!r} then {node.warning!r}")
+    
+    print(f"Synchronized playback test: {passed}/{total} passed")
+    return passed == total
+
+def test_remote_control():
+    """Test the HTTP and WebSocket remote control endpoints."""
+    print("\nTesting remote control server...")
+    
+    import base64
+    import http.client
+    import json
+    import socket
+    import struct
+    import threading
+    import time
+    sys.path.append('.')
+    from remote_control import RemoteControlServer
+    
+    woken = threading.Event()
+    server = RemoteControlServer(wake=woken.set, port=0)
+    server.start()
+    host, port = server.address
+    server.publish({'index': 3, 'total': 10})
+    
+    passed = 0
+    total = 8
+    try:
+        conn = http.client.HTTPConnection(host, port, timeout=5)
+        conn.request("GET", "/status")
+        status = json.loads(conn.getresponse().read())
+        if status == {'index': 3, 'total': 10}:
+            print("✓ GET /status")
+            passed += 1
+        else:
+            print(f"✗ GET /status -> {status}")
+        
+        start = time.perf_counter()
+        conn.request("POST", "/jump?index=7")
+        response = conn.getresponse()
+        response.read()
+        woken.wait(1.0)
+        commands = list(server.pending_commands())
+        latency = (time.perf_counter() - start) * 1000
+        if response.status == 202 and [(c.name, c.index) for c in commands] == [("jump", 7)]:
+            print(f"✓ POST /jump queued in {latency:.1f} ms")
+            passed += 1
+        else:
+            print(f"✗ POST /jump -> {response.status} {commands}")
+        
+        conn.request("POST", "/explode")
+        response = conn.getresponse()
+        response.read()
+        if response.status == 400:
+            print("✓ unknown command rejected")
+            passed += 1
+        else:
+            print(f"✗ unknown command -> {response.status}")
+        
+        rejected = []
+        for body in ['[1, 2]', '"next"', '3', '{']:
+            conn.request("POST", "/jump", body=body, headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            rejected.append(response.status)
+        if rejected == [400] * 4:
+            print("✓ bodies that are not JSON objects rejected")
+            passed += 1
+        else:
+            print(f"✗ non-object JSON bodies -> {rejected}")
+        conn.close()
+        
+        # WebSocket: handshake, initial status, masked command frame, pushed update
+        sock = socket.create_connection((host, port), timeout=5)
+        key = base64.b64encode(os.urandom(16)).decode()
+        sock.sendall((f"GET /ws HTTP/1.1\r\nHost: {host}\r\nUpgrade: websocket\r\n"
+                      f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                      "Sec-WebSocket-Version: 13\r\n\r\n").encode())
+        stream = sock.makefile('rb')
+        handshake_ok = stream.readline().startswith(b"HTTP/1.1 101")
+        while stream.readline() not in (b"\r\n", b""):
+            pass
+        
+        def read_message():
+            head = stream.read(2)
+            return json.loads(stream.read(head[1] & 0x7F))
+        
+        initial = read_message()
+        payload = json.dumps({"cmd": "next"}).encode()
+        mask = os.urandom(4)
+        sock.sendall(struct.pack('>BB', 0x81, 0x80 | len(payload)) + mask +
+                     bytes(b ^ mask[i % 4] for i, b in enumerate(payload)))
+        woken.clear()
+        woken.wait(1.0)
+        commands = list(server.pending_commands())
+        if handshake_ok and initial.get('index') == 3 and [c.name for c in commands] == ["next"]:
+            print("✓ WebSocket command received")
+            passed += 1
+        else:
+            print(f"✗ WebSocket command -> {initial} {commands}")
+        
+        server.publish({'index': 4, 'total': 10})
+        pushed = read_message()
+        if pushed.get('type') == 'status' and pushed.get('index') == 4:
+            print("✓ WebSocket status pushed")
+            passed += 1
+        else:
+            print(f"✗ WebSocket push -> {pushed}")
+        stream.close()
+        sock.close()
+        
+        def upgrade(origin=None):
+            client = socket.create_connection((host, port), timeout=5)
+            client.sendall((f"GET /ws HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\n"
+                            f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                            + (f"Origin: {origin}\r\n" if origin else "") +
+                            "Sec-WebSocket-Version: 13\r\n\r\n").encode())
+            with client.makefile('rb') as response:
+                return client, response.readline()
+        
+        foreign, status_line = upgrade("http://evil.example")
+        foreign.close()
+        local, local_line = upgrade(f"http://{host}:{port}")
+        local.close()
+        if status_line.startswith(b"HTTP/1.1 403") and local_line.startswith(b"HTTP/1.1 101"):
+            print("✓ Cross-origin WebSocket rejected, same-origin accepted")
+            passed += 1
+        else:
+            print(f"✗ Origin check -> {status_line!r} {local_line!r}")
+        
+        # A client that never reads must not block publishing; it is dropped once its queue fills
+        stalled, _ = upgrade()
+        time.sleep(0.1)
+        start = time.perf_counter()
+        for i in range(64):
+            server.publish({'index': i, 'padding': 'x' * 256 * 1024})
+        elapsed = (time.perf_counter() - start) * 1000
+        deadline = time.monotonic() + 2
+        while server._clients and time.monotonic() < deadline:
+            time.sleep(0.01)
+        if elapsed < 500 and not server._clients:
+            print(f"✓ Stalled client dropped without blocking publish ({elapsed:.0f} ms for 64 updates)")
+            passed += 1
+        else:
+            print(f"✗ Stalled client -> {elapsed:.0f} ms, {len(server._clients)} clients left")
+        stalled.close()
+    finally:
+        server.stop()
+    
+    print(f"Remote control test: {passed}/{total} passed")
+    return passed == total
+
+def test_sleep_inhibitor():
+    """Test that sleep inhibition runs in the background and restores settings."""
+    print("\nTesting sleep inhibitor...")
+    
+    import time
+    sys.path.append('.')
+    from sleep_inhibitor import InhibitorBackend, SleepInhibitor, SystemdInhibitBackend, XsetBackend
+    
+    events = []
+    
+    class SlowBackend(InhibitorBackend):
+        name = 'slow'
+        def acquire(self):
+            time.sleep(0.3)  # A helper that hangs for a while
+            events.append('acquire')
+            return True
+        def release(self):
+            events.append('release')
+    
+    class BrokenBackend(InhibitorBackend):
+        name = 'broken'
+        def acquire(self):
+            raise OSError("tool missing")
+        def release(self):
+            events.append('broken-release')
+    
+    inhibitor = SleepInhibitor(backends=[SlowBackend, BrokenBackend])
+    
+    passed = 0
+    total = 5
+    
+    start = time.perf_counter()
+    inhibitor.inhibit()
+    inhibitor.release()
+    elapsed = (time.perf_counter() - start) * 1000
+    if elapsed < 50:
+        print(f"✓ inhibit/release returned in {elapsed:.1f} ms")
+        passed += 1
+    else:
+        print(f"✗ inhibit/release blocked for {elapsed:.1f} ms")
+    
+    inhibitor.wait()
+    if events == ['acquire', 'release'] and inhibitor.active == []:
+        print(f"✓ acquired and released in order {events}")
+        passed += 1
+    else:
+        print(f"✗ unexpected sequence {events}, active {inhibitor.active}")
+    
+    inhibitor.inhibit()
+    inhibitor.inhibit()  # Repeated requests hold a single inhibitor
+    inhibitor.wait()
+    if events.count('acquire') == 2 and inhibitor.active == ['slow']:
+        print("✓ one long-lived inhibitor held")
+        passed += 1
+    else:
+        print(f"✗ inhibitor state {events}, active {inhibitor.active}")
+    inhibitor.shutdown()
+    
+    output = ("Screen Saver:\n  prefer blanking:  no    allow exposures:  yes\n"
+              "  timeout:  300    cycle:  600\nDPMS (Energy Star):\n  DPMS is Enabled\n")
+    if XsetBackend.read_settings(output) == ((300, 600), False, True) and events[-1] == 'release':
+        print("✓ original xset settings parsed and restored at shutdown")
+        passed += 1
+    else:
+        print(f"✗ xset settings {XsetBackend.read_settings(output)}, events {events}")
+    
+    # The systemd-inhibit lock is held by a child that exits with the app
+    command = SystemdInhibitBackend().build_command()
+    if command[-4:] == ['tail', f'--pid={os.getpid()}', '-f', '/dev/null']:
+        print("✓ systemd-inhibit lock tied to the app's PID")
+        passed += 1
+    else:
+        print(f"✗ systemd-inhibit command {command}")
+    
+    print(f"Sleep inhibitor test: {passed}/{total} passed")
+    return passed == total
+
+def test_color_management():
+    """Test that ICC transforms are applied to tagged images and cached."""
+    print("\nTesting colour management...")
+    
+    import tempfile
+    sys.path.append('.')
+    from PIL import Image, ImageCms
+    from color_management import ColorManager
+    from image_pipeline import load_fitted_image
+    
+    manager = ColorManager(display_profile=ImageCms.createProfile('sRGB'))
+    icc = ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB')).tobytes()
+    
+    passed = 0
+    total = 3
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(3):
+            path = os.path.join(tmp, f"tagged{i}.png")
+            Image.new('RGB', (400, 300), (200, 40 * i, 10)).save(path, icc_profile=icc)
+            paths.append(path)
+        frames = [load_fitted_image(p, (200, 200), color_manager=manager) for p in paths]
+    
+    if all(f.size == (200, 150) and f.mode == 'RGB' for f in frames):
+        print("✓ tagged images converted after downscale")
+        passed += 1
+    else:
+        print(f"✗ unexpected frames {[(f.size, f.mode) for f in frames]}")
+    
+    if manager.transform_count == 1:
+        print("✓ one transform built for three images sharing a profile")
+        passed += 1
+    else:
+        print(f"✗ {manager.transform_count} transforms built")
+    
+    untagged = Image.new('RGB', (10, 10))
+    if manager.convert(untagged, None) is untagged:
+        print("✓ untagged images left alone")
+        passed += 1
+    else:
+        print("✗ untagged image was converted")
+    
+    print(f"Colour management test: {passed}/{total} passed")
+    return passed == total
+
+def test_pixel_modes():
+    """Test normalization of CMYK, 16-bit, palette and alpha images to display RGB."""
+    print("\nTesting pixel mode normalization...")
+    
+    sys.path.append('.')
+    from PIL import Image
+    from image_pipeline import prepare_for_resize, to_display_rgb
+    
+    background = (10, 20, 30)
+    
+    gray16 = Image.new('I;16', (4, 4), 65535)
+    palette = Image.new('P', (4, 4), 1)
+    palette.putpalette([255, 0, 0, 0, 255, 0] + [0] * 762)
+    palette.info['transparency'] = 1
+    transparent_la = Image.new('LA', (4, 4), (200, 0))
+    
+    test_cases = [
+        ("CMYK", Image.new('CMYK', (4, 4), (0, 255, 255, 0)), (255, 0, 0)),
+        ("I;16 white", gray16, (255, 255, 255)),
+        ("I;16 mid-grey", Image.new('I;16', (4, 4), 32768), (128, 128, 128)),
+        ("P + transparency", palette, background),
+        ("LA transparent", transparent_la, background),
+        ("RGBA opaque", Image.new('RGBA', (4, 4), (1, 2, 3, 255)), (1, 2, 3)),
+        ("L", Image.new('L', (4, 4), 77), (77, 77, 77)),
+        ("1", Image.new('1', (4, 4), 1), (255, 255, 255)),
+    ]
+    
+    passed = 0
+    total = len(test_cases)
+    
+    for name, image, expected in test_cases:
+        result = to_display_rgb(prepare_for_resize(image, background), background)
+        pixel = result.getpixel((0, 0))
+        if result.mode == 'RGB' and pixel == expected:
+            print(f"✓ {name} -> {pixel}")
+            passed += 1
+        else:
+            print(f"✗ {name} -> {result.mode} {pixel} (expected {expected})")
+    
+    print(f"Pixel mode test: {passed}/{total} passed")
+    return passed == total
+
+def test_ken_burns():
+    """Test Ken Burns crop boxes, wall-clock progress and frame pacing."""
+    print("\nTesting Ken Burns motion...")
+    
+    sys.path.append('.')
+    from PIL import Image
+    from ken_burns import KenBurnsAnimator, KenBurnsMotion, FramePacer, MOTIONS
+    
+    buffer_size = (1200, 600)
+    frame_size = (1000, 500)
+    
+    def inside(box):
+        left, top, right, bottom = box
+        return left >= 0 and top >= 0 and right <= buffer_size[0] + 1e-6 and bottom <= buffer_size[1] + 1e-6
+    
+    def aspect_kept(box):
+        return abs((box[2] - box[0]) / (box[3] - box[1]) - 2.0) < 1e-6
+    
+    boxes = [KenBurnsMotion(buffer_size, i).box_at(p / 10) for i in range(len(MOTIONS)) for p in range(11)]
+    
+    now = [0.0]
+    animator = KenBurnsAnimator(Image.new('RGB', buffer_size), frame_size, 10, clock=lambda: now[0])
+    now[0] = 4.0
+    animator.pause()
+    now[0] = 9.0
+    animator.resume()
+    now[0] = 10.0
+    halfway = animator.progress
+    frame = animator.render()
+    now[0] = 20.0
+    
+    slow = FramePacer(target_fps=30, min_fps=4, cpu_budget=0.5)
+    slow.record(0.1)
+    fast = FramePacer(target_fps=30, min_fps=4, cpu_budget=0.5)
+    fast.record(0.001)
+    
+    test_cases = [
+        ("Crop boxes stay inside the buffer", all(inside(box) for box in boxes)),
+        ("Crop boxes keep the aspect ratio", all(aspect_kept(box) for box in boxes)),
+        ("Progress skips paused time", abs(halfway - 0.5) < 1e-9),
+        ("Frames have the display size", frame.size == frame_size),
+        ("Slide ends on time", animator.finished),
+        ("Slow renders lower the frame rate", abs(slow.next_interval() - 0.2) < 1e-9),
+        ("Fast renders stay at the target rate", abs(fast.next_interval() - 1 / 30) < 1e-9),
+    ]
+    
+    passed = 0
+    total = len(test_cases)
+    
+    for name, ok in test_cases:
+        if ok:
+            print(f"✓ {name}")
+            passed += 1
+        else:
+            print(f"✗ {name}")
+    
+    print(f"Ken Burns test: {passed}/{total} passed")
+    return passed == total
+
+def test_transitions():
+    """Test transition effects and the frame-paced compositor."""
+    print("\nTesting transitions...")
+    
+    sys.path.append('.')
+    from PIL import Image
+    from transitions import EFFECTS, TransitionCompositor, get_effect, letterbox
+    
+    size = (64, 32)
+    old = letterbox(Image.new('RGB', (32, 32), (255, 0, 0)), size)
+    new = Image.new('RGB', size, (0, 0, 255))
+    
+    def run(render_cost):
+        """Run a 0.6 s transition on a fake clock where each frame costs render_cost"""
+        now = [0.0]
+        scheduled = []
+        shown = []
+        
+        class FakeWidget:
+            def after(self, ms, callback):
+                scheduled.append((ms, callback))
+                return len(scheduled)
+            
+            def after_cancel(self, job):
+                pass
+        
+        def show(frame):
+            now[0] += render_cost
+            shown.append(frame)
+        
+        done = []
+        compositor = TransitionCompositor(FakeWidget(), 'dissolve', old, new, show, lambda: done.append(now[0]),
+                                          duration=0.6, clock=lambda: now[0])
+        compositor.start()
+        while scheduled and not done:
+            ms, callback = scheduled.pop(0)
+            now[0] += ms / 1000
+            callback()
+        return len(shown), done
+    
+    fast_frames, fast_done = run(0.002)
+    slow_frames, slow_done = run(0.1)
+    
+    test_cases = [
+        ("All effects produce display-sized frames",
+         all(effect(old, new, t).size == size for effect in EFFECTS.values() for t in (0.0, 0.3, 0.7, 1.0))),
+        ("Dissolve starts on the old slide", EFFECTS['dissolve'](old, new, 0.0).getpixel((0, 0)) == (0, 0, 0)),
+        ("Slide left ends on the new slide", EFFECTS['slide left'](old, new, 1.0).getpixel((0, 0)) == (0, 0, 255)),
+        ("Names are case-insensitive", get_effect(" Zoom In ") is EFFECTS['zoom in'] and get_effect("spin") is None),
+        ("Fast renders finish on time", fast_done and abs(fast_done[0] - 0.6) < 0.05),
+        ("Slow renders finish on time", slow_done and abs(slow_done[0] - 0.6) < 0.2),
+        ("Slow renders draw fewer frames", slow_frames < fast_frames),
+    ]
+    
+    passed = 0
+    total = len(test_cases)
+    
+    for name, ok in test_cases:
+        if ok:
+            print(f"✓ {name}")
+            passed += 1
+        else:
+            print(f"✗ {name}")
+    
+    print(f"Transitions: {fast_frames} frames when fast, {slow_frames} when slow")
+    print(f"Transition test: {passed}/{total} passed")
+    return passed == total
+
+def test_contact_sheet():
+    """Test contact-sheet layout and sheet compositing."""
+    print("\nTesting contact sheet...")
+    
+    sys.path.append('.')
+    from PIL import Image
+    from contact_sheet import SheetLayout, render_sheet, CELL_SIZE
+    
+    layout = SheetLayout(count=1000, columns=7, rows_per_sheet=6)
+    cell_width, cell_height = CELL_SIZE
+    
+    def canvas_position(index):
+        x, y = layout.cell_origin(index)
+        return x + 5, y + layout.sheet_top(layout.sheet_of(index)) + 5
+    
+    def fake_load(path):
+        if path == 'broken':
+            raise OSError("cannot identify image file")
+        return Image.new('RGB', (100, 60), (255, 0, 0))
+    
+    small = SheetLayout(count=10, columns=4, rows_per_sheet=2)
+    paths = ['a'] * 9 + ['broken']
+    first = render_sheet(small, 0, paths, fake_load)
+    last = render_sheet(small, 1, paths, fake_load)
+    
+    test_cases = [
+        ("Sheet count", layout.sheet_count == 24),
+        ("Last sheet is partial", layout.sheet_size(23) == (7 * cell_width, 5 * cell_height)),
+        ("Clicks map back to slides", all(layout.index_at(*canvas_position(i)) == i for i in (0, 6, 7, 41, 42, 999))),
+        ("Clicks past the end are ignored", layout.index_at(5, layout.total_size[1] + 5) is None
+         and layout.index_at(7 * cell_width + 1, 5) is None),
+        ("Visible sheets", list(layout.sheets_between(layout.sheet_height - 1, layout.sheet_height * 2 + 1)) == [0, 1, 2]),
+        ("Sheets are single composited images", first.size == (4 * cell_width, 2 * cell_height)
+         and last.size == (4 * cell_width, cell_height)),
+        ("Thumbnails are pasted", first.getpixel((cell_width // 2, 4 + CELL_SIZE[1] // 3)) == (255, 0, 0)),
+        ("Broken files do not stop the sheet", last.getpixel((cell_width + cell_width // 2, 30)) != (255, 0, 0)),
+    ]
+    
+    passed = 0
+    total = len(test_cases)
+    
+    for name, ok in test_cases:
+        if ok:
+            print(f"✓ {name}")
+            passed += 1
+        else:
+            print(f"✗ {name}")
+    
+    print(f"Contact sheet test: {passed}/{total} passed")
+    return passed == total
+
+def test_slide_search():
+    """Test the sorted filename index and prefetch completion callbacks."""
+    print("\nTesting slide search...")
+    
+    sys.path.append('.')
+    import tempfile
+    import threading
+    from PIL import Image
+    from playlist import PlaylistEntry
+    from slide_index import SlideIndex
+    from image_pipeline import Prefetcher
+    
+    names = ["Beach-5.jpg", "beach2.png", "city.jpg", "Bear.jpg", "zoo.jpg", "be.jpg"]
+    index = SlideIndex([PlaylistEntry(name, name) for name in names])
+    big = SlideIndex([PlaylistEntry(f"img{i:05d}.jpg", f"img{i:05d}.jpg") for i in range(20000)])
+    
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "slide.png")
+        Image.new('RGB', (40, 20), (0, 128, 255)).save(path)
+        prefetcher = Prefetcher()
+        ready = threading.Event()
+        prefetcher.prefetch(path, (20, 20), on_ready=ready.set)
+        decoded = ready.wait(5) and (path, (20, 20)) in prefetcher.cache
+        cached_now = []
+        prefetcher.prefetch(path, (20, 20), on_ready=lambda: cached_now.append(True))
+        prefetcher.shutdown()
+    
+    test_cases = [
+        ("Prefix matches in filename order", index.search("be") == [5, 0, 1, 3]),
+        ("Search is case-insensitive", index.search("BEACH") == [0, 1]),
+        ("No match", index.search("x") == []),
+        ("Empty prefix matches everything", len(index.search("")) == len(names)),
+        ("Limit", big.search("img1", limit=5) == [10000, 10001, 10002, 10003, 10004]),
+        ("Large index", len(big.search("img19")) == 1000),
+        ("on_ready after background decode", decoded),
+        ("on_ready at once when cached", cached_now == [True]),
+    ]
+    
+    passed = 0
+    total = len(test_cases)
+    
+    for name, ok in test_cases:
+        if ok:
+            print(f"✓ {name}")
+            passed += 1
+        else:
+            print(f"✗ {name}")
+    
+    print(f"Slide search test: {passed}/{total} passed")
+    return passed == total
+
+def test_duplicates():
+    """Test perceptual hashing, the BK-tree and the persistent hash cache."""
+    print("\nTesting duplicate detection...")
+    
+    sys.path.append('.')
+    import tempfile
+    from PIL import Image
+    from playlist import PlaylistEntry
+    from metadata_cache import MetadataCache
+    from duplicates import HashIndex, compute_hashes, find_duplicates, hamming
+    
+    index = HashIndex(radius=6)
+    stored = [0, 0b111_1111, 0xFFFF_0000_0000_0000, 0x0101_0101_0101_0101, 0x8000_0000_0000_003F]
+    for value in stored:
+        index.add(value, value)
+    query = 0x8000_0000_0000_0003
+    near = sorted(item for _, item in index.search(query))
+    brute_force = sorted(value for value in stored if hamming(value, query) <= 6)
+    
+    with tempfile.TemporaryDirectory() as folder:
+        ramp = Image.linear_gradient('L').transpose(Image.Transpose.ROTATE_90).resize((800, 600))
+        photo = Image.merge('RGB', [ramp, Image.radial_gradient('L').resize((800, 600)), ramp])
+        photo.save(os.path.join(folder, "a.jpg"), quality=90)
+        photo.resize((400, 300)).save(os.path.join(folder, "b_export.png"))
+        photo.transpose(Image.Transpose.ROTATE_180).save(os.path.join(folder, "c.jpg"))
+        entries = [PlaylistEntry(name, os.path.join(folder, name)) for name in ("a.jpg", "b_export.png", "c.jpg")]
+        paths = [entry.path for entry in entries]
+        
+        cache_path = os.path.join(folder, "cache", "metadata.json")
+        cache = MetadataCache(cache_path)
+        first_progress = []
+        hashes = compute_hashes(paths, cache, progress=lambda done, total: first_progress.append(total))
+        cache.save()
+        
+        rescan_progress = []
+        rehashed = compute_hashes(paths, MetadataCache(cache_path),
+                                  progress=lambda done, total: rescan_progress.append(total))
+        duplicates = [(d.filename, o.filename) for d, o in find_duplicates(entries, hashes)]
+        
+        os.utime(paths[2], ns=(1, 1))
+        changed_progress = []
+        compute_hashes(paths, MetadataCache(cache_path), progress=lambda done, total: changed_progress.append(total))
+    
+    test_cases = [
+        ("Hamming distance", hamming(0b1010, 0b0110) == 2),
+        ("Hash index finds near hashes only", near == brute_force and len(near) == 3),
+        ("Re-export detected as duplicate", duplicates == [("b_export.png", "a.jpg")]),
+        ("Different image kept", hamming(hashes[paths[0]], hashes[paths[2]]) > 6),
+        ("Hashes persisted", rehashed == hashes and rescan_progress == [0]),
+        ("Changed files are rehashed", changed_progress[0] == 1 and first_progress[0] == 3),
+    ]
+    
+    passed = 0
+    total = len(test_cases)
+    
+    for name, ok in test_cases:
+        if ok:
+            print(f"✓ {name}")
+            passed += 1
+        else:
+            print(f"✗ {name}")
+    
+    print(f"Duplicate detection test: {passed}/{total} passed")
+    return passed == total
+
+def test_decode_scheduler():
+    """Test decode priorities, retargeting and inline decodes of queued jobs."""
+    print("\nTesting decode scheduler...")
+    
+    sys.path.append('.')
+    import threading
+    from image_pipeline import (Prefetcher, PRIORITY_CURRENT, PRIORITY_NEXT,
+                                PRIORITY_PREVIOUS, PRIORITY_FURTHER)
+    
+    class RecordingPrefetcher(Prefetcher):
+        """Records decode order; the first decode blocks until released"""
+        def __init__(self):
+            super().__init__(workers=1)
+            self.order = []
+            self.started = threading.Event()
+            self.release = threading.Event()
+        
+        def _load(self, path, size):
+            if path == 'busy':
+                self.started.set()
+                self.release.wait(5)
+            self.order.append(path)
+            return path
+    
+    prefetcher = RecordingPrefetcher()
+    prefetcher.prefetch('busy', (1, 1), priority=PRIORITY_CURRENT)
+    for path, priority in [('far', PRIORITY_FURTHER), ('previous', PRIORITY_PREVIOUS),
+                           ('next', PRIORITY_NEXT), ('current', PRIORITY_CURRENT)]:
+        prefetcher.prefetch(path, (1, 1), priority=priority)
+    prefetcher.release.set()
+    done = threading.Event()
+    prefetcher.prefetch('last', (1, 1), on_ready=done.set, priority=PRIORITY_FURTHER + 5)
+    done.wait(5)
+    priority_order = prefetcher.order == ['busy', 'current', 'next', 'previous', 'far', 'last']
+    prefetcher.shutdown()
+    
+    prefetcher = RecordingPrefetcher()
+    prefetcher.prefetch('busy', (1, 1))
+    prefetcher.started.wait(5)
+    skipped = []
+    for path in ['a', 'b', 'c', 'd']:
+        prefetcher.prefetch(path, (1, 1), on_ready=lambda path=path: skipped.append(path))
+    prefetcher.retarget({('d', (1, 1)): PRIORITY_CURRENT, ('e', (1, 1)): PRIORITY_NEXT})
+    cancelled = prefetcher.stats()['cancelled']
+    stolen = prefetcher.get_frame('e', (1, 1))
+    prefetcher.release.set()
+    done = threading.Event()
+    prefetcher.prefetch('d', (1, 1), on_ready=done.set)
+    done.wait(5)
+    retargeted = prefetcher.order
+    prefetcher.shutdown()
+    
+    # A key burst that comes back to the slide on screen repaints nothing but restarts its timer
+    from types import SimpleNamespace
+    from quick_image_presenter import QuickImagePresenter
+    events = []
+    presenter = SimpleNamespace(
+        presentation_running=True, navigation_job=None, current_image_index=0, displayed_index=0,
+        current_display_time=5, images=['a', 'b', 'c'], low_res_index=None,
+        presentation_window=SimpleNamespace(after=lambda ms, callback: 'job', after_cancel=lambda job: None),
+        counter_label=SimpleNamespace(config=lambda **kwargs: None),
+        schedule_decodes=lambda index: None, cancel_timer=lambda: events.append('cancel'),
+        start_timer=lambda duration: events.append(('start', duration)))
+    presenter.show_next_image = lambda jump=False: (events.append(('show', presenter.current_image_index)),
+                                                    setattr(presenter, 'displayed_index', presenter.current_image_index))
+    presenter.finish_navigation = lambda: QuickImagePresenter.finish_navigation(presenter)
+    for index in [1, 2, 1]:  # Right, Right, Left
+        QuickImagePresenter.navigate_to(presenter, index)
+    QuickImagePresenter.finish_navigation(presenter)
+    burst = events
+    
+    test_cases = [
+        ("Jobs run current, next, previous, further", priority_order),
+        ("Retarget cancels jobs that left the window", cancelled == 3),
+        ("Cancelled jobs never decode or call back", 'a' not in retargeted and skipped == ['d']),
+        ("get_frame decodes a queued job inline", stolen == 'e' and retargeted.count('e') == 1),
+        ("Remaining jobs keep running", retargeted[:2] == ['e', 'busy'] and 'd' in retargeted),
+        ("Burst back to the shown slide restarts its timer",
+         burst == [('show', 1), 'cancel', 'cancel', ('start', 5)] and presenter.navigation_job is None),
+    ]
+    
+    passed = 0
+    total = len(test_cases)
+    
+    for name, ok in test_cases:
+        if ok:
+            print(f"✓ {name}")
+            passed += 1
+        else:
+            print(f"✗ {name}")
+    
+    print(f"Decode scheduler test: {passed}/{total} passed")
+    return passed == total
+
+def test_memory_budget():
+    """Test byte accounting, pressure levels and cache capping."""
+    print("\nTesting memory budget...")
+    
+    sys.path.append('.')
+    from PIL import Image
+    from image_pipeline import FrameCache, image_bytes
+    from memory_budget import MemoryBudget, process_rss, available_memory, MB
+    
+    cache = FrameCache(max_items=10)
+    for i in range(4):
+        cache.put(i, Image.new('RGB', (1024, 256)))  # 1 MB each at 4 bytes per pixel
+    cache.put(3, Image.new('L', (1024, 1024)))  # Replacing an entry swaps its bytes
+    accounted = cache.bytes == 4 * MB
+    
+    figures = {'rss': 5 * MB, 'available': 4096 * MB}
+    budget = MemoryBudget(budget=3 * MB, rss=lambda: figures['rss'], available=lambda: figures['available'])
+    screen = [512 * 1024]
+    budget.register('frames', lambda: cache.bytes, cache.limit)
+    budget.register('screen', lambda: screen[0])
+    
+    over_budget = budget.check()
+    capped = cache.bytes <= 0.6 * 3 * MB and len(cache) >= 1
+    shallow = budget.prefetch_radius(2) == 1
+    
+    figures['available'] = 100 * MB
+    budget.check()
+    critical = budget.level == 2 and budget.prefetch_radius(2) == 0
+    
+    figures['available'] = 4096 * MB
+    budget.check()
+    released = budget.level == 0 and cache.max_bytes is None and budget.prefetch_radius(2) == 2
+    
+    rss = process_rss()
+    available = available_memory()
+    
+    # The control window's preview thumbnails are trimmed from the end under pressure
+    from types import SimpleNamespace
+    from quick_image_presenter import QuickImagePresenter
+    
+    class Thumbnail:
+        def __init__(self):
+            self.destroyed = False
+        def width(self):
+            return 120
+        def height(self):
+            return 90
+        def destroy(self):
+            self.destroyed = True
+    
+    restored = []
+    thumbnails = [Thumbnail() for _ in range(4)]
+    presenter = SimpleNamespace(preview_images=list(thumbnails), preview_frames=list(thumbnails),
+                                previews_trimmed=False, root=SimpleNamespace(after_idle=restored.append),
+                                update_preview=None)
+    presenter.preview_bytes = lambda: QuickImagePresenter.preview_bytes(presenter)
+    held = presenter.preview_bytes()
+    trimmed = QuickImagePresenter.limit_previews(presenter, 2 * 120 * 90 * 4)
+    kept = len(presenter.preview_images) == 2 and thumbnails[3].destroyed and not thumbnails[1].destroyed
+    QuickImagePresenter.limit_previews(presenter, None)
+    
+    test_cases = [
+        ("Image bytes by mode", image_bytes(Image.new('RGB', (10, 10))) == 400
+         and image_bytes(Image.new('L', (10, 10))) == 100 and image_bytes('not an image') == 0),
+        ("Frame cache tracks bytes", accounted),
+        ("Over budget is high pressure", over_budget['level'] == 'high'),
+        ("Caches are capped under pressure", capped and over_budget['freed'] > 0),
+        ("Prefetch depth shrinks", shallow),
+        ("Low system memory is critical", critical),
+        ("Caps lifted when pressure ends", released),
+        ("Status line", budget.status_text().startswith("Memory: ")),
+        ("Process and system figures", sys.platform != 'linux' or (rss > 0 and available > 0)),
+        ("Preview thumbnails accounted and trimmed", held == 4 * 120 * 90 * 4 and trimmed == held // 2 and kept),
+        ("Trimmed previews come back", len(restored) == 1 and not presenter.previews_trimmed),
+    ]
+    
+    passed = 0
+    total = len(test_cases)
+    
+    for name, ok in test_cases:
+        if ok:
+            print(f"✓ {name}")
+            passed += 1
+        else:
+            print(f"✗ {name}")
+    
+    print(f"Memory budget test: {passed}/{total} passed")
+    return passed == total
+
+def test_extra_displays():
+    """Test extra display placement, slide offsets and shared decode targets."""
+    print("\nTesting extra displays...")
+    
+    sys.path.append('.')
+    import threading
+    from playlist import PlaylistEntry
+    from types import SimpleNamespace
+    from displays import display_decks, display_offsets, extra_geometries, frame_size, slide_for, display_targets
+    from image_pipeline import Prefetcher, PRIORITY_CURRENT, PRIORITY_NEXT
+    from quick_image_presenter import QuickImagePresenter
+    
+    monitors = [(0, 0, 1920, 1080), (1920, 0, 1280, 1024)]
+    entries = [PlaylistEntry(f"{i}.jpg", f"{i}.jpg") for i in range(5)]
+    
+    class CountingPrefetcher(Prefetcher):
+        def __init__(self):
+            super().__init__(workers=2)
+            self.decoded = []
+        
+        def _load(self, path, size):
+            self.decoded.append((path, size))
+            return path
+    
+    # A mirrored screen of the same size asks for exactly the frames the main one does
+    # (sizes as open_extra_displays computes them: the main display loses its control bar)
+    screen = (1920, 1080)
+    window = SimpleNamespace(winfo_screenwidth=lambda: screen[0], winfo_screenheight=lambda: screen[1])
+    size = QuickImagePresenter.get_display_size(SimpleNamespace(presentation_window=window))
+    mirrored = frame_size(extra_geometries([(0, 0) + screen], 1)[0], screen, size)
+    prefetcher = CountingPrefetcher()
+    main = {(entries[0].path, size): PRIORITY_CURRENT, (entries[1].path, size): PRIORITY_NEXT}
+    targets = dict(main)
+    for key, priority in display_targets(entries, 0, 0, mirrored).items():
+        targets[key] = min(priority, targets.get(key, priority))
+    prefetcher.retarget(targets)
+    done = threading.Event()
+    prefetcher.prefetch(entries[0].path, size, on_ready=done.set)
+    done.wait(5)
+    other = threading.Event()
+    prefetcher.prefetch(entries[1].path, size, on_ready=other.set)
+    other.wait(5)
+    prefetcher.shutdown()
+    
+    test_cases = [
+        ("Uses the other monitors first", extra_geometries(monitors, 1) == [(1920, 0, 1280, 1024)]),
+        ("Assumes further screens to the right", extra_geometries(monitors, 3)[1:] ==
+         [(3200, 0, 1920, 1080), (5120, 0, 1920, 1080)]),
+        ("Offset wraps around the deck", [slide_for(i, 2, 5) for i in (0, 3, 4)] == [2, 0, 1]),
+        ("Negative offset", slide_for(0, -1, 5) == 4),
+        ("Empty deck", slide_for(3, 1, 0) is None and display_targets([], 0, 0, size) == {}),
+        ("Current and next frame targets", display_targets(entries, 4, 1, (800, 600)) ==
+         {("0.jpg", (800, 600)): PRIORITY_CURRENT, ("1.jpg", (800, 600)): PRIORITY_NEXT}),
+        ("Mirrored screens decode each frame once", sorted(prefetcher.decoded) == sorted(main)),
+        ("Other monitor sizes decode for the whole monitor",
+         frame_size(monitors[1], screen, size) == (1280, 1024)),
+        ("One offset steps each display further ahead", display_offsets("5", 3) == [5, 10, 15]),
+        ("Offset per display", display_offsets("0, -2, 7", 3) == [0, -2, 7] and display_offsets("3,4", 3) == [3, 4, 0]),
+        ("Deck per display", display_decks("a.csv", 2) == ["a.csv", "a.csv"]
+         and display_decks("a.csv; ;b", 3) == ["a.csv", "", "b"] and display_decks("", 1) == [""]),
+    ]
+    
+    passed = 0
+    total = len(test_cases)
+    
+    for name, ok in test_cases:
+        if ok:
+            print(f"✓ {name}")
+            passed += 1
+        else:
+            print(f"✗ {name}")
+    
+    print(f"Extra displays test: {passed}/{total} passed")
+    return passed == total
+
+def test_presenter_view():
+    """Test presenter previews and side-effect-free cache lookups."""
+    print("\nTesting presenter view...")
+    
+    sys.path.append('.')
+    from PIL import Image
+    from image_pipeline import FrameCache
+    from presenter_view import make_preview, CURRENT_PREVIEW_SIZE, NEXT_PREVIEW_SIZE
+    
+    frame = Image.new('RGB', (1920, 1080), (200, 30, 30))
+    portrait = Image.new('RGB', (600, 1000), (30, 30, 200))
+    
+    cache = FrameCache()
+    cache.put('next', frame)
+    cache.put('other', portrait)
+    peeked = cache.peek('next') is frame and cache.peek('missing') is None
+    # Peeking must not make 'next' recently used nor count towards the hit rate
+    cache.max_items = 1
+    cache.put('third', portrait)
+    untouched = cache.hits == 0 and cache.misses == 0 and 'next' not in cache
+    
+    test_cases = [
+        ("Current preview fits its box", make_preview(frame, CURRENT_PREVIEW_SIZE).size == (560, 315)),
+        ("Next preview fits its box", make_preview(frame, NEXT_PREVIEW_SIZE).size == (360, 202)),
+        ("Portrait preview keeps its aspect", make_preview(portrait, NEXT_PREVIEW_SIZE).size == (121, 203)),
+        ("Small frames are not reduced", make_preview(Image.new('RGB', (100, 50)), NEXT_PREVIEW_SIZE).size == (360, 180)),
+        ("Peek returns cached frames", peeked),
+        ("Peek leaves LRU order and statistics alone", untouched),
+    ]
+    
+    passed = 0
+    total = len(test_cases)
+    
+    for name, ok in test_cases:
+        if ok:
+            print(f"✓ {name}")
+            passed += 1
+        else:
+            print(f"✗ {name}")
+    
+    print(f"Presenter view test: {passed}/{total} passed")
+    return passed == total
+
+def test_placeholders():
+    """Test placeholder frames from embedded EXIF thumbnails and reduced decodes."""
+    print("\nTesting placeholders...")
+    
+    sys.path.append('.')
+    import io
+    import struct
+    import tempfile
+    from PIL import Image
+    from image_pipeline import load_placeholder, read_exif_thumbnail, Prefetcher, FrameCache
+    
+    def exif_with_thumbnail(thumbnail, orientation=1):
+        """EXIF block: IFD0 with the orientation, IFD1 pointing at a JPEG thumbnail"""
+        data = io.BytesIO()
+        thumbnail.save(data, 'JPEG')
+        data = data.getvalue()
+        header = b'II' + struct.pack('<HI', 42, 8)
+        ifd0 = struct.pack('<HHHIHHI', 1, 0x0112, 3, 1, orientation, 0, 26)
+        ifd1 = struct.pack('<HHHIIHHIII', 2, 0x0201, 4, 1, 56, 0x0202, 4, 1, len(data), 0)
+        return b'Exif\x00\x00' + header + ifd0 + ifd1 + data
+    
+    photo = Image.radial_gradient('L').resize((2400, 1800)).convert('RGB')
+    
+    with tempfile.TemporaryDirectory() as folder:
+        def save(name, image, **params):
+            path = os.path.join(folder, name)
+            image.save(path, **params)
+            return path
+        
+        with_thumbnail = save("thumb.jpg", photo, exif=exif_with_thumbnail(photo.resize((160, 120))))
+        rotated = save("rotated.jpg", photo, exif=exif_with_thumbnail(photo.resize((160, 120)), 6))
+        letterboxed = save("letterbox.jpg", photo.resize((2400, 1200)),
+                           exif=exif_with_thumbnail(photo.resize((160, 120))))
+        plain = save("plain.png", photo)
+        plain_jpeg = save("plain.jpg", photo)
+        
+        with Image.open(with_thumbnail) as image:
+            embedded = read_exif_thumbnail(image)
+        from_thumbnail = load_placeholder(with_thumbnail, (480, 270))
+        from_rotated = load_placeholder(rotated, (480, 270))
+        from_letterboxed = load_placeholder(letterboxed, (480, 270))
+        from_jpeg = load_placeholder(plain_jpeg, (480, 270))
+        from_png = load_placeholder(plain, (480, 270))
+        
+        prefetcher = Prefetcher(cache=FrameCache(4), workers=1, loader=load_placeholder)
+        via_prefetcher = prefetcher.get_frame(with_thumbnail, (480, 270))
+        nothing_cached = prefetcher.get_frame(plain, (480, 270)) is None and len(prefetcher.cache) == 1
+        
+        # The presenter loads placeholders on the low-res decoder and cuts to them when they arrive
+        import time
+        from types import SimpleNamespace
+        from quick_image_presenter import QuickImagePresenter
+        later, painted = [], []
+        presenter = SimpleNamespace(
+            presentation_running=True, low_res_index=0, current_image_index=0, pending_transition='fade',
+            get_display_size=lambda: (480, 270), get_low_res_size=lambda size: (240, 135),
+            low_res_prefetcher=prefetcher, root=SimpleNamespace(after=lambda ms, *call: later.append(call)),
+            paint_slide=lambda index, image, transition=None: painted.append(image.size))
+        
+        def show_placeholder(path):
+            presenter.images = [SimpleNamespace(path=path)]
+            QuickImagePresenter.show_placeholder(presenter, 0)
+            deadline = time.monotonic() + 5
+            while not later and time.monotonic() < deadline:
+                time.sleep(0.01)
+            while later:
+                callback, *args = later.pop()
+                callback(*args)
+        
+        presenter.show_placeholder = lambda index, request=True: QuickImagePresenter.show_placeholder(
+            presenter, index, request)
+        show_placeholder(plain)
+        png_kept_previous = painted == [] and presenter.pending_transition == 'fade'
+        show_placeholder(plain_jpeg)
+        jpeg_cut = painted == [(360, 270)] and presenter.pending_transition is None
+        prefetcher.shutdown()
+    
+    test_cases = [
+        ("Embedded thumbnail is found", embedded is not None and embedded.size == (160, 120)),
+        ("Placeholder uses the embedded thumbnail", from_thumbnail.size == (160, 120)),
+        ("Thumbnail follows EXIF orientation", from_rotated.size == (120, 160)),
+        ("Letterboxed thumbnail is skipped", from_letterboxed.size == (480, 240)),
+        ("JPEG draft decode without thumbnail", from_jpeg.size == (360, 270) and from_jpeg.mode == 'RGB'),
+        ("No placeholder for other formats", from_png is None),
+        ("Prefetcher with placeholder loader", via_prefetcher.size == (160, 120) and nothing_cached),
+        ("PNG without thumbnail keeps the previous slide", png_kept_previous),
+        ("Placeholder loaded off the Tk thread is shown", jpeg_cut),
+    ]
+    
+    passed = 0
+    total = len(test_cases)
+    
+    for name, ok in test_cases:
+        if ok:
+            print(f"✓ {name}")
+            passed += 1
+        else:
+            print(f"✗ {name}")
+    
+    print(f"Placeholder test: {passed}/{total} passed")
+    return passed == total
+
+def test_archives():
+    """Test presenting from ZIP and TAR archives without extracting them."""
+    print("\nTesting archives...")
+    
+    sys.path.append('.')
+    import io
+    import tarfile
+    import tempfile
+    import time
+    import zipfile
+    from PIL import Image
+    from filename_rules import FilenameRules
+    from image_pipeline import load_fitted_image
+    from metadata_cache import file_signature
+    import archives
+    
+    extensions = {'.jpg', '.png'}
+    names = ["deck/img10.jpg", "deck/img2.jpg", "deck/img1.png", "deck/notes.txt", "img3.jpg"]
+    
+    def image_bytes(name):
+        data = io.BytesIO()
+        Image.new('RGB', (64, 48), (len(name) * 20 % 256, 90, 160)).save(
+            data, 'PNG' if name.endswith('.png') else 'JPEG')
+        return data.getvalue()
+    
+    with tempfile.TemporaryDirectory() as folder:
+        zip_path = os.path.join(folder, "deck.zip")
+        with zipfile.ZipFile(zip_path, 'w') as deck:
+            for name in names:
+                deck.writestr(name, b"notes" if name.endswith('.txt') else image_bytes(name))
+        tar_path = os.path.join(folder, "deck.tar.gz")
+        with tarfile.open(tar_path, 'w:gz') as deck:
+            for name in names:
+                data = b"notes" if name.endswith('.txt') else image_bytes(name)
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                deck.addfile(info, io.BytesIO(data))
+        broken = os.path.join(folder, "broken.zip")
+        with open(broken, 'wb') as f:
+            f.write(b"not a zip file")
+        
+        zip_entries, _ = FilenameRules().apply(archives.archive_entries(zip_path, extensions),
+                                               sort_name=lambda entry: archives.split_member_path(entry.path)[1])
+        tar_entries = archives.archive_entries(tar_path, extensions)
+        
+        first = zip_entries[0].path
+        frame = load_fitted_image(first, (32, 32))
+        archive = archives.get_archive(zip_path)
+        deadline = time.time() + 5
+        while archive.buffered < sum(len(image_bytes(name)) for name in names[:3]) and time.time() < deadline:
+            time.sleep(0.01)  # Read-ahead runs in the background
+        buffered = len(archive._buffer)
+        freed = archives.limit_buffers(1)
+        kept_one = len(archive._buffer) == 1 and freed > 0
+        archives.limit_buffers(None)
+        signature = file_signature(first)
+        tar_frame = load_fitted_image(tar_entries[-1].path, (32, 32))
+        
+        try:
+            archives.archive_entries(broken, extensions)
+            rejected = False
+        except archives.ArchiveError:
+            rejected = True
+        archives.close_archives()
+    
+    test_cases = [
+        ("Image members sorted by member path", [entry.filename for entry in zip_entries] ==
+         ["img1.png", "img2.jpg", "img10.jpg", "img3.jpg"]),
+        ("Member paths", archives.split_member_path(first) == (os.path.abspath(zip_path), "deck/img1.png")),
+        ("Plain paths are not members", archives.split_member_path("/photos/a::b.jpg") is None),
+        ("Decode straight from the ZIP", frame.size == (32, 24)),
+        ("Following members are read ahead", buffered >= 3),
+        ("Buffer can be capped", kept_one),
+        ("Cache signature for members", signature is not None and signature[1] > 0),
+        ("Decode from a compressed TAR", len(tar_entries) == 4 and tar_frame.size == (32, 24)),
+        ("Broken archive raises ArchiveError", rejected),
+    ]
+    
+    passed = 0
+    total = len(test_cases)
+    
+    for name, ok in test_cases:
+        if ok:
+            print(f"✓ {name}")
+            passed += 1
+        else:
+            print(f"✗ {name}")
+    
+    print(f"Archive test: {passed}/{total} passed")
+    return passed == total
+
+def test_multipage():
+    """Test lazy page enumeration and per-page decoding of multi-page TIFFs."""
+    print("\nTesting multi-page files...")
+    
+    sys.path.append('.')
+    import io
+    import struct
+    import tempfile
+    from PIL import Image
+    from playlist import PlaylistEntry
+    from image_pipeline import open_image, load_fitted_image
+    from metadata_cache import file_signature
+    from pages import count_tiff_pages, expand_entry, split_page_path, page_path
+    
+    colours = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
+    pages = [Image.new('RGB', (80, 60), colour) for colour in colours]
+    
+    with tempfile.TemporaryDirectory() as folder:
+        scan = os.path.join(folder, "scan.tif")
+        pages[0].save(scan, save_all=True, append_images=pages[1:])
+        single = os.path.join(folder, "single.tif")
+        pages[0].save(single)
+        
+        entry = PlaylistEntry("scan.tif", scan, duration=7)
+        slides = expand_entry(entry)
+        single_entry = PlaylistEntry("single.tif", single)
+        single_result = expand_entry(single_entry)
+        
+        with open_image(slides[2].path) as image:
+            third = image.convert('RGB').getpixel((0, 0))
+        fitted = load_fitted_image(slides[1].path, (40, 40))
+        signature_ok = file_signature(slides[2].path) == file_signature(scan)
+    
+    # A directory chain that points back at itself must not loop forever
+    looping = io.BytesIO(b'II' + struct.pack('<HI', 42, 8) + struct.pack('<HI', 0, 8) + b'\0' * 8)
+    big = io.BytesIO(b'II' + struct.pack('<HHHQ', 43, 8, 0, 16) + struct.pack('<QQ', 0, 0))
+    
+    test_cases = [
+        ("Pages counted from directory headers", len(slides) == 3),
+        ("Page slides keep duration and order", all(s.duration == 7 for s in slides)
+         and [s.page for s in slides] == [0, 1, 2]),
+        ("Page names", slides[1].filename == "scan.tif [2/3]"),
+        ("First page keeps the plain path", slides[0].path == scan),
+        ("Page paths round-trip", split_page_path(page_path(scan, 2)) == (scan, 2)
+         and split_page_path(scan) == (scan, 0)),
+        ("Single page files stay one slide", single_result is None and single_entry.page == 0),
+        ("Each page decodes on its own", third == colours[2]
+         and fitted.getpixel((0, 0)) == colours[1]),
+        ("Pages share the file's cache signature", signature_ok),
+        ("Directory loops stop", count_tiff_pages(looping) == 1),
+        ("BigTIFF headers", count_tiff_pages(big) == 1),
+    ]
+    
+    passed = 0
+    total = len(test_cases)
+    
+    for name, ok in test_cases:
+        if ok:
+            print(f"✓ {name}")
+            passed += 1
+        else:
+            print(f"✗ {name}")
+    
+    print(f"Multi-page test: {passed}/{total} passed")
+    return passed == total
+
+def test_compiled_deck():
+    """Test compiling a folder into a deck and playing slides from it."""
+    print("\nTesting compiled decks...")
+    
+    sys.path.append('.')
+    import tempfile
+    from PIL import Image
+    from image_pipeline import load_fitted_image, load_placeholder
+    from metadata_cache import file_signature
+    from compiled_deck import (DeckError, compile_deck, close_decks, deck_entries, folder_entries,
+                               get_deck, kiosk_color_manager, split_slide_path, slide_path)
+    
+    with tempfile.TemporaryDirectory() as folder:
+        source = os.path.join(folder, "slides")
+        os.mkdir(source)
+        Image.new('RGB', (400, 300), (200, 30, 30)).save(os.path.join(source, "2-5.png"))
+        Image.new('RGB', (300, 400), (30, 200, 30)).save(os.path.join(source, "10.png"))
+        Image.new('RGB', (300, 200), (30, 30, 200)).save(os.path.join(source, "1-3.png"))
+        with open(os.path.join(source, "broken.png"), 'wb') as f:
+            f.write(b'not an image')
+        
+        entries, _ = folder_entries(source)
+        jpeg_deck = os.path.join(folder, "show.qdeck")
+        raw_deck = os.path.join(folder, "raw.qdeck")
+        written = compile_deck(entries, jpeg_deck, size=(160, 100), workers=2)
+        compile_deck(entries, raw_deck, size=(160, 100), codec='raw')
+        
+        slides = deck_entries(jpeg_deck)
+        frames = [load_fitted_image(slide.path, (160, 100)) for slide in slides]
+        raw_frames = [load_fitted_image(slide.path, (160, 100)) for slide in deck_entries(raw_deck)]
+        smaller = load_fitted_image(slides[0].path, (80, 50))
+        placeholder = load_placeholder(slides[0].path, (40, 25))
+        signature_ok = file_signature(slides[1].path) == file_signature(jpeg_deck)
+        
+        bogus = os.path.join(folder, "bogus.qdeck")
+        with open(bogus, 'wb') as f:
+            f.write(b'QIPDECK1 but nothing else')
+        try:
+            get_deck(bogus)
+            rejected = False
+        except DeckError:
+            rejected = True
+        close_decks()
+        
+        def cancel(done, total):
+            raise KeyboardInterrupt
+        
+        failed = os.path.join(folder, "failed.qdeck")
+        try:
+            compile_deck(entries, failed, size=(160, 100), progress=cancel)
+        except KeyboardInterrupt:
+            pass
+        nothing_left = not os.path.exists(failed) and not os.path.exists(failed + '.partial')
+    
+    red = frames[0].getpixel((80, 50)) if frames else (0, 0, 0)
+    test_cases = [
+        ("Undecodable images are left out", written == 3 and len(slides) == 3),
+        ("Folder order is kept", [s.filename for s in slides] == ["1-3.png", "2-5.png", "10.png"]),
+        ("Durations are compiled in", [s.duration for s in slides] == [3, 5, None]),
+        ("Frames are fitted when compiling", [f.size for f in frames] == [(150, 100), (133, 100), (75, 100)]),
+        ("JPEG frames keep their colour", abs(red[2] - 200) < 12 and red[0] < 60),
+        ("Raw frames are exact", raw_frames[2].getpixel((10, 10)) == (30, 200, 30)),
+        ("Other display sizes are rescaled", smaller.size == (75, 50) and placeholder.size[0] <= 40),
+        ("Slide paths round-trip", split_slide_path(slide_path(jpeg_deck, 2)) == (jpeg_deck, 2)
+         and split_slide_path("photo::2") is None),
+        ("Slides share the deck's cache signature", signature_ok),
+        ("Damaged decks are rejected", rejected),
+        ("An interrupted compile leaves no files behind", nothing_left),
+        ("Compiled for sRGB unless a kiosk profile is given", kiosk_color_manager().description == 'sRGB'),
+    ]
+    
+    passed = 0
+    total = len(test_cases)
+    
+    for name, ok in test_cases:
+        if ok:
+            print(f"✓ {name}")
+            passed += 1
+        else:
+            print(f"✗ {name}")
+    
+    print(f"Compiled deck test: {passed}/{total} passed")
+    return passed == total
+
+def test_power_profile():
+    """Test the power profiles and the wake-up meter."""
+    print("\nTesting power profiles...")
+    
+    sys.path.append('.')
+    from power_profile import (NORMAL, LOW_POWER, LOW_POWER_ENV, WakeupMeter, context_switches,
+                               low_power_configured)
+    
+    now = [100.0]
+    cpu = [5.0]
+    switches = [1000]
+    meter = WakeupMeter(interval=60, clock=lambda: now[0], cpu_time=lambda: cpu[0], switches=lambda: switches[0])
+    for _ in range(10):
+        meter.count('countdown')
+    meter.count('memory check')
+    now[0] += 30
+    cpu[0] += 0.25
+    switches[0] += 40
+    report = meter.report()
+    second = meter.report(reset=False)
+    text = WakeupMeter.format(report, LOW_POWER.name)
+    
+    saved = os.environ.get(LOW_POWER_ENV)
+    os.environ[LOW_POWER_ENV] = 'yes'
+    enabled = low_power_configured()
+    os.environ[LOW_POWER_ENV] = '0'
+    disabled = not low_power_configured()
+    if saved is None:
+        del os.environ[LOW_POWER_ENV]
+    else:
+        os.environ[LOW_POWER_ENV] = saved
+    
+    measured = context_switches()
+    
+    # Switching profiles between presentations resizes the shared decode pool
+    import threading
+    import time
+    from PIL import Image
+    from image_pipeline import Prefetcher
+    release = threading.Event()
+    
+    def slow_loader(path, size, **options):
+        release.wait(5)
+        return Image.new('RGB', size)
+    
+    prefetcher = Prefetcher(workers=NORMAL.decode_workers, loader=slow_loader)
+    for n in range(4):
+        prefetcher.prefetch(f"slide{n}.jpg", (8, 8))
+    grown = len(prefetcher._threads)
+    prefetcher.set_workers(LOW_POWER.decode_workers)
+    release.set()
+    deadline = time.monotonic() + 5
+    while len(prefetcher._threads) > 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    shrunk = len(prefetcher._threads)
+    prefetcher.set_workers(NORMAL.decode_workers)
+    prefetcher.prefetch("slide4.jpg", (8, 8))
+    regrown = len(prefetcher._threads)
+    prefetcher.shutdown()
+    
+    test_cases = [
+        ("Low power waits once per slide", LOW_POWER.countdown_step is None and NORMAL.countdown_step == 1),
+        ("Low power checks memory less often", LOW_POWER.memory_check_ms > NORMAL.memory_check_ms),
+        ("Low power resamples cheaply and animates nothing", LOW_POWER.resample == 'BILINEAR'
+         and not LOW_POWER.animations and LOW_POWER.decode_workers == 1),
+        ("Wake-ups are scaled to a minute", report['wakeups_per_minute'] == 22
+         and report['sources'] == {'countdown': 20, 'memory check': 2}),
+        ("CPU time per minute", report['cpu_seconds_per_minute'] == 0.5),
+        ("Context switches per minute", report['context_switches_per_minute'] == 80),
+        ("Reports start a new interval", second['wakeups_per_minute'] == 0 and not second['sources']),
+        ("Report text", "22 wake-ups/min" in text and "countdown 20" in text),
+        ("QIP_LOW_POWER", enabled and disabled),
+        ("Context switches readable", measured is None or measured > 0),
+        ("Decode pool follows the profile", (grown, shrunk, regrown) == (2, 1, 2)),
+    ]
+    
+    passed = 0
+    total = len(test_cases)
+    
+    for name, ok in test_cases:
+        if ok:
+            print(f"✓ {name}")
+            passed += 1
+        else:
+            print(f"✗ {name}")
+    
+    print(f"Power profile test: {passed}/{total} passed")
+    return passed == total
+
+def test_captions():
+    """Test caption sources and drawing captions into frames."""
+    print("\nTesting captions...")
+    
+    sys.path.append('.')
+    import tempfile
+    import zipfile
+    from PIL import Image
+    from captions import (CaptionStyle, embedded_caption, get_font, load_captioned_image, read_caption,
+                          render_caption, wrap_text)
+    
+    xmp = (b'<x:xmpmeta xmlns:x="adobe:ns:meta/"><rdf:RDF><rdf:Description>'
+           b'<dc:description><rdf:Alt><rdf:li xml:lang="x-default">Harbour &amp; boats</rdf:li>'
+           b'</rdf:Alt></dc:description></rdf:Description></rdf:RDF></x:xmpmeta>')
+    
+    with tempfile.TemporaryDirectory() as folder:
+        grey = Image.new('RGB', (400, 300), (128, 128, 128))
+        sidecar = os.path.join(folder, "sidecar.jpg")
+        grey.save(sidecar)
+        with open(os.path.join(folder, "sidecar.txt"), 'w', encoding='utf-8') as f:
+            f.write("\ufeffOpening night\n")
+        
+        exif = Image.Exif()
+        exif[0x010E] = "Summit at dawn"
+        described = os.path.join(folder, "described.jpg")
+        grey.save(described, exif=exif)
+        
+        camera = Image.Exif()
+        camera[0x010E] = "OLYMPUS DIGITAL CAMERA        "
+        default = os.path.join(folder, "default.jpg")
+        grey.save(default, exif=camera)
+        
+        tagged = os.path.join(folder, "tagged.jpg")
+        grey.save(tagged, xmp=xmp)
+        
+        archive = os.path.join(folder, "deck.zip")
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.write(sidecar, "slides/01.jpg")
+            zf.writestr("slides/01.jpg.txt", "From the archive")
+        
+        captions = [read_caption(path) for path in (sidecar, described, default, tagged)]
+        member_caption = read_caption(f"{archive}::slides/01.jpg")
+        captioned = load_captioned_image(sidecar, (200, 150))
+        plain = load_captioned_image(default, (200, 150))
+        
+        with Image.open(tagged) as image:
+            xmp_caption = embedded_caption(image)
+        from archives import close_archives
+        close_archives()
+    
+    frame = Image.new('RGB', (320, 240), (200, 200, 200))
+    render_caption(frame, "Caption", CaptionStyle(position='bottom'))
+    top_style = CaptionStyle(position='top', plate_color='#ff0000', plate_opacity=1.0)
+    top_frame = render_caption(Image.new('RGB', (320, 240), (200, 200, 200)), "Caption", top_style)
+    
+    font = get_font(None, 16)
+    long_lines = wrap_text("word " * 200, font, 150, 3)
+    
+    test_cases = [
+        ("Sidecar text file", captions[0] == "Opening night"),
+        ("EXIF ImageDescription", captions[1] == "Summit at dawn"),
+        ("Camera default descriptions ignored", captions[2] is None),
+        ("XMP dc:description", captions[3] == "Harbour & boats" and xmp_caption == "Harbour & boats"),
+        ("Sidecar inside an archive", member_caption == "From the archive"),
+        ("Plate drawn at the bottom only", frame.getpixel((160, 5)) == (200, 200, 200)
+         and frame.getpixel((160, 235)) == (200, 200, 200) and frame.getpixel((160, 220)) != (200, 200, 200)),
+        ("Top position and plate colour", top_frame.getpixel((160, 235)) == (200, 200, 200)
+         and top_frame.getpixel((160, 8)) == (255, 0, 0)),
+        ("Captions are drawn by the loader", captioned.size == (200, 150)
+         and captioned.getpixel((100, 140)) != captioned.getpixel((100, 10))),
+        ("No caption leaves the frame alone", plain.getpixel((100, 140)) == plain.getpixel((100, 10))),
+        ("Long captions are cut to max_lines", len(long_lines) == 3 and long_lines[-1].endswith('…')
+         and all(font.getlength(line) <= 150 for line in long_lines)),
+        ("Styles compare by value", CaptionStyle() == CaptionStyle() and CaptionStyle() != top_style),
+    ]
+    
+    passed = 0
+    total = len(test_cases)
+    
+    for name, ok in test_cases:
+        if ok:
+            print(f"✓ {name}")
+            passed += 1
+        else:
+            print(f"✗ {name}")
+    
+    print(f"Caption test: {passed}/{total} passed")
+    return passed == total
+
+def test_validation():
+    """Test the background validation pass that quarantines broken files."""
+    print("\nTesting file validation...")
+    
+    sys.path.append('.')
+    import tempfile
+    from PIL import Image
+    from metadata_cache import MetadataCache
+    from validation import validate_file, validate_files
+    
+    with tempfile.TemporaryDirectory() as folder:
+        photo = Image.effect_noise((640, 480), 60).convert('RGB')
+        good_jpeg = os.path.join(folder, "good.jpg")
+        photo.save(good_jpeg, quality=90)
+        good_png = os.path.join(folder, "good.png")
+        photo.save(good_png)
+        
+        with open(good_jpeg, 'rb') as f:
+            jpeg_bytes = f.read()
+        truncated = os.path.join(folder, "truncated.jpg")
+        with open(truncated, 'wb') as f:
+            f.write(jpeg_bytes[:len(jpeg_bytes) // 2])
+        
+        with open(good_png, 'rb') as f:
+            png_bytes = bytearray(f.read())
+        png_bytes[len(png_bytes) // 2] ^= 0xFF  # Corrupt IDAT data: its CRC no longer matches
+        corrupt_png = os.path.join(folder, "corrupt.png")
+        with open(corrupt_png, 'wb') as f:
+            f.write(png_bytes)
+        
+        empty = os.path.join(folder, "empty.jpg")
+        open(empty, 'wb').close()
+        missing = os.path.join(folder, "missing.jpg")
+        
+        paths = [good_jpeg, good_png, truncated, corrupt_png, empty, missing]
+        cache_path = os.path.join(folder, "cache.json")
+        cache = MetadataCache(cache_path)
+        progress = []
+        bad = validate_files(paths, cache, workers=2, progress=lambda done, total: progress.append((done, total)))
+        cache.save()
+        
+        # A second pass answers from the cache without reopening unchanged files
+        checked = []
+        cached_bad = validate_files(paths, MetadataCache(cache_path),
+                                    progress=lambda done, total: checked.append(total))
+        direct = validate_file(good_jpeg)
+        
+        # Background decodes report failures so playback can quarantine slides it only showed a placeholder for
+        import threading
+        from image_pipeline import Prefetcher
+        failed = []
+        reported = threading.Event()
+        prefetcher = Prefetcher(workers=1, on_error=lambda path, size, e: (failed.append(path), reported.set()))
+        prefetcher.prefetch(truncated, (320, 240))
+        prefetcher.prefetch(good_jpeg, (320, 240))
+        reported.wait(5)
+        prefetcher.get_frame(good_jpeg, (320, 240))
+        prefetcher.shutdown()
+    
+    test_cases = [
+        ("Valid files pass", good_jpeg not in bad and good_png not in bad and direct is None),
+        ("Truncated JPEG quarantined", truncated in bad),
+        ("PNG with a bad CRC quarantined", corrupt_png in bad),
+        ("Empty file quarantined", empty in bad),
+        ("Missing file quarantined", bad.get(missing) == "file not found"),
+        ("Progress reported", progress[0] == (0, 5) and progress[-1] == (5, 5)),
+        ("Results cached per file signature", checked == [0] and set(cached_bad) == set(bad)),
+        ("Failed background decodes reported", failed == [truncated]),
+    ]
+    
+    passed = 0
+    total = len(test_cases)
+    
+    for name, ok in test_cases:
+        if ok:
+            print(f"✓ {name}")
+            passed += 1
+        else:
+            print(f"✗ {name}")
+    
+    print(f"Validation test: {passed}/{total} passed")
+    return passed == total
+
+def test_sort_orders():
+    """Test header-only metadata extraction and the metadata sort orders."""
+    print("\nTesting sort orders...")
+    
+    sys.path.append('.')
+    import tempfile
+    from PIL import Image, ExifTags, ImageFile
+    from playlist import PlaylistEntry
+    from metadata_cache import MetadataCache
+    from sort_orders import (SORT_CAPTURE_TIME, SORT_DIMENSIONS, SORT_MODIFIED, SORT_NAME, SORT_SHUFFLE,
+                             SORT_SIZE, collect_metadata, normalize_exif_time, read_header, sort_entries)
+    
+    def exif_with(taken):
+        exif = Image.Exif()
+        exif.get_ifd(ExifTags.IFD.Exif)[0x9003] = taken
+        return exif
+    
+    with tempfile.TemporaryDirectory() as folder:
+        specs = [
+            ("a.jpg", (300, 200), "2021:06:01 10:00:00"),
+            ("b.jpg", (100, 100), "2019:01:01 08:30:00"),
+            ("c.png", (400, 400), None),
+            ("d.jpg", (200, 150), "2020:12:24 18:00:00"),
+        ]
+        entries = []
+        for position, (name, size, taken) in enumerate(specs):
+            path = os.path.join(folder, name)
+            image = Image.effect_noise(size, 30).convert('RGB')
+            if taken:
+                image.save(path, exif=exif_with(taken))
+            else:
+                image.save(path)
+            os.utime(path, ns=(0, (10 - position) * 1_000_000_000))
+            entry = PlaylistEntry(name, path)
+            entry.order = position
+            entries.append(entry)
+        
+        # No pixel data may be decoded while reading headers
+        loads = []
+        original_load = ImageFile.ImageFile.load
+        ImageFile.ImageFile.load = lambda image: loads.append(image.format) or original_load(image)
+        try:
+            header = read_header(entries[0].path)
+            png_header = read_header(entries[2].path)
+        finally:
+            ImageFile.ImageFile.load = original_load
+        header_only = not loads and png_header == {'taken': '', 'pixels': 160000}
+        cache_path = os.path.join(folder, "cache.json")
+        cache = MetadataCache(cache_path)
+        progress = []
+        records = collect_metadata([e.path for e in entries], cache, workers=2,
+                                   progress=lambda done, total: progress.append(total))
+        cache.save()
+        cached_progress = []
+        cached = collect_metadata([e.path for e in entries], MetadataCache(cache_path),
+                                  progress=lambda done, total: cached_progress.append(total))
+        stat_only = collect_metadata([e.path for e in entries], headers=False)
+    
+    def names(mode, seed=0):
+        return [e.filename for e in sort_entries(entries, mode, records, seed)]
+    
+    shuffled = names(SORT_SHUFFLE, 7)
+    
+    # Pages split off after the scan have no record of their own and follow their file's
+    from pages import page_path
+    pages = []
+    for page in range(2):
+        slide = PlaylistEntry(f"b.jpg (page {page + 1})", page_path(entries[1].path, page))
+        slide.order, slide.page = entries[1].order, page
+        pages.append(slide)
+    with_pages = [entries[0], *pages, entries[2], entries[3]]
+    paged = [e.filename for e in sort_entries(with_pages, SORT_CAPTURE_TIME, records)]
+    test_cases = [
+        ("EXIF capture time normalized", normalize_exif_time("2021:06:01 10:00:00") == "2021-06-01 10:00:00"
+         and normalize_exif_time("0000:00:00 00:00:00") is None and normalize_exif_time(None) is None),
+        ("Header fields", header == {'taken': "2021-06-01 10:00:00", 'pixels': 60000}),
+        ("Headers read without decoding", header_only),
+        ("Capture time order, undated last", names(SORT_CAPTURE_TIME) == ["b.jpg", "d.jpg", "a.jpg", "c.png"]),
+        ("Dimensions order", names(SORT_DIMENSIONS) == ["b.jpg", "d.jpg", "a.jpg", "c.png"]),
+        ("Modified order", names(SORT_MODIFIED) == ["d.jpg", "c.png", "b.jpg", "a.jpg"]),
+        ("File size order", names(SORT_SIZE) == sorted(names(SORT_NAME), key=lambda n: records[
+            os.path.join(folder, n)]['size'])),
+        ("Name restores the loaded order", names(SORT_NAME) == ["a.jpg", "b.jpg", "c.png", "d.jpg"]),
+        ("Shuffle is repeatable per seed", shuffled == names(SORT_SHUFFLE, 7)
+         and sorted(shuffled) == names(SORT_NAME)
+         and any(names(SORT_SHUFFLE, seed) != shuffled for seed in range(5))),
+        ("Headers read in parallel once, then cached", progress == [4, 4] and cached_progress == [0]
+         and cached == records),
+        ("Page slides sort with their file", paged == ["b.jpg (page 1)", "b.jpg (page 2)", "d.jpg", "a.jpg", "c.png"]),
+        ("Stat-only records skip headers", all('taken' not in r and 'mtime' in r for r in stat_only.values())),
+    ]
+    
+    passed = 0
+    total = len(test_cases)
+    
+    for name, ok in test_cases:
+        if ok:
+            print(f"✓ {name}")
+            passed += 1
+        else:
+            print(f"✗ {name}")
+    
+    print(f"Sort order test: {passed}/{total} passed")
+    return passed == total
+
 def main():
     print("Quick Image Presenter - Test Suite")
     print("=" * 40)
     
-    # Test time extraction
-    time_test_passed = test_time_extraction()
-    
-    # Test image extensions
-    extension_test_passed = test_image_extensions()
+    tests = [
+        ("Time extraction", test_time_extraction),
+        ("Image extensions", test_image_extensions),
+        ("Playlist manifests", test_playlist_manifest),
+        ("Filename rules", test_filename_rules),
+        ("Synchronized playback", test_sync_playback),
+        ("Remote control", test_remote_control),
+        ("Sleep inhibitor", test_sleep_inhibitor),
+        ("Colour management", test_color_management),
+        ("Pixel modes", test_pixel_modes),
+        ("Ken Burns", test_ken_burns),
+        ("Transitions", test_transitions),
+        ("Contact sheet", test_contact_sheet),
+        ("Slide search", test_slide_search),
+        ("Duplicate detection", test_duplicates),
+        ("Decode scheduler", test_decode_scheduler),
+        ("Memory budget", test_memory_budget),
+        ("Extra displays", test_extra_displays),
+        ("Presenter view", test_presenter_view),
+        ("Placeholders", test_placeholders),
+        ("Archives", test_archives),
+        ("Multi-page files", test_multipage),
+        ("Compiled decks", test_compiled_deck),
+        ("Power profiles", test_power_profile),
+        ("Captions", test_captions),
+        ("File validation", test_validation),
+        ("Sort orders", test_sort_orders),
+    ]
+    results = [(name, test()) for name, test in tests]
     
     print("\n" + "=" * 40)
     print("Test Results:")
-    print(f"Time extraction: {'PASSED' if time_test_passed else 'FAILED'}")
-    print(f"Image extensions: {'PASSED' if extension_test_passed else 'FAILED'}")
+    for name, result in results:
+        print(f"{name}: {'PASSED' if result else 'FAILED'}")
     
-    if time_test_passed and extension_test_passed:
+    if all(result for _, result in results):
         print("\n✓ All tests passed! The application should work correctly.")
         return True
     else:
@@ -0,0 +1,178 @@
+"""
+Frame-paced transitions for Quick Image Presenter.
+
+Transitions are composited with PIL from the outgoing and incoming frames
+(both letterboxed to the display area) and shown through a single
+PhotoImage. Like the Ken Burns mode, every frame is placed by wall-clock
+time: the compositor measures how long each frame takes to render and
+display, waits only as long as the frame budget allows and, when it falls
+behind, skips straight to where the transition should be. A transition
+therefore takes DEFAULT_DURATION on a fast desktop and on a slow
+single-board computer alike; only the number of frames differs.
+"""
+
+import math
+import time
+
+from PIL import Image
+
+from ken_burns import FramePacer
+
+# Wall-clock length of a transition in seconds
+DEFAULT_DURATION = 0.6
+
+TARGET_FPS = 60
+MIN_FPS = 8
+# Transitions are short, so they may use most of the CPU while they run
+CPU_BUDGET = 0.8
+
+RESAMPLE = Image.Resampling.BILINEAR
+
+
+def letterbox(image, size, background=(0, 0, 0)):
+    """Centre image on a background of the full display size"""
+    if image.size == size:
+        return image
+    canvas = Image.new('RGB', size, background)
+    canvas.paste(image, ((size[0] - image.width) // 2, (size[1] - image.height) // 2))
+    return canvas
+
+
+def _scaled_over(base, top, scale_x, scale_y=None):
+    """base with top scaled about the centre and pasted over it"""
+    scale_y = scale_x if scale_y is None else scale_y
+    width, height = max(1, int(top.width * scale_x)), max(1, int(top.height * scale_y))
+    frame = base.copy()
+    frame.paste(top.resize((width, height), RESAMPLE), ((base.width - width) // 2, (base.height - height) // 2))
+    return frame
+
+
+def dissolve(old, new, t):
+    return Image.blend(old, new, t)
+
+
+def fade(old, new, t):
+    """Fade to black, then up into the new slide (a lookup table per frame)"""
+    source, level = (old, 1 - t * 2) if t < 0.5 else (new, t * 2 - 1)
+    return source.point([int(v * level) for v in range(256)] * 3)
+
+
+def slide(old, new, t, direction):
+    """Push the old slide out while the new one slides in from `direction`'s side"""
+    width, height = old.size
+    dx, dy = {'left': (-1, 0), 'right': (1, 0), 'up': (0, -1), 'down': (0, 1)}[direction]
+    offset_x, offset_y = int(dx * width * t), int(dy * height * t)
+    frame = Image.new('RGB', old.size)
+    frame.paste(old, (offset_x, offset_y))
+    frame.paste(new, (offset_x - dx * width, offset_y - dy * height))
+    return frame
+
+
+def zoom(old, new, t, zoom_type):
+    if zoom_type == 'in':
+        # New slide grows from the centre
+        return _scaled_over(old, new, 0.1 + 0.9 * t)
+    # Old slide shrinks away, revealing the new one
+    return _scaled_over(new, old, 1.0 - 0.9 * t)
+
+
+def rotate(old, new, t):
+    """New slide spins in while growing to full size"""
+    scale = 0.1 + 0.9 * t
+    width, height = max(1, int(new.width * scale)), max(1, int(new.height * scale))
+    spun = new.resize((width, height), RESAMPLE).rotate((1 - t) * 180, RESAMPLE, expand=True)
+    mask = Image.new('L', (width, height), 255).rotate((1 - t) * 180, RESAMPLE, expand=True)
+    frame = old.copy()
+    frame.paste(spun, ((old.width - spun.width) // 2, (old.height - spun.height) // 2), mask)
+    return frame
+
+
+def flip(old, new, t):
+    """Old slide folds to an edge-on line, then the new one unfolds"""
+    scale_x = abs(math.cos(t * math.pi))
+    black = Image.new('RGB', old.size)
+    return _scaled_over(black, old if t < 0.5 else new, scale_x, 1.0)
+
+
+EFFECTS = {
+    'dissolve': dissolve,
+    'fade': fade,
+    'slide left': lambda old, new, t: slide(old, new, t, 'left'),
+    'slide right': lambda old, new, t: slide(old, new, t, 'right'),
+    'slide up': lambda old, new, t: slide(old, new, t, 'up'),
+    'slide down': lambda old, new, t: slide(old, new, t, 'down'),
+    'zoom in': lambda old, new, t: zoom(old, new, t, 'in'),
+    'zoom out': lambda old, new, t: zoom(old, new, t, 'out'),
+    'rotate': rotate,
+    'flip': flip,
+}
+
+
+def get_effect(name):
+    """Effect function for a transition name (case-insensitive), or None"""
+    return EFFECTS.get(name.strip().lower()) if name else None
+
+
+class TransitionCompositor:
+    """Runs one transition on the Tk event loop without blocking it
+
+    widget provides after()/after_cancel(); show(frame) displays a composited
+    PIL frame and on_done() is called once the transition has finished or
+    been cancelled.
+    """
+
+    def __init__(self, widget, name, old, new, show, on_done, duration=DEFAULT_DURATION,
+                 pacer=None, clock=time.perf_counter):
+        self.widget = widget
+        self.name = name
+        self.effect = get_effect(name)
+        self.old = old
+        self.new = new
+        self.show = show
+        self.on_done = on_done
+        self.duration = duration
+        self.pacer = pacer if pacer is not None else FramePacer(TARGET_FPS, MIN_FPS, CPU_BUDGET)
+        self.clock = clock
+        self.started = None
+        self.job = None
+        self.done = False
+
+    @property
+    def progress(self):
+        return min((self.clock() - self.started) / self.duration, 1.0)
+
+    def start(self):
+        self.started = self.clock()
+        self._frame()
+
+    def _frame(self):
+        self.job = None
+        if self.done:
+            return
+        begin = self.clock()
+        progress = self.progress
+        if progress >= 1.0:
+            self.finish()
+            return
+        self.show(self.effect(self.old, self.new, progress))
+        now = self.clock()
+        self.pacer.record(now - begin)
+        # Never sleep past the end, so the last frame lands on time
+        delay = min(self.pacer.next_interval(), self.started + self.duration - now)
+        self.job = self.widget.after(max(1, int(delay * 1000)), self._frame)
+
+    def finish(self):
+        """End now (also used to cancel); the caller shows the final slide"""
+        if self.done:
+            return
+        self.done = True
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+            self.job = None
+        self.on_done()
+
+    @property
+    def fps(self):
+        """Frames per second achieved so far"""
+        elapsed = self.clock() - self.started if self.started is not None else 0.0
+        return self.pacer.frames / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,86 @@
+"""
+Background validation of slide files for Quick Image Presenter.
+
+A folder is accepted by file extension alone, so truncated or corrupt
+files used to surface only when playback tried to decode them. After a
+folder, archive or playlist is loaded, every file is checked on a thread
+pool, off the Tk thread:
+
+- the header must parse and describe a non-empty image;
+- JPEGs are decoded at 1/8 scale (the DCT skips most of the work, but
+  every byte of entropy data is read, so truncation is caught);
+- PNGs are verified (every chunk CRC is checked without inflating);
+- other formats get Pillow's verify() only, so the pass stays cheap.
+
+Files that fail go into the presenter's quarantine list and are skipped at
+playback. Results are cached in the MetadataCache per (mtime, size), so
+reloading a folder only checks new or changed files.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from image_pipeline import open_image
+from metadata_cache import file_signature
+
+VALIDATION_WORKERS = 4
+VALIDATION_FIELD = 'error'  # '' once a file has passed
+
+
+def validate_file(path):
+    """None if path looks like a decodable image, else a short reason"""
+    from compiled_deck import split_slide_path
+    if split_slide_path(path) is not None:
+        return None  # Compiled frames were decoded when the deck was built
+    try:
+        with open_image(path) as image:
+            width, height = image.size
+            if width <= 0 or height <= 0:
+                return "empty image"
+            if image.format == 'JPEG':
+                image.draft(image.mode, (max(1, width // 8), max(1, height // 8)))
+                image.load()
+            else:
+                image.verify()
+    except Exception as e:
+        return str(e) or type(e).__name__
+    return None
+
+
+def validate_files(paths, cache=None, workers=VALIDATION_WORKERS, progress=None, cancelled=None):
+    """{path: reason} for the paths that failed; files unchanged since a cached check are not reopened
+
+    progress(done, total) is called from the calling thread as results come
+    in; cancelled() is polled so a superseded pass can stop early.
+    """
+    bad = {}
+    missing = []
+    for path in paths:
+        signature = file_signature(path)
+        if signature is None:
+            bad[path] = "file not found"
+            continue
+        cached = cache.get(path, signature, VALIDATION_FIELD) if cache is not None else None
+        if cached is None:
+            missing.append((path, signature))
+        elif cached:
+            bad[path] = cached
+
+    def work(item):
+        path, signature = item
+        return path, signature, validate_file(path)
+
+    total = len(missing)
+    if progress:
+        progress(0, total)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='validate') as executor:
+        for done, (path, signature, error) in enumerate(executor.map(work, missing), 1):
+            if cancelled and cancelled():
+                executor.shutdown(wait=False, cancel_futures=True)
+                return bad
+            if error:
+                bad[path] = error
+            if cache is not None:
+                cache.put(path, signature, **{VALIDATION_FIELD: error or ''})
+            if progress and (done % 50 == 0 or done == total):
+                progress(done, total)
+    return bad